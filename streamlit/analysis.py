@@ -0,0 +1,119 @@
+# analysis.py
+import time
+from pipeline import Pipeline, rechunk
+from crawling import naver_news_crawler, stream_news
+from preprocessing import preprocess_dataframe
+from word_cloud import token_frequencies, save_frequencies, render_wordcloud_png, build_period_wordcloud, recent_months
+from lda import train_lda_and_visualize, train_lda_months
+import sentiment_analysis as sa
+import news_store
+import voting
+from model_options import MODEL_OPTIONS  # 브랜드별 차종 (backfill.py 등에서 analysis.MODEL_OPTIONS 로도 사용)
+
+
+# 뉴스 분석 흐름의 단계와 데이터 의존 관계
+#   crawl → preprocess → wordcloud / lda / sentiword
+#   crawl → translate → lexical(TextBlob + Vader) / flair
+#   crawl → koelectra
+#   preprocess + 감정 분석 결과들 → vote → ratio
+#   crawl + vote → store (partition 을 준 경우 news_store 에 저장)
+def build_analysis_pipeline(query, s_date, e_date, max_count=100, visuals=True, weights=None, max_workers=4, partition=None, lda_options=None, confidence=False):
+    """partition=(브랜드, 차종) 을 주면 크롤링/분석 결과를 브랜드/차종/월 Parquet 으로 저장하고,
+    같은 기사 목록이 이미 전처리되어 저장돼 있으면 토큰화를 다시 하지 않고 불러옴
+    confidence=True 면 KoELECTRA / Flair 의 표를 예측 확신도만큼 반영해 투표
+    lda_options: train_lda_and_visualize 설정 (예: {"num_topics": 5, "workers": 3} → 워커가 2개 이상이면 LdaMulticore)"""
+    backends = sa.enabled_backends()
+    pipeline = Pipeline(max_workers=max_workers)
+    month = news_store.month_of(s_date)
+
+    pipeline.add("crawl", lambda: naver_news_crawler(query, s_date, e_date, max_count))
+
+    def preprocess(news_df):
+        if partition is not None:
+            stored = news_store.load_frame("processed", *partition, month, columns=news_store.PREPROCESS_COLUMNS)
+            if stored is not None and stored["링크"].tolist() == news_df["링크"].tolist():
+                return stored
+        # 크롤링 결과는 화면 출력과 동시에 쓰이므로 복사본을 전처리
+        return preprocess_dataframe(news_df.copy(), "제목")
+    pipeline.add("preprocess", preprocess, deps=["crawl"])
+
+    # 단어 빈도표 (partition 을 주면 브랜드/차종/월별로 저장해 여러 달 워드클라우드에 사용)
+    def frequencies(processed_df):
+        word_counts = token_frequencies(processed_df["token_lst"])
+        if partition is not None:
+            save_frequencies(*partition, month, word_counts)
+        return word_counts
+    pipeline.add("frequencies", frequencies, deps=["preprocess"])
+
+    if visuals:
+        # 단어 빈도표가 같으면 캐시된 이미지 사용
+        pipeline.add("wordcloud", render_wordcloud_png, deps=["frequencies"])
+        # 검색어(브랜드 + 차종)별로 저장된 LDA 모델을 이어서 갱신
+        pipeline.add("lda", lambda processed_df: train_lda_and_visualize(processed_df, model_key=query, **(lda_options or {})), deps=["preprocess"])
+
+    # 감정 분석 단계는 {결과 컬럼: 값} 형태로 반환하고 vote 단계에서 한 번에 합침
+    label_stages = []
+    if "sentiword" in backends:
+        def sentiword(processed_df):
+            scores, labels = sa.cached_sentiword_scores(processed_df["제목"], processed_df["token_lst"])
+            return {"sentiment_score_sentiword": scores, "sentiment_label_sentiword": labels}
+        pipeline.add("sentiword", sentiword, deps=["preprocess"])
+        label_stages.append("sentiword")
+
+    if any(backend in backends for backend in sa.TRANSLATION_BACKENDS):
+        # 번역 캐시에 없는 제목만 번역 요청 (나머지는 캐시된 번역문으로 채움)
+        pipeline.add("translate", lambda news_df: {"title_en": sa.translate_titles(news_df["제목"])}, deps=["crawl"])
+        label_stages.append("translate")
+
+    # TextBlob / Vader 는 번역 컬럼을 한 번만 순회하며 함께 계산
+    if "textblob" in backends or "vader" in backends:
+        def lexical(news_df, translated):
+            labels = sa.cached_lexical_labels(news_df["제목"], translated["title_en"], textblob="textblob" in backends, vader="vader" in backends)
+            return {sa.BACKEND_COLUMNS[backend]: values for backend, values in labels.items()}
+        pipeline.add("lexical", lexical, deps=["crawl", "translate"])
+        label_stages.append("lexical")
+
+    if "flair" in backends:
+        def flair(news_df, translated):
+            labels, confidences = sa.cached_flair_labels(news_df["제목"], translated["title_en"])
+            return {"sentiment_flair": labels, "confidence_flair": confidences}
+        pipeline.add("flair", flair, deps=["crawl", "translate"])
+        label_stages.append("flair")
+
+    if "koelectra" in backends:
+        def koelectra(news_df):
+            labels, confidences = sa.cached_koelectra_labels(news_df["제목"])
+            return {"sentiment_koelectra": labels, "confidence_koelectra": confidences}
+        pipeline.add("koelectra", koelectra, deps=["crawl"])
+        label_stages.append("koelectra")
+
+    def vote(processed_df, *results):
+        df = processed_df.copy()
+        for columns in results:
+            for column, values in columns.items():
+                df[column] = values
+        return sa.majority_sentiment(df, [sa.BACKEND_COLUMNS[backend] for backend in backends], weights, confidence)
+
+    pipeline.add("vote", vote, deps=["preprocess"] + label_stages)
+    pipeline.add("ratio", sa.calculate_sentiment_ratio, deps=["vote"])
+
+    if partition is not None:
+        def store(news_df, voted_df):
+            news_store.save_frame(news_df, "crawl", *partition, month)
+            return news_store.save_frame(voted_df, "processed", *partition, month)
+        pipeline.add("store", store, deps=["crawl", "vote"])
+    return pipeline
+
+# 스트리밍 분석: 크롤링한 페이지를 기다리지 않고 chunk_size 개씩 바로 전처리 → 감정 분석 → 투표
+# (워드클라우드 / LDA 는 전체 기사가 필요하므로 build_analysis_pipeline 사용)
+STREAM_CHUNK_SIZE = 10
+
+def stream_analysis(query, s_date, e_date, max_count=100, chunk_size=STREAM_CHUNK_SIZE, weights=None, confidence=False):
+    """청크마다 {"chunk": 분석 결과 DataFrame, "n_articles": 누적 기사 수, "ratios": 누적 감정 비율, "elapsed_sec": 경과 시간} 을 yield
+    지난 청크의 결과는 보관하지 않으므로 max_count 가 커도 메모리 사용량은 청크 크기에 비례"""
+    start = time.perf_counter()
+    running = voting.RunningRatios()
+    for chunk in rechunk(stream_news(query, s_date, e_date, max_count), chunk_size):
+        chunk = sa.perform_sentiment_analysis(preprocess_dataframe(chunk, "제목"), weights, confidence=confidence)
+        ratios = running.update(chunk["majority_sentiment"])
+        yield {"chunk": chunk, "n_articles": running.total, "ratios": ratios, "elapsed_sec": time.perf_counter() - start}
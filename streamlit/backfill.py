@@ -0,0 +1,182 @@
+# backfill.py
+# 여러 달 × 여러 차종의 뉴스 감정 분석을 한 번에 실행해 predict_sales 입력용 월별 데이터(pnr_naver) 생성
+# 사용 예) python backfill.py --start 2023-01 --end 2024-12 --out pnr_naver.csv --sales sales.csv
+#        (--lda-dir lda_html 을 주면 차종별로 전체 기간 기사를 합쳐 LDA 학습, --lda-workers 로 LdaMulticore 워커 수 지정)
+import os
+import json
+import argparse
+import calendar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from analysis import build_analysis_pipeline, stream_analysis, train_lda_months, MODEL_OPTIONS
+
+def month_range(start, end):
+    """"2023-01" ~ "2023-03" → [(2023, 1), (2023, 2), (2023, 3)]"""
+    year, month = map(int, start.split("-"))
+    end_year, end_month = map(int, end.split("-"))
+    months = []
+    while (year, month) <= (end_year, end_month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def build_jobs(start, end, brands=None, models=None):
+    """(년, 월, 브랜드, 차종) 작업 목록 생성"""
+    jobs = []
+    for brand, brand_models in MODEL_OPTIONS.items():
+        if brands and brand not in brands:
+            continue
+        for model in brand_models:
+            if models and model not in models:
+                continue
+            jobs.extend((year, month, brand, model) for year, month in month_range(start, end))
+    return jobs
+
+def checkpoint_path(checkpoint_dir, year, month, brand, model):
+    return os.path.join(checkpoint_dir, f"{brand}_{model}_{year}-{month:02d}.json")
+
+def run_job(year, month, brand, model, max_count=100, stream=False):
+    """한 달 × 한 차종 크롤링 → 전처리 → 감정 분석 → 비율 계산
+    stream=True 면 청크 단위로 분석하고 누적 비율만 유지 (max_count 가 커도 메모리 사용량은 청크 크기에 비례, Parquet 저장 생략)
+    크롤링 실패나 검색된 기사가 없는 경우는 예외를 내서 체크포인트를 남기지 않음 (다음 실행에서 재시도)"""
+    last_day = calendar.monthrange(year, month)[1]
+    s_date = f"{year}.{month:02d}.01"
+    e_date = f"{year}.{month:02d}.{last_day}"
+    search_query = f"{brand} {model}"
+
+    if stream:
+        n_articles, sentiment_result = 0, {"positive_ratio": 0, "negative_ratio": 0, "pnr": 0}
+        for update in stream_analysis(search_query, s_date, e_date, max_count=max_count):
+            n_articles, sentiment_result = update["n_articles"], update["ratios"]
+        _check_articles(n_articles)
+        return _job_row(year, month, brand, model, n_articles, sentiment_result)
+
+    results = {}
+    for result in build_analysis_pipeline(search_query, s_date, e_date, max_count=max_count, visuals=False, partition=(brand, model)).run():
+        if not result.ok:
+            raise RuntimeError(f"{result.name} 단계 실패: {result.error}")
+        results[result.name] = result.value
+
+    _check_articles(len(results["crawl"]))
+    return _job_row(year, month, brand, model, len(results["crawl"]), results["ratio"])
+
+def _check_articles(n_articles):
+    # 기사 0개의 비율(0, 0, 0)이 정상 결과처럼 저장되지 않도록 실패로 처리
+    if n_articles == 0:
+        raise RuntimeError("검색된 기사가 없습니다")
+
+def _job_row(year, month, brand, model, n_articles, sentiment_result):
+    return {
+        "year_month": f"{year}-{month:02d}",
+        "brand": brand,
+        "model": model,
+        "n_articles": n_articles,
+        "positive_ratio": float(sentiment_result["positive_ratio"]),
+        "negative_ratio": float(sentiment_result["negative_ratio"]),
+        "pnr_naver": float(sentiment_result["pnr"]),
+    }
+
+def run_backfill(jobs, checkpoint_dir, max_workers=2, max_count=100, stream=False):
+    """작업마다 결과를 체크포인트 파일로 저장 (이미 끝난 작업은 건너뛰므로 중간에 멈춰도 이어서 실행 가능)"""
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    todo = [job for job in jobs if not os.path.exists(checkpoint_path(checkpoint_dir, *job))]
+    print(f"🔹 전체 {len(jobs)}개 작업 중 {len(jobs) - len(todo)}개 완료됨, {len(todo)}개 실행")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_job, *job, max_count=max_count, stream=stream): job for job in todo}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"❌ {job} 실패: {e}")
+                failed.append(job)
+                continue
+            # 임시 파일에 쓴 뒤 이름을 바꿔 중간에 멈춰도 깨진 체크포인트가 남지 않게 함
+            path = checkpoint_path(checkpoint_dir, *job)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(row, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+            print(f"✅ {job} 완료 (pnr_naver={row['pnr_naver']})")
+    return failed
+
+def collect_features(jobs, checkpoint_dir, sales_path=None):
+    """체크포인트를 모아 월별 데이터 생성
+    sales_path(year_month, brand, model, sales 컬럼 CSV)를 주면 판매량과 전월 판매량(previous_month_sales)도 합침"""
+    rows = []
+    for job in jobs:
+        path = checkpoint_path(checkpoint_dir, *job)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                rows.append(json.load(f))
+    features = pd.DataFrame(rows, columns=["year_month", "brand", "model", "n_articles", "positive_ratio", "negative_ratio", "pnr_naver"])
+
+    if sales_path:
+        sales = pd.read_csv(sales_path)
+        sales_month = pd.to_datetime(sales["year_month"])
+        sales["year_month"] = sales_month.dt.strftime("%Y-%m")
+        features = features.merge(sales[["year_month", "brand", "model", "sales"]], on=["year_month", "brand", "model"], how="left")
+        # 전월 판매량은 행 순서가 아니라 달력상 전월 기준 (중간에 빠진 달이 있어도 다른 달 판매량이 들어가지 않음)
+        previous = sales[["brand", "model", "sales"]].rename(columns={"sales": "previous_month_sales"})
+        previous["year_month"] = (sales_month + pd.DateOffset(months=1)).dt.strftime("%Y-%m")
+        features = features.merge(previous, on=["year_month", "brand", "model"], how="left")
+
+    return features.sort_values(["brand", "model", "year_month"]).reset_index(drop=True)
+
+def run_lda(jobs, out_dir, lda_options=None):
+    """차종별로 작업한 모든 달의 전처리 결과(news_store)를 합쳐 LDA 학습 → out_dir/{브랜드}_{차종}_lda.html 경로 목록
+    lda_options: lda.train_lda_months 설정 (workers, num_topics, passes, iterations)"""
+    os.makedirs(out_dir, exist_ok=True)
+    series = {}
+    for year, month, brand, model in jobs:
+        series.setdefault((brand, model), []).append(f"{year}-{month:02d}")
+
+    paths = []
+    for (brand, model), months in series.items():
+        html = train_lda_months(brand, model, sorted(months), **(lda_options or {}))
+        if html is None:  # --stream 으로 실행한 작업은 전처리 결과를 저장하지 않음
+            print(f"⚠️ {brand} {model}: 저장된 전처리 결과가 없어 LDA 를 건너뜀")
+            continue
+        path = os.path.join(out_dir, f"{brand}_{model}_lda.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"📊 {brand} {model} LDA ({min(months)} ~ {max(months)}): {path}")
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="월별 × 차종별 뉴스 감정 분석 일괄 실행")
+    parser.add_argument("--start", required=True, help="시작 월 (예: 2023-01)")
+    parser.add_argument("--end", required=True, help="종료 월 (예: 2024-12)")
+    parser.add_argument("--brands", nargs="*", help="브랜드 (생략 시 전체)")
+    parser.add_argument("--models", nargs="*", help="차종 (생략 시 전체)")
+    parser.add_argument("--out", default="pnr_naver.csv", help="결과 CSV 경로")
+    parser.add_argument("--checkpoint-dir", default="backfill_checkpoints", help="작업별 체크포인트 폴더")
+    parser.add_argument("--sales", help="판매량 CSV (year_month, brand, model, sales)")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 실행할 작업 수")
+    parser.add_argument("--max-count", type=int, default=100, help="월별 크롤링 기사 수")
+    parser.add_argument("--stream", action="store_true", help="페이지 단위 스트리밍 분석 (기사 수가 많을 때 메모리 절약)")
+    parser.add_argument("--lda-dir", help="차종별 전체 기간 LDA 결과 HTML 폴더 (생략 시 LDA 학습 안 함)")
+    parser.add_argument("--lda-workers", type=int, help="LDA 학습 워커 수 (생략 시 CPU 코어 수 - 1, 1 이면 단일 코어 LdaModel)")
+    parser.add_argument("--num-topics", type=int, help="LDA 토픽 수")
+    parser.add_argument("--passes", type=int, help="LDA 학습 반복(pass) 수")
+    parser.add_argument("--iterations", type=int, help="LDA 문서별 추론 반복 수")
+    args = parser.parse_args()
+
+    jobs = build_jobs(args.start, args.end, args.brands, args.models)
+    failed = run_backfill(jobs, args.checkpoint_dir, args.workers, args.max_count, args.stream)
+
+    features = collect_features(jobs, args.checkpoint_dir, args.sales)
+    features.to_csv(args.out, index=False, encoding="utf-8-sig")
+    print(f"📥 {len(features)}개 행 저장: {args.out}")
+
+    if args.lda_dir:
+        lda_options = {"workers": args.lda_workers, "num_topics": args.num_topics, "passes": args.passes, "iterations": args.iterations}
+        run_lda(jobs, args.lda_dir, {key: value for key, value in lda_options.items() if value is not None})
+    if failed:
+        print(f"⚠️ 실패한 작업 {len(failed)}개 (다시 실행하면 실패한 작업만 재시도)")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# benchmark.py
+# 합성 한국어 뉴스 제목으로 분석 단계별 처리 시간 측정 (네트워크가 필요한 크롤링/GPT 번역은 로컬 대체 함수 사용)
+# 사용 예) python benchmark.py --sizes 100 1000 10000 100000 --out bench.json
+#          python benchmark.py --sizes 1000 --compare bench.json   (이전 결과 대비 느려진 단계 표시)
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from types import SimpleNamespace
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+# 측정 단계 (koelectra 는 saved_model 이 필요하므로 --stages 로 지정했을 때만 실행)
+DEFAULT_STAGES = ["crawl", "normalize", "tokenize", "sentiword_load", "sentiword", "translate", "vote", "wordcloud", "lda", "predict"]
+OPTIONAL_STAGES = ["koelectra"]
+# import 시간 측정 대상 (ui 는 Streamlit 앱 시작 시 불러오는 모듈, 나머지는 화면별로 처음 쓸 때 불러오는 모듈)
+IMPORT_MODULES = ["ui", "predict", "analysis", "preprocessing", "sentiment_analysis", "lda", "word_cloud"]
+# 이전 결과보다 이 배율 이상 느려지면 회귀로 표시
+REGRESSION_RATIO = 1.2
+MIN_COMPARE_SEC = 0.01  # 이보다 짧은 측정값은 오차가 커서 비교하지 않음
+
+# 합성 제목 재료 (정규화 규칙이 실제로 동작하도록 한자, 동의어, 불용어, 특수문자를 섞음)
+BRANDS = {"현대": ["아이오닉5", "아이오닉6", "코나"], "기아": ["EV6", "EV9", "니로"]}
+PREFIXES = ["", "", "", "[속보] ", "[영상] ", "[종합] ", "[BIZ 플러스] ", "[카드뉴스] "]
+HANJA_WORDS = ["美", "中", "日", "韓", "現代車", "株", "↑", "↓", "新"]
+KEYWORDS = ["판매", "수출", "출시", "전기 차", "배터리", "충전", "보조금", "리콜", "화재", "가격", "인하", "인상", "점유율",
+            "지난해", "톱", "리스크", "테크", "인공 지능", "자율주행", "공장", "노조", "파업", "실적", "흑자", "적자", "호평",
+            "결함", "논란", "성장", "둔화", "캐즘", "1위", "신기록", "할인", "수요", "감소", "증가", "위기", "돌풍", "어워즈"]
+SUFFIXES = ["", "", "…", "…\"시장 톱\"", " 눈길", " 우려", " 기대감", "!"]
+
+def generate_titles(n, seed=0):
+    """n 개의 합성 뉴스 제목 생성 (같은 seed 면 항상 같은 제목)"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        brand = rng.choice(list(BRANDS))
+        words = rng.sample(KEYWORDS, rng.randint(2, 5))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(HANJA_WORDS))
+        titles.append(f"{rng.choice(PREFIXES)}{brand} {rng.choice(BRANDS[brand])}, {' '.join(words)}{rng.choice(SUFFIXES)}")
+    return titles
+
+def fake_crawler(query, s_date, e_date, max_count=100, seed=0):
+    """naver_news_crawler 와 같은 형식(날짜, 제목, 링크)의 DataFrame 을 네트워크 없이 생성"""
+    import pandas as pd
+    titles = generate_titles(max_count, seed)
+    return pd.DataFrame({
+        "날짜": [s_date] * len(titles),
+        "제목": titles,
+        "링크": [f"https://news.example.com/{seed}/{i}" for i in range(len(titles))],
+    })
+
+class FakeTranslationClient:
+    """OpenAI 클라이언트 대체: chat.completions.create 에 번호 붙은 줄을 그대로 돌려줌 (translate_many 응답 형식과 동일)"""
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        content = messages[-1]["content"]
+        lines = content.split("\n")[1:] if "\n" in content else [content]
+        message = SimpleNamespace(content="\n".join(lines))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+def synthetic_sales(n_series, n_months=24, seed=0):
+    """predict_sales 입력 형식(year_month, brand, model, sales, pnr_naver, previous_month_sales)의 합성 월별 데이터
+    시리즈마다 마지막 3개월은 판매량을 비워 예측 대상으로 사용"""
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    months = pd.date_range("2022-01-01", periods=n_months, freq="MS").strftime("%Y-%m")
+    frames = []
+    for s in range(n_series):
+        sales = np.exp(np.cumsum(rng.normal(0.01, 0.1, n_months)) + 7)
+        frame = pd.DataFrame({"year_month": months, "brand": "brand", "model": f"model{s}", "sales": sales.round(),
+                              "pnr_naver": rng.uniform(0.5, 2.0, n_months)})
+        frame["previous_month_sales"] = frame["sales"].shift(1)
+        frame.loc[frame.index[-3:], "sales"] = np.nan
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def clear_cache_files(cache_dir):
+    """캐시 폴더의 파일만 삭제 (워드클라우드 PNG, LDA HTML, 감성어 인덱스 등이 캐시에서 바로 반환되지 않게 함)"""
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            os.remove(os.path.join(root, name))
+
+def _rss_mb():
+    from model_registry import current_rss_mb
+    return current_rss_mb()
+
+def time_stage(func, repeat=1):
+    """func 를 repeat 번 실행해 (마지막 결과, 최소 소요 시간, 실행 후 메모리, 메모리 증가량) 반환"""
+    times = []
+    rss_before = _rss_mb()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        times.append(time.perf_counter() - start)
+    rss_after = _rss_mb()
+    rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    return value, min(times), rss_after, rss_delta
+
+def run_size(n, stages, seed=0, repeat=1, cache_dir=None):
+    """제목 n 개로 단계별 측정 → 결과 dict 목록
+    앞 단계가 실패하면(예: Mecab 미설치) 합성 제목을 만들 때 쓴 단어를 토큰 대신 사용해 다음 단계를 계속 측정"""
+    import numpy as np
+    state = {}
+    results = []
+
+    def crawl():
+        return fake_crawler("벤치마크", "2024.01.01", "2024.01.31", n, seed)
+
+    def normalize():
+        from preprocessing import preprocessing_news
+        return [preprocessing_news(title) for title in state["news_df"]["제목"]]
+
+    def tokenize():
+        from preprocessing import token_lst
+        return [token_lst(title) for title in state.get("clean_titles") or state["news_df"]["제목"]]
+
+    def sentiword_load():
+        import sentiword_index
+        if os.path.exists(sentiword_index.INDEX_PATH):
+            os.remove(sentiword_index.INDEX_PATH)
+        sentiword_index._index = None  # 메모리/파일 캐시 없이 JSON 부터 읽는 시간
+        return sentiword_index.load_index()
+
+    def sentiword():
+        import sentiword_index
+        return sentiword_index.score_column(state["token_lists"], sentiword_index.load_index())
+
+    def translate():
+        import translation
+        return translation.translate_titles(state["news_df"]["제목"], client=FakeTranslationClient(),
+                                            cache=translation.TranslationCache(":memory:"))
+
+    def vote():
+        import voting
+        labels = np.random.default_rng(seed).integers(-1, 2, size=(n, 5))
+        majority = voting.majority_vote(labels)
+        return voting.sentiment_ratios(majority)
+
+    def wordcloud():
+        import pandas as pd
+        from word_cloud import build_wordcloud_image
+        if cache_dir:
+            clear_cache_files(cache_dir)
+        return build_wordcloud_image(pd.DataFrame({"token_lst": state["token_lists"]}))
+
+    def lda():
+        import pandas as pd
+        from lda import train_lda_and_visualize
+        if cache_dir:
+            clear_cache_files(cache_dir)
+        return train_lda_and_visualize(pd.DataFrame({"token_lst": state["token_lists"]}))
+
+    def predict():
+        import predict as predict_module
+        df, test = predict_module.fit_and_predict(state["sales_df"])
+        predict_module.rolling_backtest(state["sales_df"])
+        predict_module.build_sales_figure(df, test)
+        return test
+
+    def koelectra():
+        from koelectra import sentiment_analysis_koelectra_batch
+        return sentiment_analysis_koelectra_batch(state["news_df"]["제목"])
+
+    funcs = {"crawl": crawl, "normalize": normalize, "tokenize": tokenize, "sentiword_load": sentiword_load, "sentiword": sentiword,
+             "translate": translate, "vote": vote, "wordcloud": wordcloud, "lda": lda, "predict": predict, "koelectra": koelectra}
+
+    state["news_df"] = crawl()
+    state["token_lists"] = [title.replace(",", " ").split() for title in state["news_df"]["제목"]]
+    # 예측 데이터 크기는 제목 수에 비례 (제목 100개당 시리즈 1개 × 24개월)
+    state["sales_df"] = synthetic_sales(max(1, n // 100), seed=seed)
+
+    for stage in stages:
+        row = {"stage": stage, "n_titles": n}
+        try:
+            value, wall_sec, rss_mb, rss_delta = time_stage(funcs[stage], repeat)
+        except Exception as e:
+            row.update({"status": f"error: {type(e).__name__}: {e}", "wall_sec": None})
+            print(f"❌ [{n}] {stage}: {row['status']}")
+            results.append(row)
+            continue
+
+        if stage == "normalize":
+            state["clean_titles"] = value
+        elif stage == "tokenize":
+            state["token_lists"] = value
+        row.update({
+            "status": "ok",
+            "wall_sec": round(wall_sec, 6),
+            "us_per_title": round(wall_sec / n * 1e6, 3),
+            "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+            "rss_delta_mb": round(rss_delta, 1) if rss_delta is not None else None,
+        })
+        print(f"✅ [{n}] {stage}: {wall_sec:.4f}s")
+        results.append(row)
+    return results
+
+def import_times(modules=IMPORT_MODULES, top=10):
+    """모듈마다 새 인터프리터에서 python -X importtime 으로 import 해
+    누적 import 시간(ms)과 가장 오래 걸린 직접 import 모듈 top 개 기록"""
+    rows = []
+    for module in modules:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        entries = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            _, cumulative_us, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            entries.append((name.strip(), depth, int(cumulative_us)))
+
+        # 하위 모듈은 상위 모듈 줄 바로 앞에 출력됨 → module 줄 앞에서 depth 0 이 나오기 전까지가 module 이 불러온 모듈
+        total, children = None, []
+        for i, (name, depth, us) in enumerate(entries):
+            if name == module and depth == 0:
+                total = us
+                j = i - 1
+                while j >= 0 and entries[j][1] > 0:
+                    if entries[j][1] == 1:
+                        children.append((entries[j][0], entries[j][2]))
+                    j -= 1
+        children = sorted(children, key=lambda item: -item[1])[:top]
+        error = proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None
+        rows.append({
+            "module": module,
+            "status": "ok" if proc.returncode == 0 else f"error: {error}",
+            "cumulative_ms": round(total / 1000, 1) if total is not None else None,
+            "top": [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in children],
+        })
+        print(f"{'✅' if proc.returncode == 0 else '❌'} import {module}: {rows[-1]['cumulative_ms']}ms")
+    return rows
+
+def environment_info():
+    """결과 비교용 실행 환경 정보"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare_results(baseline, current, ratio=REGRESSION_RATIO):
+    """같은 (단계, 제목 수) 끼리 소요 시간 비교 → 느려진 항목 목록"""
+    base = {(row["stage"], row["n_titles"]): row["wall_sec"] for row in baseline["results"] if row.get("wall_sec")}
+    regressions = []
+    for row in current["results"]:
+        before = base.get((row["stage"], row["n_titles"]))
+        if before and row.get("wall_sec") and max(before, row["wall_sec"]) >= MIN_COMPARE_SEC and row["wall_sec"] / before >= ratio:
+            regressions.append({"stage": row["stage"], "n_titles": row["n_titles"], "before_sec": before,
+                                "after_sec": row["wall_sec"], "ratio": round(row["wall_sec"] / before, 2)})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 뉴스 제목으로 분석 단계별 처리 시간 측정")
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="제목 수 목록")
+    parser.add_argument("--stages", nargs="*", default=DEFAULT_STAGES, choices=DEFAULT_STAGES + OPTIONAL_STAGES, help="측정할 단계")
+    parser.add_argument("--repeat", type=int, default=1, help="단계별 반복 횟수 (가장 빠른 시간 기록)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument("--out", default="benchmark.json", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON (느려진 단계가 있으면 종료 코드 1)")
+    parser.add_argument("--keep-cache", action="store_true", help="임시 캐시 폴더를 지우지 않음")
+    parser.add_argument("--skip-imports", action="store_true", help="모듈 import 시간 측정 생략")
+    args = parser.parse_args()
+
+    # 실제 캐시(.cache)를 건드리지 않도록 임시 캐시 폴더 사용 (분석 모듈 import 전에 설정해야 함)
+    cache_dir = tempfile.mkdtemp(prefix="ev_bench_")
+    os.environ["EV_CACHE_DIR"] = cache_dir
+    import matplotlib
+    matplotlib.use("Agg")
+
+    report = {"environment": environment_info(), "config": {"sizes": args.sizes, "stages": args.stages, "repeat": args.repeat, "seed": args.seed}, "results": []}
+    try:
+        if not args.skip_imports:
+            report["import_times"] = import_times()
+        for n in args.sizes:
+            report["results"].extend(run_size(n, args.stages, args.seed, args.repeat, cache_dir))
+    finally:
+        if not args.keep_cache:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    # 단계 안쪽 세부 구간(instrumentation) 지표: 모든 크기를 합친 분포
+    import instrumentation
+    report["metrics"] = instrumentation.report()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["regressions"] = compare_results(json.load(f), report)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📥 결과 저장: {args.out}")
+
+    for row in report.get("regressions", []):
+        print(f"⚠️ {row['stage']} ({row['n_titles']}개): {row['before_sec']}s → {row['after_sec']}s (x{row['ratio']})")
+    if report.get("regressions"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
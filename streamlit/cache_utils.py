@@ -0,0 +1,23 @@
+# cache_utils.py
+import os
+import hashlib
+
+# 로컬 캐시 디렉토리 (환경변수 EV_CACHE_DIR 로 변경 가능)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("EV_CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+
+def cache_path(*parts):
+    """캐시 디렉토리 아래 경로 반환 (상위 폴더는 자동 생성)"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def stable_hash(*parts):
+    """문자열/바이트 조각들로부터 안정적인 sha256 해시 생성"""
+    h = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode("utf-8")
+        h.update(part)
+        h.update(b"\x00")
+    return h.hexdigest()
@@ -0,0 +1,192 @@
+# crawl_cache.py
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+from cache_utils import cache_path
+
+# 크롤링 결과 저장소 (SQLite)
+# - articles: 링크 기준으로 한 번만 저장 → "현대 아이오닉5" / "현대 아이오닉6" 처럼 겹치는 검색어 간 중복 제거
+# - crawls: (검색어, 시작일, 종료일) 단위 크롤링 기록
+# - crawl_articles: 크롤링 기록별 기사 목록과 순서
+# - crawl_pending: 스트리밍 크롤링 중인 기사 목록 (끝까지 받으면 crawl_articles 로 옮김)
+CRAWL_DB_PATH = cache_path("crawl_cache.sqlite")
+REFRESH_INTERVAL = 60 * 60  # 진행 중인 기간(이번 달)은 1시간이 지나면 새 기사만 추가 수집
+MAX_DB_BYTES = 200 * 1024 ** 2  # 캐시 최대 크기 (초과 시 오래 사용하지 않은 기록부터 삭제)
+
+_lock = threading.Lock()
+
+@contextmanager
+def _db(db_path=None):
+    """커넥션을 열고 블록이 끝나면 커밋 후 닫음"""
+    conn = _connect(db_path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def _connect(db_path=None):
+    conn = sqlite3.connect(db_path or CRAWL_DB_PATH)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS articles (
+            link TEXT PRIMARY KEY, title TEXT, date TEXT, first_seen REAL
+        );
+        CREATE TABLE IF NOT EXISTS crawls (
+            query TEXT, s_date TEXT, e_date TEXT,
+            n_articles INTEGER, complete INTEGER, fetched_at REAL, last_access REAL,
+            PRIMARY KEY (query, s_date, e_date)
+        );
+        CREATE TABLE IF NOT EXISTS crawl_articles (
+            query TEXT, s_date TEXT, e_date TEXT, rank INTEGER, link TEXT,
+            PRIMARY KEY (query, s_date, e_date, link)
+        );
+        CREATE TABLE IF NOT EXISTS crawl_pending (
+            query TEXT, s_date TEXT, e_date TEXT, rank INTEGER, link TEXT,
+            PRIMARY KEY (query, s_date, e_date, link)
+        );
+    """)
+    return conn
+
+def _is_closed(e_date):
+    """종료일이 오늘 이전이면 결과가 더 이상 바뀌지 않는 기간"""
+    return datetime.strptime(e_date, "%Y.%m.%d").date() < datetime.today().date()
+
+def load_crawl(query, s_date, e_date, db_path=None):
+    """저장된 크롤링 결과와 기록 정보 반환 (없으면 (None, None))"""
+    with _lock, _db(db_path) as conn:
+        info = conn.execute(
+            "SELECT n_articles, complete, fetched_at FROM crawls WHERE query=? AND s_date=? AND e_date=?",
+            (query, s_date, e_date)).fetchone()
+        if info is None:
+            return None, None
+        conn.execute("UPDATE crawls SET last_access=? WHERE query=? AND s_date=? AND e_date=?",
+                     (time.time(), query, s_date, e_date))
+        rows = conn.execute(
+            "SELECT a.date, a.title, a.link FROM crawl_articles c JOIN articles a ON a.link = c.link "
+            "WHERE c.query=? AND c.s_date=? AND c.e_date=? ORDER BY c.rank",
+            (query, s_date, e_date)).fetchall()
+    df = pd.DataFrame(rows, columns=["날짜", "제목", "링크"])
+    return df, {"n_articles": info[0], "complete": bool(info[1]), "fetched_at": info[2]}
+
+def _insert_articles(conn, query, s_date, e_date, df, start_rank, now, table="crawl_articles"):
+    conn.executemany("INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?)",
+                     [(link, title, date, now) for date, title, link in zip(df["날짜"], df["제목"], df["링크"])])
+    conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?, ?, ?, ?, ?)",
+                     [(query, s_date, e_date, start_rank + rank, link) for rank, link in enumerate(df["링크"])])
+
+def save_crawl(query, s_date, e_date, df, complete, db_path=None):
+    """크롤링 결과 저장 (기존 기록은 덮어씀)"""
+    now = time.time()
+    with _lock, _db(db_path) as conn:
+        conn.execute("DELETE FROM crawl_articles WHERE query=? AND s_date=? AND e_date=?", (query, s_date, e_date))
+        _insert_articles(conn, query, s_date, e_date, df, 0, now)
+        conn.execute("INSERT OR REPLACE INTO crawls VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (query, s_date, e_date, len(df), int(complete), now, now))
+    evict(db_path=db_path)
+
+# 페이지 단위 저장 (스트리밍 크롤링): begin_crawl → append_crawl(페이지마다) → finish_crawl
+# 받은 페이지는 crawl_pending 에 쌓고 finish_crawl 에서 한 번에 기존 기록과 바꿈
+# → 중간에 실패하거나 멈춘 크롤링은 load_crawl 에서 보이지 않고, 이전에 저장한 결과도 그대로 남음
+def begin_crawl(query, s_date, e_date, db_path=None):
+    """이전에 실패한 크롤링이 남긴 crawl_pending 정리"""
+    with _lock, _db(db_path) as conn:
+        conn.execute("DELETE FROM crawl_pending WHERE query=? AND s_date=? AND e_date=?", (query, s_date, e_date))
+        _delete_orphans(conn)
+
+def append_crawl(query, s_date, e_date, df, start_rank, db_path=None):
+    with _lock, _db(db_path) as conn:
+        _insert_articles(conn, query, s_date, e_date, df, start_rank, time.time(), table="crawl_pending")
+
+def finish_crawl(query, s_date, e_date, n_articles, complete, db_path=None):
+    """crawl_pending 의 기사 목록으로 기존 기록을 바꿈 (한 트랜잭션)"""
+    now = time.time()
+    key = (query, s_date, e_date)
+    with _lock, _db(db_path) as conn:
+        conn.execute("DELETE FROM crawl_articles WHERE query=? AND s_date=? AND e_date=?", key)
+        conn.execute("INSERT INTO crawl_articles SELECT * FROM crawl_pending WHERE query=? AND s_date=? AND e_date=?", key)
+        conn.execute("DELETE FROM crawl_pending WHERE query=? AND s_date=? AND e_date=?", key)
+        conn.execute("INSERT OR REPLACE INTO crawls VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     key + (n_articles, int(complete), now, now))
+        _delete_orphans(conn)
+    evict(db_path=db_path)
+
+def _is_usable(info, e_date, max_count):
+    """다시 수집하지 않고 그대로 쓸 수 있는 기록인지 (기사 수가 충분하고, 지난 기간이거나 최근에 수집한 기간)"""
+    enough = info["complete"] or info["n_articles"] >= max_count
+    return enough and (_is_closed(e_date) or time.time() - info["fetched_at"] < REFRESH_INTERVAL)
+
+def load_usable_crawl(query, s_date, e_date, max_count, db_path=None):
+    """그대로 쓸 수 있는 저장된 크롤링 결과 (없으면 None)"""
+    cached, info = load_crawl(query, s_date, e_date, db_path)
+    if cached is None or not _is_usable(info, e_date, max_count):
+        return None
+    return cached.head(max_count).reset_index(drop=True)
+
+def refresh_since(info, s_date, e_date, max_count):
+    """기사 수는 충분하지만 오래된 진행 중인 기간의 기록이면 새 기사만 수집할 시작일(마지막 수집일), 아니면 None"""
+    enough = info["complete"] or info["n_articles"] >= max_count
+    if not enough or _is_usable(info, e_date, max_count):
+        return None
+    return max(datetime.fromtimestamp(info["fetched_at"]).strftime("%Y.%m.%d"), s_date)
+
+def cached_crawl(query, s_date, e_date, max_count, fetch, db_path=None):
+    """캐시를 먼저 확인하고 필요한 부분만 fetch(s_date, e_date, max_count) 로 수집
+    fetch 는 (DataFrame, 검색 결과의 끝까지 수집했는지) 를 반환하고, 실패하면 예외를 내야 함 (실패한 수집은 저장하지 않음)"""
+    cached, info = load_crawl(query, s_date, e_date, db_path)
+
+    if cached is not None:
+        # 지난 기간이거나 최근에 수집한 진행 중인 기간: 그대로 반환
+        if _is_usable(info, e_date, max_count):
+            return cached.head(max_count).reset_index(drop=True)
+        # 진행 중인 기간: 마지막 수집일 이후 기사만 추가로 수집해 최신순으로 병합
+        since = refresh_since(info, s_date, e_date, max_count)
+        if since is not None:
+            fresh, _ = fetch(since, e_date, max_count)
+            merged = pd.concat([fresh, cached], ignore_index=True).drop_duplicates(subset="링크")
+            save_crawl(query, s_date, e_date, merged, info["complete"], db_path)
+            return merged.head(max_count).reset_index(drop=True)
+
+    df, complete = fetch(s_date, e_date, max_count)
+    save_crawl(query, s_date, e_date, df, complete=complete, db_path=db_path)
+    return df
+
+def invalidate(query=None, s_date=None, e_date=None, db_path=None):
+    """조건에 맞는 크롤링 기록 삭제 (인자를 모두 생략하면 전체 삭제)"""
+    conditions, params = [], []
+    for column, value in (("query", query), ("s_date", s_date), ("e_date", e_date)):
+        if value is not None:
+            conditions.append(f"{column}=?")
+            params.append(value)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    with _lock, _db(db_path) as conn:
+        conn.execute("DELETE FROM crawls" + where, params)
+        conn.execute("DELETE FROM crawl_articles" + where, params)
+        conn.execute("DELETE FROM crawl_pending" + where, params)
+        _delete_orphans(conn)
+
+def _delete_orphans(conn):
+    conn.execute("DELETE FROM articles WHERE link NOT IN (SELECT link FROM crawl_articles UNION SELECT link FROM crawl_pending)")
+
+def evict(max_bytes=MAX_DB_BYTES, db_path=None):
+    """캐시 파일이 max_bytes 를 넘으면 가장 오래 사용하지 않은 기록부터 삭제"""
+    db_path = db_path or CRAWL_DB_PATH
+    if not os.path.exists(db_path) or os.path.getsize(db_path) <= max_bytes:
+        return
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            while os.path.getsize(db_path) > max_bytes:
+                oldest = conn.execute("SELECT query, s_date, e_date FROM crawls ORDER BY last_access LIMIT 1").fetchone()
+                if oldest is None:
+                    break
+                conn.execute("DELETE FROM crawls WHERE query=? AND s_date=? AND e_date=?", oldest)
+                conn.execute("DELETE FROM crawl_articles WHERE query=? AND s_date=? AND e_date=?", oldest)
+                _delete_orphans(conn)
+                conn.commit()
+                conn.execute("VACUUM")
+        finally:
+            conn.close()
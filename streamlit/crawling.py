@@ -3,38 +3,233 @@
 import requests
 import pandas as pd
 import re
+import threading
 from bs4 import BeautifulSoup
-from time import sleep
+from time import sleep, monotonic
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import crawl_cache
+import instrumentation as metrics
 
-def naver_news_crawler(query, s_date, e_date, max_count=100):
-    """네이버 뉴스에서 특정 키워드와 날짜 범위에 맞는 기사 100개 크롤링"""
-    
-    title_text = []
-    date_text = []
-    link_text = []
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"}
+PAGE_SIZE = 10  # 네이버 검색 결과 한 페이지당 기사 수
 
+class CrawlError(RuntimeError):
+    """재시도 후에도 페이지를 받지 못함 (검색 결과가 없는 빈 페이지와 구분)"""
+
+def build_search_url(query, s_date, e_date, start):
+    return f"https://search.naver.com/search.naver?where=news&query={query}&sort=1&ds={s_date}&de={e_date}&nso=so:r,p:from{s_date.replace('.','')}to{e_date.replace('.','')},a:&start={start}"
+
+def parse_news_page(html):
+    """검색 결과 페이지에서 (날짜, 제목, 링크) 목록 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+    atags = soup.select('.news_tit')  # 뉴스 제목
+    dates = soup.select('.info_group > span.info')  # 날짜
+    return [(date.text, atag.text, atag['href']) for atag, date in zip(atags, dates)]
+
+# 요청 속도 제한 (토큰 버킷): 초당 rate 개, 최대 burst 개까지 연속 요청 허용
+class TokenBucket:
+    def __init__(self, rate=2.0, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            sleep(wait)
+
+def create_session(pool_size=10):
+    """커넥션을 재사용하는 HTTP 세션 생성"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def fetch_page(session, url, limiter=None, retries=3, backoff=0.5):
+    """한 페이지 요청 (실패 시 지수 백오프로 재시도, 끝내 실패하면 CrawlError)"""
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            with metrics.timer("crawl.rate_limit_wait"):
+                limiter.acquire()
+        try:
+            with metrics.timer("crawl.fetch_page"):
+                response = session.get(url, timeout=10)
+            if response.status_code == 429 or response.status_code >= 500:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+            metrics.count("crawl.pages")
+            return response.text
+        except requests.RequestException as e:
+            if attempt == retries:
+                metrics.count("crawl.failed_pages")
+                raise CrawlError(f"페이지 요청 실패: {url} ({e})") from e
+            metrics.count("crawl.retries")
+            sleep(backoff * (2 ** attempt))
+
+def naver_news_crawler(query, s_date, e_date, max_count=100, concurrent=False, max_workers=4, rate=2.0, use_cache=True, status=None):
+    """네이버 뉴스에서 특정 키워드와 날짜 범위에 맞는 기사 100개 크롤링
+    status(dict) 를 주면 검색 결과의 마지막 페이지까지 수집했는지를 status["complete"] 에 기록"""
+    if use_cache:
+        # 로컬 캐시(crawl_cache)를 먼저 확인하고 없는 기간만 새로 수집
+        def fetch(s, e, n):
+            fetch_status = {}
+            df = naver_news_crawler(query, s, e, n, concurrent, max_workers, rate, use_cache=False, status=fetch_status)
+            return df, fetch_status["complete"]
+        return crawl_cache.cached_crawl(query, s_date, e_date, max_count, fetch)
+
+    if concurrent:
+        return naver_news_crawler_concurrent(query, s_date, e_date, max_count, max_workers, rate, status)
+
+    # 크롤링 결과 데이터프레임 변환
+    pages = list(iter_news_pages(query, s_date, e_date, max_count, status))
+    if not pages:
+        return pd.DataFrame(columns=["날짜", "제목", "링크"])
+    return pd.concat(pages, ignore_index=True)
+
+def iter_news_pages(query, s_date, e_date, max_count=100, status=None):
+    """검색 결과를 한 페이지씩 (날짜, 제목, 링크) DataFrame 으로 yield (모두 합쳐 max_count 개까지, 링크 기준 중복 제거)
+    status(dict) 를 주면 검색 결과의 끝(빈 페이지나 새 링크가 없는 페이지)에 도달했을 때 status["complete"] = True"""
+    if status is not None:
+        status["complete"] = False
+    session = create_session(pool_size=1)
+    seen_links = set()
     page = 1
-    while len(title_text) < max_count:
-        url = f"https://search.naver.com/search.naver?where=news&query={query}&sort=1&ds={s_date}&de={e_date}&nso=so:r,p:from{s_date.replace('.','')}to{e_date.replace('.','')},a:&start={page}"
-        
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"})
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        atags = soup.select('.news_tit')  # 뉴스 제목
-        dates = soup.select('.info_group > span.info')  # 날짜
-        links = [atag['href'] for atag in atags]  # 기사 링크
-
-        for atag, date in zip(atags, dates):
-            if len(title_text) >= max_count:
-                break
-            title_text.append(atag.text)
-            date_text.append(date.text)
-            link_text.append(atag['href'])
+    n_articles = 0
+    while n_articles < max_count:
+        url = build_search_url(query, s_date, e_date, page)
+        items = parse_news_page(fetch_page(session, url))
+
+        # 이미 받은 링크는 제외 (마지막 페이지를 넘기면 네이버가 같은 페이지를 다시 돌려줌)
+        new_items = []
+        for item in items:
+            if item[2] not in seen_links:
+                seen_links.add(item[2])
+                new_items.append(item)
+        items = new_items
+
+        # 검색 결과가 더 이상 없으면 종료 (max_count 보다 기사가 적은 경우 무한 반복 방지)
+        if not items:
+            if status is not None:
+                status["complete"] = True
+            break
+
+        items = items[:max_count - n_articles]
+        n_articles += len(items)
+        yield pd.DataFrame(items, columns=["날짜", "제목", "링크"])
 
         page += 10  # 다음 페이지 이동
-        sleep(0.5)  # 네이버 차단 방지
+        if n_articles < max_count:
+            sleep(0.5)  # 네이버 차단 방지
 
-    # 크롤링 결과 데이터프레임 변환
-    df = pd.DataFrame({"날짜": date_text, "제목": title_text, "링크": link_text})
-    return df
\ No newline at end of file
+def stream_news(query, s_date, e_date, max_count=100, use_cache=True):
+    """naver_news_crawler 의 스트리밍 버전: 기사를 페이지 단위 DataFrame 으로 바로 yield
+    캐시에 그대로 쓸 수 있는 결과가 있으면 페이지 크기로 나눠 yield 하고, 새로 수집한 페이지는 받는 대로 캐시에 추가
+    (수집한 기사를 메모리에 모아 두지 않으며, 끝까지 받았을 때만 캐시 기록을 바꿈 → 실패하면 이전 결과 유지)"""
+    if use_cache:
+        cached = crawl_cache.load_usable_crawl(query, s_date, e_date, max_count)
+        if cached is not None:
+            yield from _split_pages(cached)
+            return
+
+        # 진행 중인 기간의 오래된 기록: 마지막 수집일 이후 기사만 새로 수집
+        cached, info = crawl_cache.load_crawl(query, s_date, e_date)
+        since = crawl_cache.refresh_since(info, s_date, e_date, max_count) if cached is not None else None
+        if since is not None:
+            yield from _stream_refresh(query, s_date, e_date, max_count, cached, info, since)
+            return
+
+        crawl_cache.begin_crawl(query, s_date, e_date)
+
+    status = {}
+    n_articles = 0
+    for page in iter_news_pages(query, s_date, e_date, max_count, status):
+        if use_cache:
+            crawl_cache.append_crawl(query, s_date, e_date, page, start_rank=n_articles)
+        n_articles += len(page)
+        yield page
+
+    if use_cache:
+        crawl_cache.finish_crawl(query, s_date, e_date, n_articles, status["complete"])
+
+def _split_pages(df):
+    for start in range(0, len(df), PAGE_SIZE):
+        yield df.iloc[start:start + PAGE_SIZE].reset_index(drop=True)
+
+def _stream_refresh(query, s_date, e_date, max_count, cached, info, since):
+    """since 이후 새 기사 페이지를 먼저 yield 하고 이어서 저장된 기사를 yield (최신순 병합, max_count 개까지)
+    끝까지 받은 뒤에만 병합 결과를 저장"""
+    seen_links = set(cached["링크"])
+    fresh = []
+    n_articles = 0
+    for page in iter_news_pages(query, since, e_date, max_count):
+        page = page[~page["링크"].isin(seen_links)].reset_index(drop=True)
+        seen_links.update(page["링크"])
+        fresh.append(page)
+        if n_articles < max_count and len(page):
+            yield page.head(max_count - n_articles)
+            n_articles += min(len(page), max_count - n_articles)
+
+    merged = pd.concat(fresh + [cached], ignore_index=True)
+    crawl_cache.save_crawl(query, s_date, e_date, merged, info["complete"])
+    if n_articles < max_count:
+        yield from _split_pages(cached.head(max_count - n_articles))
+
+def naver_news_crawler_concurrent(query, s_date, e_date, max_count=100, max_workers=4, rate=2.0, status=None):
+    """여러 페이지(start= 오프셋)를 동시에 요청하는 크롤러 (속도 제한 + 링크 기준 중복 제거)
+    한 번에 요청한 페이지들에서 새 링크가 하나도 없으면 검색 결과의 끝으로 보고 종료
+    status(dict) 의 의미는 iter_news_pages 와 같음"""
+    if status is not None:
+        status["complete"] = False
+    session = create_session(pool_size=max_workers)
+    limiter = TokenBucket(rate=rate, burst=max_workers)
+
+    rows = []
+    seen_links = set()
+    next_start = 1
+    finished = False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while not finished and len(rows) < max_count:
+            # max_workers 개 페이지를 한 번에 요청한 뒤 오프셋 순서대로 결과 반영
+            starts = [next_start + PAGE_SIZE * i for i in range(max_workers)]
+            next_start = starts[-1] + PAGE_SIZE
+            pages = executor.map(lambda start: parse_news_page(fetch_page(session, build_search_url(query, s_date, e_date, start), limiter)), starts)
+
+            n_before = len(rows)
+            for items in pages:
+                if not items:  # 빈 페이지 → 마지막 페이지 도달
+                    finished = True
+                    if status is not None:
+                        status["complete"] = True
+                    break
+                for date, title, link in items:
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
+                    rows.append((date, title, link))
+                    if len(rows) >= max_count:
+                        finished = True
+                        break
+                if finished:
+                    break
+
+            # 배치 전체에서 새 링크가 없으면 같은 페이지가 반복되는 것 → 마지막 페이지 도달
+            if not finished and len(rows) == n_before:
+                finished = True
+                if status is not None:
+                    status["complete"] = True
+
+    df = pd.DataFrame(rows, columns=["날짜", "제목", "링크"])
+    return df
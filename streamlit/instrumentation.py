@@ -0,0 +1,173 @@
+# instrumentation.py
+import os
+import io
+import csv
+import json
+import time
+import random
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+# 실행 중 계측: 타이머(소요 시간 분포), 카운터, 히스토그램(값 분포)
+# 예) with timer("crawl.fetch_page"): ...   /   count("crawl.retries")   /   observe("lda.sec_per_pass", 0.3)
+# 환경변수 EV_METRICS=0 이면 모든 계측 함수가 아무것도 하지 않음
+ENABLED = os.environ.get("EV_METRICS", "1") != "0"
+MAX_SAMPLES = 10000  # 분위수 계산용으로 보관하는 값 개수 (초과 시 무작위로 교체)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_profiles = {}
+_profiling = False
+_memory_top = []
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.samples = []
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+        else:
+            i = random.randrange(self.count)
+            if i < MAX_SAMPLES:
+                self.samples[i] = value
+
+    def quantile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def count(name, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def observe(name, value):
+    if not ENABLED:
+        return
+    with _lock:
+        _histograms.setdefault(name, Histogram()).add(value)
+
+@contextmanager
+def timer(name):
+    """블록 소요 시간(초)을 name 히스토그램에 기록 (예외가 나도 기록)"""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+def timed(name):
+    """함수 실행 시간을 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def reset():
+    global _memory_top
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _profiles.clear()
+        _memory_top = []
+
+def report():
+    """지표 목록 → [{"name", "type", "count", "total", "mean", "min", "p50", "p95", "max"}, ...]"""
+    with _lock:
+        rows = [{"name": name, "type": "counter", "count": value} for name, value in sorted(_counters.items())]
+        for name, h in sorted(_histograms.items()):
+            rows.append({
+                "name": name, "type": "histogram", "count": h.count, "total": round(h.total, 6),
+                "mean": round(h.total / h.count, 6), "min": round(h.min, 6),
+                "p50": round(h.quantile(0.5), 6), "p95": round(h.quantile(0.95), 6), "max": round(h.max, 6),
+            })
+    return rows
+
+def run_report():
+    """지표 + (프로파일링을 켰다면) 단계별 cProfile 요약과 메모리 할당 상위 항목"""
+    with _lock:
+        profiles = dict(_profiles)
+        memory_top = list(_memory_top)
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "metrics": report(), "profiles": profiles, "memory_top": memory_top}
+
+def export_json(path=None):
+    """실행 리포트를 JSON 문자열로 반환 (path 를 주면 파일로도 저장)"""
+    text = json.dumps(run_report(), ensure_ascii=False, indent=2)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+def export_csv(path=None):
+    """지표 목록을 CSV 문자열로 반환 (path 를 주면 파일로도 저장)"""
+    columns = ["name", "type", "count", "total", "mean", "min", "p50", "p95", "max"]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(report())
+    if path:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(buffer.getvalue())
+    return buffer.getvalue()
+
+# 프로파일링 (선택): profiling() 블록 안에서 profile_call 로 실행한 함수는 cProfile 로,
+# 블록 전체의 메모리 할당은 tracemalloc 으로 기록
+@contextmanager
+def profiling(top=20):
+    global _profiling, _memory_top
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _profiling = True
+    try:
+        yield
+    finally:
+        _profiling = False
+        snapshot = tracemalloc.take_snapshot()
+        if started:
+            tracemalloc.stop()
+        stats = snapshot.statistics("lineno")[:top]
+        with _lock:
+            _memory_top = [{"location": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count} for stat in stats]
+
+def profile_call(name, func, *args, top=20):
+    """profiling() 중이면 func 를 cProfile 로 실행해 누적 시간 상위 top 개 함수를 name 으로 저장
+    (다른 프로파일러가 이미 동작 중이면 프로파일 없이 실행)"""
+    if not _profiling:
+        return func(*args)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        count("profile.skipped")
+        return func(*args)
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(top)
+        with _lock:
+            _profiles[name] = buffer.getvalue()
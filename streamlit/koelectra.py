@@ -1,18 +1,112 @@
 # koelectra.py
 import os
+import time
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
+import model_registry
+import instrumentation as metrics
+from cache_utils import stable_hash
 
-# 모델 및 토크나이저 로드
+# 모델 및 토크나이저 경로 (로드는 최초 사용 시 model_registry 에서 수행)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, "saved_model")
 
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
-tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
+# CPU 추론용 변환 모델 저장 위치 (saved_model 옆에 한 번만 생성해 두고 재사용)
+ONNX_PATH = os.path.join(MODEL_PATH, "onnx", "model.onnx")
+ONNX_INT8_PATH = os.path.join(MODEL_PATH, "onnx", "model.int8.onnx")
+TORCH_INT8_PATH = os.path.join(MODEL_PATH, "quantized", "model.int8.pt")
+
+# 변환 모델 정확도 확인용 제목 (학습에 쓰지 않은 기사 제목, 한 줄에 하나)과 float32 대비 최소 일치율
+PARITY_TITLES_PATH = os.path.join(BASE_DIR, "parity_titles.txt")
+PARITY_MIN_AGREEMENT = 0.95
+
+# 추론 백엔드: "torch"(float32, 기본) | "int8"(PyTorch 동적 양자화) | "onnx" | "onnx-int8"
+INFERENCE_BACKEND = os.environ.get("KOELECTRA_BACKEND", "torch")
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+def load_koelectra():
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
+    return model, tokenizer
+
+def _is_stale(path):
+    """변환 모델이 없거나 원본 모델보다 오래됐는지 확인"""
+    weights = [os.path.join(MODEL_PATH, name) for name in os.listdir(MODEL_PATH) if name.endswith((".bin", ".safetensors"))]
+    return not os.path.exists(path) or any(os.path.getmtime(weight) > os.path.getmtime(path) for weight in weights)
+
+def export_onnx(path=ONNX_PATH):
+    """float32 모델을 ONNX 로 변환해 저장 (배치 크기/문장 길이는 가변)"""
+    if not _is_stale(path):
+        return path
+    model, tokenizer = model_registry.get_model("koelectra")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sample = tokenizer(["샘플 문장입니다"], return_tensors="pt", padding=True, truncation=True, max_length=128)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES}
+    dynamic_axes["logits"] = {0: "batch"}
+    torch.onnx.export(
+        model, tuple(sample[name] for name in INPUT_NAMES), path,
+        input_names=INPUT_NAMES, output_names=["logits"], dynamic_axes=dynamic_axes, opset_version=14,
+    )
+    return path
+
+def export_onnx_int8(path=ONNX_INT8_PATH):
+    """ONNX 모델의 가중치를 int8 로 동적 양자화해 저장"""
+    if not _is_stale(path):
+        return path
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(export_onnx(), path, weight_type=QuantType.QInt8)
+    return path
+
+def load_koelectra_int8():
+    """Linear 레이어를 int8 로 동적 양자화한 PyTorch 모델
+    양자화된 모듈 전체를 파일로 저장해 두고, 다음부터는 float32 모델 로드와 양자화 없이 바로 불러옴"""
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
+    if not _is_stale(TORCH_INT8_PATH):
+        # 직접 저장한 모듈 객체이므로 weights_only=False (torch 2.6 부터 기본값이 True)
+        quantized = torch.load(TORCH_INT8_PATH, weights_only=False)
+    else:
+        model, _ = load_koelectra()
+        quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        os.makedirs(os.path.dirname(TORCH_INT8_PATH), exist_ok=True)
+        torch.save(quantized, TORCH_INT8_PATH)
+    quantized.eval()
+    return quantized, tokenizer
+
+def _load_onnx(path):
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    return session, AutoTokenizer.from_pretrained(MODEL_PATH)
+
+model_registry.register("koelectra", load_koelectra)
+model_registry.register("koelectra-int8", load_koelectra_int8)
+model_registry.register("koelectra-onnx", lambda: _load_onnx(export_onnx()))
+model_registry.register("koelectra-onnx-int8", lambda: _load_onnx(export_onnx_int8()))
+
+def model_version(backend=None):
+    """결과 캐시 키용 모델 버전 (백엔드 + 가중치 파일 이름/크기/수정 시각)"""
+    weights = sorted(name for name in os.listdir(MODEL_PATH) if name.endswith((".bin", ".safetensors")))
+    stats = [(name, os.path.getsize(os.path.join(MODEL_PATH, name)), os.path.getmtime(os.path.join(MODEL_PATH, name))) for name in weights]
+    return stable_hash(backend or INFERENCE_BACKEND, stats)[:16]
+
+def _registry_name(backend):
+    return "koelectra" if backend == "torch" else f"koelectra-{backend}"
+
+def _logits(model, inputs):
+    """PyTorch 모델 / ONNX Runtime 세션 공통 로짓 계산"""
+    if isinstance(model, torch.nn.Module):
+        return model(**inputs).logits
+    feeds = {name: inputs[name].numpy() for name in INPUT_NAMES if name in inputs}
+    return torch.from_numpy(model.run(["logits"], feeds)[0])
+
+# KoELECTRA 레이블 변환 (0: 부정, 1: 중립, 2: 긍정)
+label_mapping = {0: -1, 1: 1, 2: 0}
 
 # KoELECTRA 감성 분석 함수
 def sentiment_analysis_koelectra(text):
     """Fine-Tuned KoELECTRA 모델을 활용한 감성 분석"""
+    model, tokenizer = model_registry.get_model("koelectra")
     inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=128)
 
     with torch.no_grad():  # Inference 모드
@@ -20,6 +114,72 @@ def sentiment_analysis_koelectra(text):
         logits = outputs.logits
         predicted_class = torch.argmax(logits, dim=1).item()  # 0: 부정, 1: 중립, 2: 긍정
 
-    # KoELECTRA 레이블 변환 
-    label_mapping = {0: -1, 1: 1, 2: 0}
     return label_mapping[predicted_class]
+
+# KoELECTRA 배치 감성 분석 함수
+def sentiment_analysis_koelectra_batch(texts, batch_size=32, num_threads=None, return_probs=False, backend=None):
+    """제목 리스트(또는 Series)를 길이별 미니배치로 묶어 한 번에 감성 분석
+    backend 를 생략하면 INFERENCE_BACKEND(환경변수 KOELECTRA_BACKEND) 사용"""
+    texts = [str(text) for text in texts]
+    if not texts:
+        return ([], []) if return_probs else []
+    model, tokenizer = model_registry.get_model(_registry_name(backend or INFERENCE_BACKEND))
+
+    # 패딩 없이 한 번만 토큰화한 뒤 토큰 길이 기준 정렬 → 비슷한 길이끼리 묶어 배치마다 tokenizer.pad 로 패딩만 수행
+    with metrics.timer("koelectra.tokenize"):
+        encodings = tokenizer(texts, truncation=True, max_length=128)
+    keys = list(encodings.keys())
+    order = sorted(range(len(texts)), key=lambda i: len(encodings["input_ids"][i]))
+
+    prev_threads = torch.get_num_threads()
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    labels = [None] * len(texts)
+    probs = [None] * len(texts)
+    try:
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                idx = order[start:start + batch_size]
+                with metrics.timer("koelectra.pad"):
+                    inputs = tokenizer.pad([{key: encodings[key][i] for key in keys} for i in idx], return_tensors="pt")
+                t0 = time.perf_counter()
+                logits = _logits(model, inputs)
+                elapsed = time.perf_counter() - t0
+                metrics.observe("koelectra.batch_inference", elapsed)
+                metrics.observe("koelectra.sec_per_title", elapsed / len(idx))
+                batch_probs = torch.softmax(logits, dim=1)
+                batch_pred = torch.argmax(logits, dim=1).tolist()
+
+                for j, i in enumerate(idx):
+                    labels[i] = label_mapping[batch_pred[j]]
+                    probs[i] = batch_probs[j].tolist()
+    finally:
+        if num_threads:
+            torch.set_num_threads(prev_threads)
+
+    if return_probs:
+        return labels, probs
+    return labels
+
+def load_parity_titles(path=PARITY_TITLES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+# float32 모델 대비 정확도 확인
+def check_parity(titles=None, backend="onnx-int8", batch_size=32):
+    """같은 제목들에 대해 float32 모델과 backend 의 예측 일치율, 확률 최대 오차, 불일치 제목 반환
+    titles 를 생략하면 parity_titles.txt 의 제목 사용"""
+    titles = [str(title) for title in (load_parity_titles() if titles is None else titles)]
+    base_labels, base_probs = sentiment_analysis_koelectra_batch(titles, batch_size, return_probs=True, backend="torch")
+    labels, probs = sentiment_analysis_koelectra_batch(titles, batch_size, return_probs=True, backend=backend)
+
+    mismatches = [(title, a, b) for title, a, b in zip(titles, base_labels, labels) if a != b]
+    max_prob_diff = max((abs(p - q) for row_a, row_b in zip(base_probs, probs) for p, q in zip(row_a, row_b)), default=0.0)
+    return {
+        "backend": backend,
+        "n_titles": len(titles),
+        "agreement": 1 - len(mismatches) / len(titles) if titles else 1.0,
+        "max_prob_diff": max_prob_diff,
+        "mismatches": mismatches,
+    }
@@ -3,32 +3,208 @@ import pyLDAvis
 import gensim
 from gensim.corpora import Dictionary
 from gensim.models.ldamodel import LdaModel
-import streamlit as st
+from gensim.models.ldamulticore import LdaMulticore
+from gensim.corpora import MmCorpus
 import pandas as pd
 import os
+import time
+import json
+import tempfile
+import threading
+import instrumentation as metrics
+import news_store
+from cache_utils import cache_path, stable_hash
 
-def train_lda_and_visualize(news_df):
-    """한 달 치 뉴스 데이터를 바탕으로 LDA 모델 학습 및 pyLDAvis 변환"""
-    
-    # 'token_lst' 컬럼 활용
-    tokenized_documents = news_df["token_lst"].tolist()
+# 브랜드/차종별 LDA 모델 저장 위치 및 pyLDAvis HTML 캐시
+LDA_MODEL_DIR = cache_path("lda", "models", "")
+LDA_HTML_DIR = cache_path("lda", "html", "")
+# 스트리밍 학습용 corpus 임시 폴더 위치 (실행마다 새 하위 폴더를 만들고 학습 후 삭제)
+LDA_CORPUS_DIR = cache_path("lda", "corpus", "")
+# 새 데이터의 토큰 중 기존 사전에 없는 토큰 비율이 이 값을 넘으면 사전을 확장하고 누적 데이터로 재학습
+MAX_OOV_RATIO = 0.2
+
+_model_locks = {}
+_locks_guard = threading.Lock()
+
+def _model_lock(model_key):
+    with _locks_guard:
+        return _model_locks.setdefault(model_key, threading.Lock())
 
-    # Gensim Dictionary & Corpus 생성
-    dictionary = Dictionary(tokenized_documents)
-    corpus = [dictionary.doc2bow(doc) for doc in tokenized_documents]
+def corpus_hash(tokenized_documents):
+    """토큰화된 문서 목록의 해시 (같은 데이터면 같은 값)"""
+    return stable_hash(json.dumps(tokenized_documents, ensure_ascii=False))
 
-    # LDA 모델 학습
-    lda_model = LdaModel(
+# LDA 기본 설정 (토픽 개수 = 3)
+NUM_TOPICS = 3
+PASSES = 10
+ITERATIONS = 100
+
+def _train(corpus, dictionary, num_topics=NUM_TOPICS, passes=PASSES, iterations=ITERATIONS, workers=None):
+    """bag-of-words corpus 로 LDA 학습 (workers > 1 이면 LdaMulticore 로 여러 코어 사용)"""
+    start = time.perf_counter()
+    lda_model = _fit(corpus, dictionary, num_topics, passes, iterations, workers)
+    elapsed = time.perf_counter() - start
+    metrics.observe("lda.train", elapsed)
+    metrics.observe("lda.sec_per_pass", elapsed / passes)
+    return lda_model
+
+def _fit(corpus, dictionary, num_topics, passes, iterations, workers):
+    if workers and workers > 1:
+        return LdaMulticore(
+            corpus=corpus,
+            id2word=dictionary,
+            num_topics=num_topics,
+            iterations=iterations,
+            passes=passes,
+            workers=workers,
+            random_state=0
+        )
+    return LdaModel(
         corpus=corpus,
         id2word=dictionary,
-        num_topics=3,  # 토픽 개수 = 3
-        iterations=100,
-        passes=10,
+        num_topics=num_topics,
+        iterations=iterations,
+        passes=passes,
         random_state=0
     )
 
+# 브랜드/차종별 누적 문서 파일 (update_topic_model 재학습 시 디스크에서 한 줄씩 읽음)
+class TokenListStream:
+    """한 줄에 토큰 리스트 하나(JSON)가 저장된 파일을 한 줄씩 읽는 반복 가능한 문서 모음"""
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+def write_token_lists(token_lists, path):
+    """preprocess_dataframe 결과의 token_lst 를 TokenListStream 형식 파일로 저장 (이어 쓰기)"""
+    with open(path, "a", encoding="utf-8") as f:
+        for doc in token_lists:
+            f.write(json.dumps(list(doc), ensure_ascii=False) + "\n")
+    return TokenListStream(path)
+
+def build_streaming_corpus(documents, corpus_path, no_below=1, no_above=1.0):
+    """문서를 두 번 순회(사전 생성 → bag-of-words 직렬화)해 디스크 기반 MmCorpus 생성
+    documents 는 여러 번 순회할 수 있어야 함 (리스트 또는 TokenListStream)"""
+    dictionary = Dictionary(documents)
+    dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=None)
+    MmCorpus.serialize(corpus_path, (dictionary.doc2bow(doc) for doc in documents))
+    return MmCorpus(corpus_path), dictionary
+
+def _default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def train_lda_months(brand, model, months, workers=None, num_topics=NUM_TOPICS, passes=PASSES, iterations=ITERATIONS):
+    """news_store 에 저장된 여러 달 치 전처리 결과로 LDA 를 학습해 pyLDAvis HTML 반환 (저장된 달이 없으면 None)
+    - 한 달씩 읽어 토큰 리스트 파일에 이어 쓰고, corpus 는 디스크(MmCorpus)에서 읽어가며 학습 → 메모리 사용량은 기간과 무관
+    - corpus 는 실행마다 새 임시 폴더에 쓰므로 여러 작업이 동시에 실행돼도 서로 덮어쓰지 않음
+    - workers 를 생략하면 (CPU 코어 수 - 1) 개 워커로 LdaMulticore 실행"""
+    workers = workers or _default_workers()
+    with tempfile.TemporaryDirectory(dir=LDA_CORPUS_DIR) as tmp:
+        documents = TokenListStream(os.path.join(tmp, "documents.jsonl"))
+        n_documents = 0
+        for month in months:
+            frame = news_store.load_frame("processed", brand, model, month, columns=["token_lst"])
+            if frame is not None:
+                write_token_lists(frame["token_lst"], documents.path)
+                n_documents += len(frame)
+        if n_documents == 0:
+            return None
+
+        corpus, dictionary = build_streaming_corpus(documents, os.path.join(tmp, "corpus.mm"))
+        lda_model = _train(corpus, dictionary, num_topics, passes, iterations, workers)
+        with metrics.timer("lda.visualize"):
+            viz = pyLDAvis.gensim_models.prepare(lda_model, corpus, dictionary, sort_topics=False)
+            return pyLDAvis.prepared_data_to_html(viz)
+
+def _oov_ratio(tokenized_documents, dictionary):
+    tokens = [token for doc in tokenized_documents for token in doc]
+    if not tokens:
+        return 0.0
+    return sum(token not in dictionary.token2id for token in tokens) / len(tokens)
+
+def update_topic_model(model_key, tokenized_documents, num_topics=NUM_TOPICS, passes=PASSES, iterations=ITERATIONS, workers=None):
+    """브랜드/차종(model_key)별로 저장된 LDA 모델을 새 데이터로 갱신해 (모델, 사전) 반환
+    - 이미 반영한 데이터(해시 기준)면 그대로 반환
+    - 새 토큰 비율이 낮으면 기존 사전을 유지한 채 LdaModel.update 한 번으로 갱신 (사전에 없는 토큰은 무시)
+    - 새 토큰 비율이 높으면 사전을 확장(merge)하고 지금까지 누적된 문서로 재학습"""
+    model_dir = os.path.join(LDA_MODEL_DIR, stable_hash(model_key, num_topics)[:16])
+    model_path = os.path.join(model_dir, "lda.model")
+    dictionary_path = os.path.join(model_dir, "dictionary.dict")
+    documents_path = os.path.join(model_dir, "documents.jsonl")
+    seen_path = os.path.join(model_dir, "seen.json")
+    data_hash = corpus_hash(tokenized_documents)
+
+    with _model_lock(model_key):
+        os.makedirs(model_dir, exist_ok=True)
+        seen = []
+        if os.path.exists(seen_path):
+            with open(seen_path, encoding="utf-8") as f:
+                seen = json.load(f)
+
+        if os.path.exists(model_path):
+            lda_model = LdaModel.load(model_path)
+            dictionary = Dictionary.load(dictionary_path)
+            if data_hash in seen:
+                return lda_model, dictionary
+
+            if _oov_ratio(tokenized_documents, dictionary) <= MAX_OOV_RATIO:
+                with metrics.timer("lda.update"):
+                    lda_model.update([dictionary.doc2bow(doc) for doc in tokenized_documents], passes=passes, iterations=iterations)
+            else:
+                # 누적 문서는 디스크에서 스트리밍으로 읽어 재학습
+                write_token_lists(tokenized_documents, documents_path)
+                dictionary.merge_with(Dictionary(tokenized_documents))
+                corpus_path = os.path.join(model_dir, "corpus.mm")
+                MmCorpus.serialize(corpus_path, (dictionary.doc2bow(doc) for doc in TokenListStream(documents_path)))
+                lda_model = _train(MmCorpus(corpus_path), dictionary, num_topics, passes, iterations, workers)
+                tokenized_documents = []  # 이미 누적 문서 파일에 기록함
+        else:
+            dictionary = Dictionary(tokenized_documents)
+            corpus = [dictionary.doc2bow(doc) for doc in tokenized_documents]
+            lda_model = _train(corpus, dictionary, num_topics, passes, iterations, workers)
+
+        # 모델, 사전, 누적 문서, 반영한 데이터 해시 저장
+        lda_model.save(model_path)
+        dictionary.save(dictionary_path)
+        write_token_lists(tokenized_documents, documents_path)
+        with open(seen_path, "w", encoding="utf-8") as f:
+            json.dump(seen + [data_hash], f)
+
+    return lda_model, dictionary
+
+def train_lda_and_visualize(news_df, model_key=None, num_topics=NUM_TOPICS, passes=PASSES, iterations=ITERATIONS, workers=None):
+    """한 달 치 뉴스 데이터를 바탕으로 LDA 모델 학습 및 pyLDAvis 변환
+    model_key(예: "현대 아이오닉5")를 주면 저장된 모델을 이어서 갱신하고,
+    같은 데이터로 다시 실행하면 캐시된 HTML 을 바로 반환
+    workers > 1 이면 LdaMulticore 로 학습"""
+
+    # 'token_lst' 컬럼 활용
+    tokenized_documents = [list(doc) for doc in news_df["token_lst"]]
+
+    html_path = os.path.join(LDA_HTML_DIR, stable_hash(model_key or "", corpus_hash(tokenized_documents), num_topics, passes, iterations) + ".html")
+    if os.path.exists(html_path):
+        metrics.count("lda.html_cache_hits")
+        with open(html_path, encoding="utf-8") as f:
+            return f.read()
+
+    if model_key is None:
+        # Gensim Dictionary & Corpus 생성 후 LDA 모델 학습
+        dictionary = Dictionary(tokenized_documents)
+        corpus = [dictionary.doc2bow(doc) for doc in tokenized_documents]
+        lda_model = _train(corpus, dictionary, num_topics, passes, iterations, workers)
+    else:
+        lda_model, dictionary = update_topic_model(model_key, tokenized_documents, num_topics, passes, iterations, workers)
+        corpus = [dictionary.doc2bow(doc) for doc in tokenized_documents]
+
     # pyLDAvis 시각화 생성
-    viz = pyLDAvis.gensim_models.prepare(lda_model, corpus, dictionary, sort_topics=False)
-    html_viz = pyLDAvis.prepared_data_to_html(viz)
+    with metrics.timer("lda.visualize"):
+        viz = pyLDAvis.gensim_models.prepare(lda_model, corpus, dictionary, sort_topics=False)
+        html_viz = pyLDAvis.prepared_data_to_html(viz)
 
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html_viz)
     return html_viz
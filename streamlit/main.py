@@ -1,20 +1,27 @@
 # main.py
 import streamlit as st
 import pandas as pd
+import os
 import calendar
 from datetime import datetime
-import matplotlib.pyplot as plt
-from crawling import naver_news_crawler  # 크롤링 모듈 import
-from preprocessing import preprocess_dataframe  # 전처리 모듈 import
-from word_cloud import generate_wordcloud  # 워드클라우드 모듈 추가
-from lda import train_lda_and_visualize  # LDA 모듈 추가
+from model_options import MODEL_OPTIONS
 import streamlit.components.v1 as components  # HTML 삽입을 위한 components 사용
-from sentiment_analysis import perform_sentiment_analysis, calculate_sentiment_ratio  # 감성 분석 모듈 추가
-import predict  # 예측 모듈 추가가
+import ui  # Streamlit 출력 모듈 (예측 결과 화면 등, 분석/예측 모듈은 처음 쓸 때 함수 안에서 import)
+import sentiment_cache  # 제목별 감정 분석 결과 캐시
+import instrumentation as metrics  # 단계별 타이머/카운터 및 프로파일링
+from contextlib import nullcontext
 
 # 스트림릿 페이지 설정
 st.set_page_config(page_title="전기차 업계 분석", layout="wide")
 
+# 진단 옵션 (사이드바)
+show_diagnostics = st.sidebar.checkbox("🩺 진단 패널 표시")
+profile_run = st.sidebar.checkbox("🔬 프로파일링 (cProfile / tracemalloc)", help="분석 단계별 함수 호출 시간과 메모리 할당을 기록합니다. 실행이 느려질 수 있습니다.")
+# LDA 설정 (사이드바): 워커가 2개 이상이면 LdaMulticore 로 학습
+with st.sidebar.expander("🧩 LDA 설정"):
+    lda_topics = st.number_input("토픽 수", min_value=2, max_value=10, value=3)
+    lda_workers = st.number_input("학습 워커 수", min_value=1, max_value=os.cpu_count() or 1, value=1, help="2 이상이면 여러 코어로 학습합니다.")
+
 # 메인 제목
 st.title("🚗 전기차 업계 분석")
 st.write("특정 기간과 브랜드, 차종을 선택하면 네이버 뉴스 기사 100개를 크롤링 후 감정분석 결과와 전 판매량의 추세를 바탕으로 판매량을 예측합니다.")
@@ -25,7 +32,7 @@ st.header("📰 관련 뉴스 크롤링 후 감정 분석")
 year_options = ["선택"] + list(range(2023, datetime.today().year + 1))  # 2023년부터 현재까지
 month_options = ["선택"] + list(range(1, 13))  # 1월 ~ 12월
 brand_options = ["선택", "현대", "기아"]
-model_options = {"현대": ["아이오닉5", "아이오닉6"], "기아": ["EV6", "EV9"]}
+model_options = MODEL_OPTIONS
 
 # 스트림릿 UI
 col1, col2, col3 = st.columns(3)
@@ -53,55 +60,112 @@ if selected_year != "선택" and selected_month != "선택" and selected_brand !
     # 크롤링 키워드 생성
     search_query = f"{selected_brand} {selected_model}"
 
+    # 확신도 가중 투표: KoELECTRA / Flair 의 표를 예측 확률(점수)만큼만 반영
+    confidence_voting = st.checkbox("🎯 확신도 가중 투표", help="KoELECTRA 와 Flair 의 표를 모델의 예측 확신도(0~1)만큼 반영해 다수결합니다.")
+    # 스트리밍 모드: 크롤링한 페이지마다 바로 감정 분석해 비율을 실시간으로 갱신
+    streaming = st.checkbox("⚡ 스트리밍 모드", help="기사 페이지를 받는 대로 전처리와 감정 분석을 진행해 결과를 바로 보여줍니다. 워드클라우드와 LDA 는 생략됩니다.")
+
     # 크롤링 버튼
-    if st.button("📰 뉴스 기사 크롤링 시작"):
+    start = st.button("📰 뉴스 기사 크롤링 시작")
+    if start and streaming:
         st.write(f"🔍 검색 키워드: {search_query}")
         st.write(f"📅 크롤링 기간: {s_date} ~ {e_date}")
+        ui.render_streaming_analysis(search_query, s_date, e_date, confidence=confidence_voting)
 
-        # 크롤링 실행 (crawling.py의 함수 호출)
-        news_df = naver_news_crawler(search_query, s_date, e_date)
-        
-        # 크롤링 직후 데이터 표시
-        st.write(f"🔹 총 {len(news_df)}개 뉴스 기사 크롤링 완료!")
-        st.dataframe(news_df)
-
-        # 전처리 
-        processed_df = preprocess_dataframe(news_df, "제목")
-        st.write(f"🔹 총 {len(news_df)}개 뉴스 기사 전처리 완료!")
-        # st.dataframe(news_df)
+    elif start:
+        st.write(f"🔍 검색 키워드: {search_query}")
+        st.write(f"📅 크롤링 기간: {s_date} ~ {e_date}")
 
-        # CSV 다운로드 버튼 추가
-        csv = news_df.to_csv(index=False).encode("utf-8-sig")
-        st.download_button("📥 CSV 다운로드", data=csv, file_name=f"{search_query}_{s_date}.csv", mime="text/csv")
+        # 단계별 진행 상황 (실행 중 / 완료 / 실패) 과 결과를 표시할 영역 (단계가 끝나는 순서와 관계없이 화면 순서 유지)
+        progress = ui.StreamlitProgress(st.expander("⏳ 단계별 진행 상황", expanded=True))
+        crawl_area = st.container()
+        preprocess_area = st.container()
 
         ## --------------- 워드클라우드 --------------- ##
         st.write("")
         st.header("📊 워드클라우드")
-        generate_wordcloud(processed_df)
+        wordcloud_area = st.container()
 
         ## --------------- LDA 토픽 모델링 --------------- ##
         st.write("")
         st.header("📊 LDA 토픽 모델링")
-        with st.spinner("LDA 모델 학습 중... ⏳"):
-            lda_html = train_lda_and_visualize(processed_df)
-        components.html(lda_html, height=800, scrolling=True)
+        lda_area = st.container()
 
         ## --------------- 감정 분석 --------------- ##
         st.write("")
         st.header("📊 감정 분석")
-        processed_df = perform_sentiment_analysis(processed_df)
-
-        # 감정분석 결과 데이터프레임 출력
-        st.subheader("📝 감정 분석 결과")
-        # st.dataframe(processed_df[["제목", "sentiment_label_sentiword", "sentiment_textblob", "sentiment_vader", "sentiment_flair", "majority_sentiment"]])
-        st.dataframe(processed_df[["제목", "majority_sentiment"]])
-
-        # 감정 비율 계산 
-        sentiment_result = calculate_sentiment_ratio(processed_df)
-
-        st.write(f"😊 **Positive 비율:** {sentiment_result['positive_ratio']}%")
-        st.write(f"😢 **Negative 비율:** {sentiment_result['negative_ratio']}%")
-        st.write(f"⚖️ **Positive/Negative:** {sentiment_result['pnr']}")
+        sentiment_area = st.container()
+        vote_area = st.container()
+
+        sentiment_messages = {
+            "sentiword": "✅ 감성어 사전 기반 감정 분석 완료!",
+            "translate": "✅ GPT 번역 완료!",
+            "lexical": "  ✅ TextBlob / Vader 감정 분석 완료!",
+            "flair": "  ✅ Flair 감정 분석 완료!",
+            "koelectra": "  ✅ KoELECTRA 감성 분석 완료!",
+        }
+
+        # 크롤링 → 전처리 → (워드클라우드, LDA, 감정 분석 백엔드 5종 동시 실행) → 투표 → 비율
+        # 결과는 브랜드/차종/월별 Parquet 으로 저장 (다시 분석할 때 토큰화 생략)
+        with st.spinner("뉴스 분석 모듈 불러오는 중... ⏳"):
+            import analysis  # 크롤링 / 전처리 / 워드클라우드 / LDA / 감정 분석 (분석을 실행할 때만 불러옴)
+        analysis_pipeline = analysis.build_analysis_pipeline(search_query, s_date, e_date, partition=(selected_brand, selected_model),
+                                                             lda_options={"num_topics": int(lda_topics), "workers": int(lda_workers)},
+                                                             confidence=confidence_voting)
+        sentiment_cache.get_cache().reset_stats()
+        metrics.reset()
+        with st.spinner("뉴스 분석 중... ⏳"), (metrics.profiling() if profile_run else nullcontext()):
+            for result in analysis_pipeline.run(progress=progress):
+                if not result.ok:  # 실패 메시지는 progress 가 표시
+                    continue
+
+                if result.name == "crawl":
+                    # 크롤링 직후 데이터 표시
+                    crawl_area.write(f"🔹 총 {len(result.value)}개 뉴스 기사 크롤링 완료!")
+                    crawl_area.dataframe(result.value)
+
+                elif result.name == "preprocess":
+                    preprocess_area.write(f"🔹 총 {len(result.value)}개 뉴스 기사 전처리 완료!")
+                    # CSV 다운로드 버튼 추가
+                    csv = result.value.to_csv(index=False).encode("utf-8-sig")
+                    preprocess_area.download_button("📥 CSV 다운로드", data=csv, file_name=f"{search_query}_{s_date}.csv", mime="text/csv")
+
+                elif result.name == "wordcloud":
+                    wordcloud_area.image(result.value)
+                    # 저장된 월별 빈도표를 합친 최근 몇 달 워드클라우드 (이번 달 외에 저장된 달이 있을 때만)
+                    period_png, months = analysis.build_period_wordcloud(selected_brand, selected_model, analysis.recent_months(f"{selected_year}-{int(selected_month):02d}"))
+                    if len(months) > 1:
+                        wordcloud_area.write(f"##### 📅 최근 {len(months)}개월 합산 ({months[0]} ~ {months[-1]})")
+                        wordcloud_area.image(period_png)
+
+                elif result.name == "lda":
+                    with lda_area:
+                        components.html(result.value, height=800, scrolling=True)
+
+                elif result.name in sentiment_messages:
+                    sentiment_area.write(sentiment_messages[result.name])
+
+                elif result.name == "vote":
+                    # 감정분석 결과 데이터프레임 출력
+                    vote_area.subheader("📝 감정 분석 결과")
+                    vote_area.dataframe(result.value[["제목", "majority_sentiment"]])
+
+                elif result.name == "ratio":
+                    # 감정 비율 계산 
+                    sentiment_result = result.value
+                    vote_area.write(f"😊 **Positive 비율:** {sentiment_result['positive_ratio']}%")
+                    vote_area.write(f"😢 **Negative 비율:** {sentiment_result['negative_ratio']}%")
+                    vote_area.write(f"⚖️ **Positive/Negative:** {sentiment_result['pnr']}")
+
+        # 단계별 실행 시간 / 단계 종료 시점의 프로세스 메모리 리포트
+        with st.expander("⏱️ 단계별 실행 시간 및 프로세스 메모리"):
+            st.dataframe(pd.DataFrame(analysis_pipeline.report))
+            # 감정 분석 결과 캐시 적중률 (이미 분석한 제목은 다시 계산하지 않음)
+            st.dataframe(pd.DataFrame(sentiment_cache.get_cache().stats_report()))
+
+        if show_diagnostics:
+            with st.expander("🩺 진단: 세부 구간 시간 / 카운터 / 프로파일", expanded=True):
+                ui.render_diagnostics()
 
         # 감정 분석 결과 시각화 (파이 차트)
         # BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -125,7 +189,7 @@ st.write("##### 📌 필요한 컬럼")
 st.write("- **year_month**: 연-월 (예: 'Jan-23')")
 st.write("- **sales**: 판매량")
 st.write("- **pnr_naver**: 네이버 뉴스 감정분석 결과 (Positive/Negative 값)")
-st.write("- **previous_month_sales**: 전월 판매량")
+st.write("- **previous_month_sales**: 전월 판매량 (아래 자동 계산 옵션 사용 시 생략 가능)")
 
 if uploaded_file is not None:
     df = pd.read_csv(uploaded_file)
@@ -134,6 +198,9 @@ if uploaded_file is not None:
     st.write("📝 업로드된 데이터 샘플")
     st.dataframe(df.head())
 
+    # 전월 판매량을 sales 에서 직접 계산하고, 비어 있는 여러 달을 앞에서부터 차례로 예측
+    recursive = st.checkbox("🔁 전월 판매량 자동 계산 후 여러 달 연속 예측", value="previous_month_sales" not in df.columns)
+
     # 예측 실행 버튼 추가 (사용자가 클릭하면 실행)
     if st.button("📈 판매량 예측 시작"):
-        predict.predict_sales(df)
+        ui.predict_sales(df, recursive=recursive)
@@ -0,0 +1,4 @@
+# model_options.py
+# 브랜드별 분석 대상 차종 (Streamlit 화면과 일괄 실행(backfill.py)에서 공통 사용)
+# 무거운 분석 모듈을 불러오지 않고도 화면을 그릴 수 있도록 별도 모듈로 둠
+MODEL_OPTIONS = {"현대": ["아이오닉5", "아이오닉6"], "기아": ["EV6", "EV9"]}
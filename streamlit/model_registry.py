@@ -0,0 +1,122 @@
+# model_registry.py
+import os
+import time
+import threading
+
+# 모델 레지스트리: 각 백엔드는 처음 사용할 때 로드되고, 이후에는 프로세스 안에서 재사용
+# (Streamlit rerun 시에도 모듈은 다시 import 되지 않으므로 로드된 모델이 그대로 유지됨)
+_loaders = {}
+_models = {}
+_stats = {}
+_lock = threading.Lock()  # _name_locks 보호용
+_name_locks = {}  # 백엔드별 로드 잠금 (로더 안에서 다른 백엔드를 get_model 해도 교착되지 않도록)
+# RSS 는 프로세스 전체 값이므로 여러 백엔드가 동시에 로드되면 서로의 증가분이 섞임 → 로드와 측정은 한 번에 하나씩
+# (로더 안에서 다른 백엔드를 불러오는 중첩 로드는 같은 스레드이므로 RLock, 안쪽 증가분은 바깥 측정에서 뺌)
+_load_lock = threading.RLock()
+_loading = threading.local()
+
+# 사용하지 않는 백엔드 비활성화 (예: SENTIMENT_DISABLED_BACKENDS="flair,koelectra")
+DISABLED_BACKENDS = {name.strip() for name in os.environ.get("SENTIMENT_DISABLED_BACKENDS", "").split(",") if name.strip()}
+
+
+def current_rss_mb():
+    """현재 프로세스의 상주 메모리(RSS, MB) 측정 (측정 불가 시 None)"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / 1024 ** 2
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def register(name, loader):
+    """백엔드 이름과 로더 함수 등록 (로더는 get_model 최초 호출 시 실행)"""
+    _loaders[name] = loader
+
+
+def is_enabled(name):
+    return name not in DISABLED_BACKENDS
+
+
+def disable(*names):
+    for name in names:
+        DISABLED_BACKENDS.add(name)
+        unload(name)
+
+
+def enable(*names):
+    for name in names:
+        DISABLED_BACKENDS.discard(name)
+
+
+def _name_lock(name):
+    with _lock:
+        return _name_locks.setdefault(name, threading.Lock())
+
+
+def get_model(name):
+    """등록된 백엔드 모델 반환 (최초 1회만 로드)"""
+    if not is_enabled(name):
+        raise RuntimeError(f"비활성화된 백엔드입니다: {name}")
+    if name in _models:
+        return _models[name]
+
+    with _name_lock(name):
+        if name not in _models:  # 다른 스레드가 먼저 로드했을 수 있음
+            if name not in _loaders:
+                raise KeyError(f"등록되지 않은 백엔드입니다: {name}")
+            _models[name] = _measured_load(name)
+    return _models[name]
+
+
+def _measured_load(name):
+    """로더 실행 (로드 시간과 로드 중 늘어난 RSS 기록)"""
+    stack = _loading.__dict__.setdefault("nested_rss", [])
+    with _load_lock:
+        stack.append(0.0)  # 이 로드 안에서 일어난 중첩 로드의 RSS 증가분
+        try:
+            rss_before = current_rss_mb()
+            start = time.perf_counter()
+            model = _loaders[name]()
+            load_time = time.perf_counter() - start
+            rss_after = current_rss_mb()
+        finally:
+            nested = stack.pop()
+        rss = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        if rss is not None and stack:
+            stack[-1] += rss
+        _stats[name] = {
+            "load_time_sec": round(load_time, 3),
+            "rss_mb": round(rss - nested, 1) if rss is not None else None,
+        }
+    return model
+
+
+def unload(name):
+    _models.pop(name, None)
+    _stats.pop(name, None)
+
+
+def preload(names=None):
+    """워커 프로세스 초기화 등에서 미리 모델을 로드 (비활성화된 백엔드는 건너뜀)"""
+    for name in (names or list(_loaders)):
+        if is_enabled(name):
+            get_model(name)
+
+
+def model_stats():
+    """백엔드별 로드 여부, 로드 시간, 로드 시 증가한 프로세스 메모리(RSS) 리포트 (로드는 한 번에 하나씩 측정)"""
+    return [
+        {
+            "backend": name,
+            "enabled": is_enabled(name),
+            "loaded": name in _models,
+            "load_time_sec": _stats.get(name, {}).get("load_time_sec"),
+            "rss_mb": _stats.get(name, {}).get("rss_mb"),
+        }
+        for name in _loaders
+    ]
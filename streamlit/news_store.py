@@ -0,0 +1,80 @@
+# news_store.py
+import os
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from cache_utils import cache_path
+
+# 크롤링 결과(crawl)와 전처리 + 감정 분석 결과(processed)를 브랜드/차종/월 단위 Parquet 파일로 저장
+#   news_store/{kind}/brand=현대/model=아이오닉5/month=2024-01/part.parquet
+# token_lst 는 리스트 컬럼 그대로 저장되므로 CSV 와 달리 다시 읽어도 토큰화를 반복할 필요가 없음
+STORE_DIR = cache_path("news_store", "")
+PARTITIONING = ds.partitioning(pa.schema([("brand", pa.string()), ("model", pa.string()), ("month", pa.string())]), flavor="hive")
+
+# 단계별로 필요한 컬럼 (읽을 때 이 컬럼만 불러옴)
+CRAWL_COLUMNS = ["날짜", "제목", "링크"]
+PREPROCESS_COLUMNS = CRAWL_COLUMNS + ["clean_title", "token_lst", "token"]
+
+def month_of(s_date):
+    """"2024.01.01" → "2024-01" """
+    year, month = s_date.split(".")[:2]
+    return f"{year}-{int(month):02d}"
+
+def partition_path(kind, brand, model, month):
+    return os.path.join(STORE_DIR, kind, f"brand={brand}", f"model={model}", f"month={month}", "part.parquet")
+
+def save_frame(df, kind, brand, model, month):
+    """DataFrame 을 해당 파티션에 저장 (같은 파티션은 덮어씀, 임시 파일에 쓴 뒤 이름을 바꿔 깨진 파일이 남지 않게 함)
+    임시 파일 이름은 "_" 로 시작 → 쓰는 도중이나 실패해 남은 파일을 ds.dataset 이 읽지 않음 (ignore_prefixes)"""
+    path = partition_path(kind, brand, model, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), "_" + os.path.basename(path) + ".tmp")
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+def _to_pandas(table):
+    """리스트 컬럼은 numpy 배열이 아닌 파이썬 리스트로 변환 (token_lst 를 전처리 직후와 같은 형태로)"""
+    df = table.to_pandas()
+    for field in table.schema:
+        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+            df[field.name] = table.column(field.name).to_pylist()
+    return df
+
+def load_frame(kind, brand, model, month, columns=None):
+    """한 파티션을 메모리 맵으로 읽어 columns 만 반환 (없으면 None, 저장된 파일에 없는 컬럼은 무시)"""
+    path = partition_path(kind, brand, model, month)
+    if not os.path.exists(path):
+        return None
+    if columns is not None:
+        names = pq.read_schema(path).names
+        columns = [column for column in columns if column in names]
+    return _to_pandas(pq.read_table(path, columns=columns, memory_map=True))
+
+def load_dataset(kind, columns=None, brands=None, models=None, months=None):
+    """여러 파티션을 한 번에 읽기 (brands/models/months 로 파티션 선택, 결과에 brand/model/month 컬럼 포함)
+    예) load_dataset("processed", ["token_lst"], brands=["현대"], months=["2024-01", "2024-02"])"""
+    root = os.path.join(STORE_DIR, kind)
+    if not os.path.isdir(root):
+        return None
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+    condition = None
+    for name, values in (("brand", brands), ("model", models), ("month", months)):
+        if values:
+            expr = ds.field(name).isin(list(values))
+            condition = expr if condition is None else condition & expr
+    if columns is not None:
+        columns = [column for column in columns if column in dataset.schema.names] + ["brand", "model", "month"]
+    return _to_pandas(dataset.to_table(columns=columns, filter=condition))
+
+def list_partitions(kind):
+    """저장된 (brand, model, month) 목록"""
+    root = os.path.join(STORE_DIR, kind)
+    partitions = []
+    for dirpath, _, files in os.walk(root):
+        if "part.parquet" in files:
+            parts = dict(part.split("=", 1) for part in os.path.relpath(dirpath, root).split(os.sep))
+            partitions.append((parts["brand"], parts["model"], parts["month"]))
+    return sorted(partitions)
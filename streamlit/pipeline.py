@@ -0,0 +1,123 @@
+# pipeline.py
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from model_registry import current_rss_mb
+import instrumentation as metrics
+
+# 단계(stage)와 단계 간 데이터 의존 관계를 선언하고, 의존 단계가 끝난 단계부터 동시에 실행하는 파이프라인
+# 각 단계 함수는 의존 단계들의 결과를 선언한 순서대로 인자로 받음
+class Stage:
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+
+class StageResult:
+    # process_rss_mb: 단계가 끝난 시점의 프로세스 전체 RSS (동시에 실행 중인 다른 단계의 메모리도 포함되므로 단계별 사용량이 아님)
+    def __init__(self, name, value=None, error=None, wall_sec=None, process_rss_mb=None):
+        self.name = name
+        self.value = value
+        self.error = error
+        self.wall_sec = wall_sec
+        self.process_rss_mb = process_rss_mb
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def _timed_call(name, func, args):
+    """단계 함수를 실행하고 (결과, 소요 시간, 종료 시점 프로세스 RSS) 반환
+    instrumentation.profiling() 중이면 단계별로 cProfile 기록"""
+    start = time.perf_counter()
+    value = metrics.profile_call(f"stage.{name}", func, *args)
+    wall_sec = time.perf_counter() - start
+    metrics.observe(f"stage.{name}", wall_sec)
+    return value, wall_sec, current_rss_mb()
+
+def rechunk(frames, chunk_size):
+    """DataFrame 들을 chunk_size 행 단위로 다시 묶어 yield (마지막 청크는 더 작을 수 있음)
+    예) 스트리밍 크롤링의 페이지(10개)를 분석 청크 크기로 맞출 때"""
+    pending = None
+    for frame in frames:
+        pending = frame if pending is None else pd.concat([pending, frame], ignore_index=True)
+        while len(pending) >= chunk_size:
+            yield pending.iloc[:chunk_size].reset_index(drop=True)
+            pending = pending.iloc[chunk_size:].reset_index(drop=True)
+    if pending is not None and len(pending):
+        yield pending
+
+def _notify(progress, result):
+    if progress is None:
+        return
+    if result.ok:
+        progress({"stage": result.name, "status": "done", "message": f"✅ {result.name} 단계 완료 ({result.wall_sec:.1f}초)"})
+    else:
+        progress({"stage": result.name, "status": "error", "message": f"❌ {result.name} 단계 실패: {result.error}"})
+
+class Pipeline:
+    def __init__(self, max_workers=4):
+        self.stages = {}
+        self.max_workers = max_workers
+        self.report = []
+
+    def add(self, name, func, deps=()):
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"먼저 등록되지 않은 단계에 의존합니다: {name} → {dep}")
+        self.stages[name] = Stage(name, func, deps)
+        return self
+
+    def run(self, progress=None):
+        """실행 가능한 단계를 모두 제출하고, 끝나는 순서대로 StageResult 를 yield
+        실패한 단계에 의존하는 단계는 실행하지 않고 오류 결과로 yield
+        progress 콜백을 주면 단계마다 {"stage", "status": "start" | "done" | "error", "message"} 이벤트 전달
+        (sentiment_analysis.notify 와 같은 형식, run 을 순회하는 스레드에서 호출됨)"""
+        self.report = []
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # 의존 단계가 모두 끝난 단계 제출 (의존 단계가 실패했으면 건너뜀)
+                for name, stage in list(pending.items()):
+                    if not all(dep in results for dep in stage.deps):
+                        continue
+                    del pending[name]
+                    failed = [dep for dep in stage.deps if not results[dep].ok]
+                    if failed:
+                        result = StageResult(name, error=RuntimeError(f"의존 단계 실패: {', '.join(failed)}"))
+                        results[name] = result
+                        self._record(result)
+                        _notify(progress, result)
+                        yield result
+                        continue
+                    args = [results[dep].value for dep in stage.deps]
+                    running[executor.submit(_timed_call, name, stage.func, args)] = name
+                    if progress is not None:
+                        progress({"stage": name, "status": "start", "message": f"{name} 단계 실행 중... ⏳"})
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        value, wall_sec, process_rss_mb = future.result()
+                        result = StageResult(name, value, wall_sec=wall_sec, process_rss_mb=process_rss_mb)
+                    except Exception as e:
+                        result = StageResult(name, error=e)
+                    results[name] = result
+                    self._record(result)
+                    _notify(progress, result)
+                    yield result
+
+    def _record(self, result):
+        self.report.append({
+            "stage": result.name,
+            "status": "ok" if result.ok else f"error: {result.error}",
+            "wall_sec": round(result.wall_sec, 3) if result.wall_sec is not None else None,
+            "process_rss_mb": round(result.process_rss_mb, 1) if result.process_rss_mb is not None else None,
+        })
@@ -1,13 +1,20 @@
-import streamlit as st
 import pandas as pd
 import numpy as np
-import statsmodels.formula.api as smf
-import matplotlib.pyplot as plt
 import os
 import matplotlib.font_manager as fm
+from matplotlib.figure import Figure
+import instrumentation as metrics
 
-def predict_sales(df):
-    """판매량 예측 및 그래프 출력"""
+# 한글 폰트 설정 (NanumGothic)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_PATH = os.path.join(BASE_DIR, "fonts", "NanumGothic.ttf")
+
+# 회귀식: sales ~ pnr_naver + previous_month_sales - 1 (절편 없음, 판매량은 log1p 변환)
+FEATURES = ["pnr_naver", "previous_month_sales"]
+
+def prepare_frame(df):
+    """입력 데이터를 복사해 날짜 변환 및 로그 변환 (원본 DataFrame 은 수정하지 않음)"""
+    df = df.copy()
 
     # year_month 변환 (CSV에서 "2023-01" 형식으로 들어온 데이터 처리)
     df["year_month"] = pd.to_datetime(df["year_month"], format="%Y-%m")
@@ -17,32 +24,164 @@ def predict_sales(df):
     # 로그 변환 (모델 학습용)
     df["sales"] = np.log1p(df["sales"])
     df["previous_month_sales"] = np.log1p(df["previous_month_sales"])
+    return df
+
+def fit_ols(X, y):
+    """최소제곱 계수 (statsmodels 수식 파서를 거치지 않고 NumPy 로 직접 계산)"""
+    return np.linalg.lstsq(X, y, rcond=None)[0]
 
-    # train & test 분리
-    train = df.dropna(subset=["sales"])  # 실제 판매량 있는 데이터 (학습용)
-    test = df[df["sales"].isna()]  # 판매량이 비어있는 데이터 (예측 대상)
+@metrics.timed("predict.fit_and_predict")
+def fit_and_predict(df):
+    """판매량 예측 (Streamlit 출력 없음) → (전체 데이터, 예측 대상 데이터) 반환"""
+    df = prepare_frame(df)
+
+    # train & test 분리 (학습에는 판매량과 설명변수가 모두 있는 행만 사용: smf.ols 의 결측 처리와 동일)
+    train = df.dropna(subset=["sales"] + FEATURES)  # 실제 판매량 있는 데이터 (학습용)
+    test = df[df["sales"].isna()].copy()  # 판매량이 비어있는 데이터 (예측 대상)
 
     # OLS 회귀 모델 학습
-    model_fit = smf.ols("sales ~ pnr_naver + previous_month_sales - 1", data=train).fit()
+    coef = fit_ols(train[FEATURES].to_numpy(dtype=float), train["sales"].to_numpy(dtype=float))
+
+    # 예측 수행 후 예측값 저장 (설명변수가 비어 있는 행은 0)
+    pred_y = test[FEATURES].to_numpy(dtype=float) @ coef
+    test["predicted_sales"] = np.nan_to_num(np.expm1(pred_y), nan=0.0)
+    return df, test
+
+def _series_arrays(df, series_cols):
+    """시리즈별 데이터를 (시리즈 수, 최대 길이) 배열로 정렬 (빈 칸은 valid=False)"""
+    groups = [group.sort_values("year_month") for _, group in df.groupby(list(series_cols), sort=True)] if series_cols else [df.sort_values("year_month")]
+    keys = [tuple(group[list(series_cols)].iloc[0]) if series_cols else () for group in groups]
+    n_series, length = len(groups), max((len(group) for group in groups), default=0)
 
-    # 예측 수행
-    pred_y = model_fit.predict(test)
+    X = np.zeros((n_series, length, len(FEATURES)))
+    y = np.zeros((n_series, length))
+    valid = np.zeros((n_series, length), dtype=bool)
+    dates = np.full((n_series, length), np.datetime64("NaT"), dtype="datetime64[ns]")
+    for i, group in enumerate(groups):
+        n = len(group)
+        features = group[FEATURES].to_numpy(dtype=float)
+        target = group["sales"].to_numpy(dtype=float)
+        ok = ~np.isnan(features).any(axis=1) & ~np.isnan(target)
+        X[i, :n] = np.where(ok[:, None], features, 0)
+        y[i, :n] = np.where(ok, target, 0)
+        valid[i, :n] = ok
+        dates[i, :n] = group["year_month"].to_numpy()
+    return keys, X, y, valid, dates
 
-    # 예측값 저장
-    test["predicted_sales"] = np.expm1(pred_y).fillna(0)
+@metrics.timed("predict.rolling_backtest")
+def rolling_backtest(df, series_cols=("brand", "model"), min_train=3):
+    """모든 시리즈 × 모든 기준 시점에 대해 롤링 원점(expanding window) 1개월 앞 예측을 한 번에 계산
+    기준 시점 t 의 모델은 t 이전의 유효한 행으로만 학습 (누적합으로 X'X, X'y 를 구해 시리즈·시점별 회귀를 동시에 풂)
+    → (시점별 예측 DataFrame, 시리즈별 오차 지표 DataFrame)"""
+    series_cols = [col for col in series_cols if col in df.columns]
+    df = prepare_frame(df)
+    keys, X, y, valid, dates = _series_arrays(df, series_cols)
 
-    # 예측된 판매량 출력
-    st.subheader("📈 예측된 판매량")
-    st.dataframe(test[["year_month", "predicted_sales"]])
+    # 시점 t 까지의 누적 X'X, X'y → 기준 시점 t 의 학습 데이터는 t-1 까지
+    XtX = np.cumsum(X[..., :, None] * X[..., None, :], axis=1)
+    Xty = np.cumsum(X * y[..., None], axis=1)
+    n_train = np.cumsum(valid, axis=1)
+    XtX_prev = np.concatenate([np.zeros_like(XtX[:, :1]), XtX[:, :-1]], axis=1)
+    Xty_prev = np.concatenate([np.zeros_like(Xty[:, :1]), Xty[:, :-1]], axis=1)
+    n_prev = np.concatenate([np.zeros_like(n_train[:, :1]), n_train[:, :-1]], axis=1)
 
-    # 한글 폰트 설정 (NanumGothic)
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    font_path = os.path.join(BASE_DIR, "fonts", "NanumGothic.ttf")
-    font_prop = fm.FontProperties(fname=font_path)
+    beta = (np.linalg.pinv(XtX_prev) @ Xty_prev[..., None])[..., 0]
+    predicted = (X * beta).sum(axis=-1)
+    evaluated = valid & (n_prev >= min_train)
 
-    # 그래프 출력
-    st.subheader("판매량 추이 및 예측")
-    fig, ax = plt.subplots(figsize=(10, 5))
+    s_idx, t_idx = np.nonzero(evaluated)
+    actual_sales = np.expm1(y[s_idx, t_idx])
+    predicted_sales = np.expm1(predicted[s_idx, t_idx])
+    predictions = pd.DataFrame({
+        **{col: [keys[s][j] for s in s_idx] for j, col in enumerate(series_cols)},
+        "year_month": dates[s_idx, t_idx],
+        "n_train": n_prev[s_idx, t_idx],
+        "actual_sales": actual_sales,
+        "predicted_sales": predicted_sales,
+    })
+
+    # 시리즈별 오차 지표 (원래 판매량 단위)
+    error = predicted_sales - actual_sales
+    predictions["abs_error"] = np.abs(error)
+    predictions["sq_error"] = error ** 2
+    predictions["ape"] = np.where(actual_sales != 0, np.abs(error) / np.abs(actual_sales), np.nan)
+    if series_cols:
+        grouped = predictions.groupby(series_cols)
+    else:
+        grouped = predictions.assign(series="all").groupby("series")
+    metrics = grouped.agg(n_cutoffs=("abs_error", "size"), mae=("abs_error", "mean"), rmse=("sq_error", "mean"), mape=("ape", "mean")).reset_index()
+    metrics["rmse"] = np.sqrt(metrics["rmse"])
+    return predictions.drop(columns=["sq_error", "ape"]), metrics
+
+@metrics.timed("predict.forecast_recursive")
+def forecast_recursive(df, series_cols=("brand", "model")):
+    """previous_month_sales 를 입력받지 않고 sales 에서 직접 만들어(전월 sales) 여러 달을 연속 예측
+    - 시리즈(브랜드/차종)별로 판매량이 있는 달로 회귀 계수를 구함 (모든 시리즈를 한 번에 계산)
+    - 판매량이 비어 있는 달은 앞 달부터 차례로 예측하고, 그 예측값을 다음 달의 전월 판매량으로 사용
+    - 전월은 행 순서가 아니라 달력상 전월 (중간에 빠진 달은 학습에서 전월 판매량이 없는 것으로 보고, 예측 시에는 예측값으로 채움)
+    - 미래 달의 pnr_naver 가 비어 있으면 마지막으로 관측된 값을 사용
+    → (전체 데이터, 예측 대상 데이터) 반환 (fit_and_predict 와 같은 형식)"""
+    series_cols = [col for col in series_cols if col in df.columns]
+    df = df.copy()
+    df["year_month"] = pd.to_datetime(df["year_month"], format="%Y-%m")
+    df["year"] = df["year_month"].dt.year
+    df["month"] = df["year_month"].dt.month
+    df = df.sort_values(series_cols + ["year_month"]).reset_index(drop=True)
+    if df.empty:
+        df["previous_month_sales"] = np.nan
+        test = df.copy()
+        test["predicted_sales"] = np.nan
+        return df, test
+    groups = df.groupby(series_cols, sort=False).ngroup().to_numpy() if series_cols else np.zeros(len(df), dtype=int)
+
+    # (시리즈 수, 개월 수) 배열로 정렬: 열 위치 = 시리즈 첫 달로부터 지난 개월 수 (빠진 달은 빈 칸)
+    month_index = (df["year"] * 12 + df["month"]).to_numpy()
+    positions = month_index - pd.Series(month_index).groupby(groups).transform("min").to_numpy()
+    n_series, length = groups.max() + 1, positions.max() + 1
+    span = np.zeros((n_series, length), dtype=bool)  # 시리즈별 첫 달 ~ 마지막 달
+    last = pd.Series(positions).groupby(groups).max().to_numpy()
+    span[np.arange(length)[None, :] <= last[:, None]] = True
+    log_sales = np.full((n_series, length), np.nan)
+    pnr = np.full((n_series, length), np.nan)
+    log_sales[groups, positions] = np.log1p(df["sales"].to_numpy(dtype=float))
+    pnr[groups, positions] = df["pnr_naver"].to_numpy(dtype=float)
+
+    # 미래 달 pnr_naver 결측은 직전 값으로 채움
+    pnr = pd.DataFrame(pnr.T).ffill().to_numpy().T
+
+    # 전월 판매량(lag) 생성 후 시리즈별 회귀 계수 계산: 정규방정식을 시리즈 단위로 동시에 풂
+    lag = np.concatenate([np.full((n_series, 1), np.nan), log_sales[:, :-1]], axis=1)
+    X = np.stack([pnr, lag], axis=-1)
+    train = ~np.isnan(X).any(axis=-1) & ~np.isnan(log_sales)
+    X_train = np.where(train[..., None], X, 0)
+    XtX = np.einsum("stk,stl->skl", X_train, X_train)
+    Xty = np.einsum("stk,st->sk", X_train, np.where(train, log_sales, 0))
+    beta = (np.linalg.pinv(XtX) @ Xty[..., None])[..., 0]
+
+    # 판매량이 비어 있는 달(빠진 달 포함)을 앞에서부터 차례로 예측 (한 단계마다 모든 시리즈를 한 번에 계산)
+    filled = log_sales.copy()
+    predicted = np.full((n_series, length), np.nan)
+    for t in range(length):
+        target = span[:, t] & np.isnan(log_sales[:, t])
+        if not target.any() or t == 0:
+            continue
+        step = beta[:, 0] * pnr[:, t] + beta[:, 1] * filled[:, t - 1]
+        predicted[target, t] = step[target]
+        filled[target, t] = step[target]
+
+    df["previous_month_sales"] = np.expm1(np.concatenate([np.full((n_series, 1), np.nan), filled[:, :-1]], axis=1)[groups, positions])
+    df["sales"] = np.log1p(df["sales"])
+    test = df[df["sales"].isna()].copy()
+    test["predicted_sales"] = np.nan_to_num(np.expm1(predicted[groups, positions][df["sales"].isna().to_numpy()]), nan=0.0)
+    return df, test
+
+@metrics.timed("predict.build_figure")
+def build_sales_figure(df, test):
+    """실제 판매량과 예측 판매량 그래프 생성"""
+    font_prop = fm.FontProperties(fname=FONT_PATH)
+
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
 
     # 실제 판매량 (파란색)
     past_data = df.dropna(subset=["sales"])
@@ -58,9 +197,4 @@ def predict_sales(df):
     ax.set_ylabel("판매량", fontproperties=font_prop)
     ax.set_title("🚗 판매량 추이 및 예측", fontproperties=font_prop)
     ax.legend(prop=font_prop)
-
-    st.pyplot(fig)
-
-    # 예측된 판매량 CSV 다운로드 기능 추가
-    csv = test[["year_month", "predicted_sales"]].to_csv(index=False, encoding="utf-8-sig")
-    st.download_button("📥 예측 결과 CSV 다운로드", data=csv, file_name="predicted_sales.csv", mime="text/csv")
+    return fig
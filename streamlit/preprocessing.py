@@ -1,11 +1,22 @@
 # preprocessing.py
+import os
 import re
+import time
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from konlpy.tag import Mecab
 import hanja
+import instrumentation as metrics
 
 # 0. 사용자 정의 사전 (신조어, 고유명사 추가: ex) 캐즘, 아이오닉닉)
-m = Mecab(dicpath='C:/mecab/mecab-ko-dic')
+# Mecab 은 처음 사용할 때 프로세스마다 하나씩 생성 (병렬 처리 시 워커별 인스턴스)
+m = None
+
+def get_mecab():
+    global m
+    if m is None:
+        m = Mecab(dicpath='C:/mecab/mecab-ko-dic')
+    return m
 
 # 1. 한자 및 특수문자 치환
 def change_hanja_etc(x):
@@ -89,37 +100,132 @@ def word_delete(title):
     return title.strip()
 
 # 4. 텍스트 정제
+NON_TEXT_PATTERN = re.compile("[^가-힣ㄱ-ㅎㅏ-ㅣa-zA-Z\\s]")
+MULTI_SPACE_PATTERN = re.compile(" +")
+
 def clean_text(title):
     # 한글, 영어(EV 때문에 남겨둠) 및 공백 제외한 문자 모두 제거, 중복생성된 공백 삭제
-    title_clean = re.sub("[^가-힣ㄱ-ㅎㅏ-ㅣa-zA-Z\\s]", " ", title)
-    title_clean = re.sub(" +", " ", title_clean)
+    title_clean = NON_TEXT_PATTERN.sub(" ", title)
+    title_clean = MULTI_SPACE_PATTERN.sub(" ", title_clean)
     # 문자열 시작과 끝에 있는 공백 제거
     title_clean = title_clean.strip()
     return title_clean
 
-# 5. 최종 전처리
-def preprocessing_news(title):
+# 5. 최종 전처리 (기존 단계별 방식: 정규화 결과 비교 기준으로 유지)
+def preprocessing_news_legacy(title):
     title = change_hanja_etc(title)
     title = synonym(title)
     title = word_delete(title)
     title = clean_text(title)
     return title
 
+# 5-1. 단일 패스 정규화
+# 위 1~3단계의 치환 규칙을 미리 컴파일해 두고 제목 한 개당 한 번씩만 훑어서 적용
+## 한자 및 특수문자 치환표 (모두 한 글자 → str.translate 한 번으로 처리)
+HANJA_TABLE = str.maketrans({
+    '車': '차', '韓': '한국', '美': '미국', '日': '일본', '中': '중국', '英': '영국', '獨': '독일',
+    '伊': '이탈리아', '佛': '프랑스', '亞': '아시아', '印': '인도', '比': '북한', '新': '새로운 ',
+    '年': '매년', '前': '이전', '反': '반대', '强': '강자', '道': '도로', '業': '업적', '賞': '상',
+    '弗': '달러', '對': '대결', '株': '주식 ', '州': '주', '市': '시', '現': '현재', '社': '회사',
+    '↑': '증가', '↓': '감소',
+})
+
+## 동의어 치환표 (synonym 의 중복 규칙 제거, "SK" → "SK" 처럼 결과가 같은 규칙은 생략)
+SYNONYM_TABLE = {
+    "전기 차": "전기차", "톱": "최고", "일렉트릭": "전기", "인니": "인도네시아",
+    "대한민국": "한국", "소나타": "쏘나타", "도요타": "토요타", "어워즈": "상",
+    "삼성 전자": "삼성전자", "인공 지능": "인공지능", "지난해": "전년", "리스크": "위험",
+    "테크": "기술", "한해": "연간",
+}
+SYNONYM_BOUNDED = {"차": (r"\b차\b", "자동차"), "말레이": (r"\b말레이\b", "말레이시아"), "K": (r"(?<!S)\bK", "한국")}
+SYNONYM_REPLACEMENTS = {**SYNONYM_TABLE, **{key: repl for key, (_, repl) in SYNONYM_BOUNDED.items()}}
+SYNONYM_PATTERN = re.compile("|".join(
+    [re.escape(key) for key in sorted(SYNONYM_TABLE, key=len, reverse=True)] + [pattern for pattern, _ in SYNONYM_BOUNDED.values()]
+))
+
+## 불용어 (delete_words 와 같은 순서: 긴 단어 우선)
+DELETE_PATTERN = re.compile("|".join(re.escape(word) for word in delete_words))
+
+def synonym_fast(x):
+    x = SYNONYM_PATTERN.sub(lambda match: SYNONYM_REPLACEMENTS[match.group()], x)
+    # 치환 결과가 다시 규칙에 걸리는 드문 경우(예: "일렉트릭 차량" → "전기 차량")는 기존 순차 방식으로 처리
+    return x if SYNONYM_PATTERN.search(x) is None else None
+
+def word_delete_fast(title):
+    title = DELETE_PATTERN.sub("", title)
+    # 삭제 후 새로 불용어가 만들어진 경우(예: "사속보진" → "사진")는 기존 순차 방식으로 처리
+    return title.strip() if DELETE_PATTERN.search(title) is None else None
+
+def preprocessing_news(title):
+    """한자 치환 → 동의어 변환 → 불용어 제거 → 텍스트 정제 (preprocessing_news_legacy 와 결과 동일)"""
+    title = hanja.translate(title.translate(HANJA_TABLE), 'substitution')
+
+    replaced = synonym_fast(title)
+    title = synonym(title) if replaced is None else replaced
+
+    deleted = word_delete_fast(title)
+    title = word_delete(title) if deleted is None else deleted
+
+    return clean_text(title)
+
+## 정규화 결과 비교용 제목 모음 (normalizer_corpus.txt, 한 줄에 제목 하나)
+NORMALIZER_CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "normalizer_corpus.txt")
+
+def check_normalizer_equivalence(titles=None):
+    """단일 패스 정규화와 기존 단계별 방식의 결과가 다른 제목 목록 반환 (빈 리스트면 동일)"""
+    if titles is None:
+        with open(NORMALIZER_CORPUS_PATH, encoding="utf-8") as f:
+            titles = [line.rstrip("\n") for line in f if line.strip()]
+    mismatches = []
+    for title in titles:
+        expected, actual = preprocessing_news_legacy(title), preprocessing_news(title)
+        if expected != actual:
+            mismatches.append((title, expected, actual))
+    return mismatches
+
 # 6. 토큰화
+allowed_pos = ['NNG', 'SL', 'NNP', 'VV', 'MAG']
+
 ## 토큰 리스트트
 def token_lst(text):
-  allowed_pos = ['NNG', 'SL', 'NNP', 'VV', 'MAG']
-  return [word for word, pos in m.pos(text) if pos in allowed_pos]
+  return [word for word, pos in get_mecab().pos(text) if pos in allowed_pos]
 
 ## 명사, 외국어, 동사만 남긴 token
 def token(text):
-  allowed_pos = ['NNG', 'SL', 'NNP', 'VV', 'MAG']
-  words = [word for word, pos in m.pos(text) if pos in allowed_pos]
-  return ' '.join(words)
+  return ' '.join(token_lst(text))
+
+## 병렬 처리용 워커 함수 (워커 프로세스마다 Mecab 을 한 번만 생성)
+def _init_worker():
+    get_mecab()
+
+def _preprocess_chunk(titles):
+    # 병렬 처리 시에는 워커 프로세스에서 기록되므로 부모 프로세스의 지표에는 preprocess.total 만 남음
+    with metrics.timer("preprocess.normalize"):
+        clean_titles = [preprocessing_news(title) for title in titles]
+    with metrics.timer("preprocess.mecab"):
+        tokens = [token_lst(title) for title in clean_titles]
+    metrics.count("preprocess.titles", len(titles))
+    return clean_titles, tokens
 
 # 7. 전처리 실행 함수
-def preprocess_dataframe(df, column="제목"):
-    df["clean_title"] = df[column].apply(preprocessing_news)
-    df["token_lst"] = df["clean_title"].apply(token_lst)
-    df["token"] = df["clean_title"].apply(token)
+def preprocess_dataframe(df, column="제목", n_jobs=1, chunksize=500):
+    """제목 정제 후 형태소 분석은 제목당 한 번만 수행해 token_lst / token 을 함께 생성
+    n_jobs > 1 이면 chunksize 개씩 나눠 프로세스 풀에서 병렬 처리"""
+    titles = df[column].tolist()
+    start = time.perf_counter()
+
+    if n_jobs > 1 and len(titles) > chunksize:
+        chunks = [titles[i:i + chunksize] for i in range(0, len(titles), chunksize)]
+        clean_titles, tokens = [], []
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker) as executor:
+            for chunk_clean, chunk_tokens in executor.map(_preprocess_chunk, chunks):
+                clean_titles.extend(chunk_clean)
+                tokens.extend(chunk_tokens)
+    else:
+        clean_titles, tokens = _preprocess_chunk(titles)
+    metrics.observe("preprocess.total", time.perf_counter() - start)
+
+    df["clean_title"] = clean_titles
+    df["token_lst"] = tokens
+    df["token"] = [' '.join(words) for words in tokens]
     return df
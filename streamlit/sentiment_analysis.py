@@ -1,32 +1,47 @@
 import os
-import json
-import pandas as pd
-import streamlit as st
-from openai import OpenAI
+import time
+import numpy as np
+from contextlib import contextmanager
 from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from flair.models import TextClassifier
-from flair.data import Sentence
-from koelectra import sentiment_analysis_koelectra
+import model_registry
+import instrumentation as metrics
+import translation
+import voting
+import sentiword_index
+import sentiment_cache
+import koelectra
+from importlib import metadata
+from cache_utils import stable_hash
+from koelectra import sentiment_analysis_koelectra_batch
 
 # OpenAI API Key 설정
 OPENAI_API_KEY = "api_key"
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+# 무거운 모델/클라이언트는 처음 사용할 때 model_registry 를 통해 로드
+def load_openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+def load_vader():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+def load_flair():
+    from flair.models import TextClassifier
+    return TextClassifier.load("sentiment")
+
+model_registry.register("openai", load_openai_client)
+model_registry.register("vader", load_vader)
+model_registry.register("flair", load_flair)
 
 # 감성어 사전 파일 로드
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SENTIWORD_PATH = os.path.join(BASE_DIR, "SentiWord_info.json")
 
-# 감성어 사전 로드 함수
+# 감성어 사전 로드 함수 (JSON 을 매번 읽지 않고 sentiword_index 의 캐시된 인덱스 사용)
 def load_sentiword_dict():
     try:
-        with open(SENTIWORD_PATH, encoding="utf-8-sig", mode="r") as f:
-            SentiWord_info = json.load(f)
-        
-        sentiword_dic = pd.DataFrame(SentiWord_info)
-        sentiword_dic["polarity"] = pd.to_numeric(sentiword_dic["polarity"], errors="coerce")
-        sentiment_dict = dict(zip(sentiword_dic["word"], sentiword_dic["polarity"]))
-        return sentiment_dict
+        return sentiword_index.load_index(SENTIWORD_PATH)["unigrams"]
     
     except FileNotFoundError:
         print(f"❌ 감성어 사전 파일을 찾을 수 없습니다: {SENTIWORD_PATH}")
@@ -46,19 +61,9 @@ def classify_sentiment(score):
         return 0  # 중립
 
 # 2. 감정 분석 라이브러리 활용: gpt-4o 활용 번역 자동화화
+# (번역 결과는 translation 모듈에서 원문 해시 기준으로 캐시)
 def gpt_translate_to_english(text):
-    try:
-        completion = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a translator."},
-                {"role": "user", "content": f"Translate the following text to English. {text}"}
-            ]
-        )
-        return completion.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
+    return translation.translate_one(text)
 
 # 2.1 TextBlob
 def sentiment_analysis_textblob(text):
@@ -72,9 +77,8 @@ def sentiment_analysis_textblob(text):
         return 0
 
 # 2.2 Vader
-analyzer = SentimentIntensityAnalyzer()
-
 def sentiment_analysis_vader(text):
+    analyzer = model_registry.get_model("vader")
     sentiment = analyzer.polarity_scores(text)
     if sentiment["compound"] > 0.05:
         return 1
@@ -84,9 +88,9 @@ def sentiment_analysis_vader(text):
         return 0
 
 # 2.3 Flair
-classifier = TextClassifier.load("sentiment")
-
 def sentiment_analysis_flair(text):
+    from flair.data import Sentence
+    classifier = model_registry.get_model("flair")
     sentence = Sentence(text)
     classifier.predict(sentence)
     sentiment = sentence.labels[0].value
@@ -97,71 +101,241 @@ def sentiment_analysis_flair(text):
     else:
         return 0
 
+# 백엔드별 결과 컬럼
+BACKEND_COLUMNS = {
+    "sentiword": "sentiment_label_sentiword",
+    "textblob": "sentiment_textblob",
+    "vader": "sentiment_vader",
+    "flair": "sentiment_flair",
+    "koelectra": "sentiment_koelectra",
+}
+TRANSLATION_BACKENDS = ("textblob", "vader", "flair")  # 영어 번역이 필요한 백엔드
+# 확신도 가중 투표용 백엔드별 확신도 컬럼 (Flair 예측 점수, KoELECTRA 최대 클래스 확률: 0~1)
+CONFIDENCE_COLUMNS = {"flair": "confidence_flair", "koelectra": "confidence_koelectra"}
+
+def enabled_backends():
+    """사용할 백엔드 목록 (번역이 꺼져 있으면 영어 기반 백엔드도 제외)"""
+    backends = [backend for backend in BACKEND_COLUMNS if model_registry.is_enabled(backend)]
+    if not model_registry.is_enabled("openai"):
+        backends = [backend for backend in backends if backend not in TRANSLATION_BACKENDS]
+    return backends
+
+# 백엔드별 컬럼 단위 감정 분석 (리스트 입력 → 레이블 리스트 출력, 파이프라인 단계로도 사용)
+def sentiword_scores(token_lists):
+    """감성어 사전 점수와 레이블 (여러 단어로 된 표현(n-gram)까지 포함해 한 번에 계산)"""
+    with metrics.timer("sentiment.sentiword"):
+        return sentiword_index.score_column(token_lists, sentiword_index.load_index(SENTIWORD_PATH))
+
+def translate_titles(titles):
+    return translation.translate_titles(titles)
+
+# 번역에 실패한 제목(None, 빈 문자열)은 중립(0)으로 처리
+def lexical_labels(titles_en, textblob=True, vader=True):
+    """TextBlob / Vader 를 번역 컬럼 한 번 순회로 함께 계산 → {"textblob": [...], "vader": [...]}"""
+    analyzer = model_registry.get_model("vader") if vader else None
+    textblob_result, vader_result = [], []
+    start = time.perf_counter()
+    for text in titles_en:
+        if textblob:
+            textblob_result.append(sentiment_analysis_textblob(text) if text else 0)
+        if vader:
+            compound = analyzer.polarity_scores(text)["compound"] if text else 0
+            vader_result.append(1 if compound > 0.05 else -1 if compound < -0.05 else 0)
+    metrics.observe("sentiment.lexical", time.perf_counter() - start)
+
+    results = {}
+    if textblob:
+        results["textblob"] = textblob_result
+    if vader:
+        results["vader"] = vader_result
+    return results
+
+def textblob_labels(titles_en):
+    return lexical_labels(titles_en, vader=False)["textblob"]
+
+def vader_labels(titles_en):
+    return lexical_labels(titles_en, textblob=False)["vader"]
+
+def flair_labels(titles_en, mini_batch_size=32, return_scores=False):
+    """Flair 미니배치 예측 (classifier.predict 를 제목마다 호출하지 않고 mini_batch_size 개씩 한 번에)
+    return_scores=True 면 (레이블, 예측 점수) 반환 (예측하지 않은 제목의 점수는 1.0)"""
+    from flair.data import Sentence
+    classifier = model_registry.get_model("flair")
+    titles_en = list(titles_en)
+    targets = [i for i, text in enumerate(titles_en) if text]
+    sentences = [Sentence(titles_en[i]) for i in targets]
+    if sentences:
+        with metrics.timer("sentiment.flair_predict"):
+            classifier.predict(sentences, mini_batch_size=mini_batch_size)
+        metrics.count("sentiment.flair_titles", len(sentences))
+
+    labels = [0] * len(titles_en)
+    scores = [1.0] * len(titles_en)
+    for i, sentence in zip(targets, sentences):
+        if sentence.labels:
+            value = sentence.labels[0].value
+            labels[i] = 1 if value == "POSITIVE" else -1 if value == "NEGATIVE" else 0
+            scores[i] = float(sentence.labels[0].score)
+    if return_scores:
+        return labels, scores
+    return labels
+
+def koelectra_labels(titles, return_confidences=False):
+    """KoELECTRA 레이블 (return_confidences=True 면 (레이블, 예측 클래스 확률) 반환)"""
+    with metrics.timer("sentiment.koelectra"):
+        if not return_confidences:
+            return sentiment_analysis_koelectra_batch(titles)
+        labels, probs = sentiment_analysis_koelectra_batch(titles, return_probs=True)
+        return labels, [float(max(row)) for row in probs]
+
+# 제목별 결과 캐시 (sentiment_cache): (정규화된 제목, 백엔드, 모델 버전) 기준으로 저장해 두고 캐시에 없는 제목만 계산
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return stable_hash(f.read())[:16]
+
+_versions = {}
+
+def backend_version(backend):
+    """백엔드 결과가 바뀌는 요인(사전/전처리 코드, 번역 모델, 라이브러리/모델 버전)을 묶은 버전 문자열"""
+    if backend == "koelectra":
+        # 백엔드 전환(KOELECTRA_BACKEND)이 바로 반영되도록 매번 계산 (결과는 [레이블, 확신도])
+        return f"{koelectra.model_version()}:conf"
+    if backend not in _versions:
+        if backend == "sentiword":
+            source = sentiword_index.load_index(SENTIWORD_PATH)["source"]
+            preprocessing_path = os.path.join(BASE_DIR, "preprocessing.py")
+            _versions[backend] = f"{source.get('sha256', source['mtime'])}:{_file_hash(preprocessing_path)}"
+        else:
+            package = {"textblob": "textblob", "vader": "vaderSentiment", "flair": "flair"}[backend]
+            _versions[backend] = f"{package}-{_package_version(package)}:{translation.TRANSLATION_MODEL}"
+            if backend == "flair":
+                _versions[backend] += ":conf"  # 결과는 [레이블, 확신도]
+    return _versions[backend]
+
+def cached_sentiword_scores(titles, token_lists):
+    token_lists = list(token_lists)
+    def compute(positions):
+        scores, labels = sentiword_scores([token_lists[i] for i in positions])
+        return [[score, label] for score, label in zip(scores, labels)]
+    results = sentiment_cache.cached_results("sentiword", backend_version("sentiword"), titles, compute)
+    return [score for score, _ in results], [label for _, label in results]
+
+def cached_lexical_labels(titles, titles_en, textblob=True, vader=True):
+    """TextBlob / Vader 캐시를 한 번에 조회하고, 둘 중 하나라도 없는 제목은 lexical_labels 한 번으로 함께 계산
+    (각 백엔드에는 그 백엔드에 없던 결과만 저장, 번역에 실패한 제목은 저장하지 않고 중립(0))"""
+    titles_en = list(titles_en)
+    backends = [backend for backend, enabled in (("textblob", textblob), ("vader", vader)) if enabled]
+    if not backends:
+        return {}
+    def compute(positions, missing):
+        labels = lexical_labels([titles_en[i] for i in positions], textblob="textblob" in missing, vader="vader" in missing)
+        return {backend: [label if titles_en[i] else None for i, label in zip(positions, labels[backend])] for backend in missing}
+    results = sentiment_cache.cached_results_fused({backend: backend_version(backend) for backend in backends}, titles, compute)
+    return {backend: [0 if label is None else label for label in labels] for backend, labels in results.items()}
+
+def cached_flair_labels(titles, titles_en):
+    """Flair (레이블, 확신도) (번역에 실패한 제목은 저장하지 않고 중립(0), 확신도 1.0)"""
+    titles_en = list(titles_en)
+    def compute(positions):
+        labels, scores = flair_labels([titles_en[i] for i in positions], return_scores=True)
+        return [[label, score] if titles_en[i] else None for i, label, score in zip(positions, labels, scores)]
+    results = sentiment_cache.cached_results("flair", backend_version("flair"), titles, compute)
+    results = [[0, 1.0] if result is None else result for result in results]
+    return [label for label, _ in results], [confidence for _, confidence in results]
+
+def cached_koelectra_labels(titles):
+    """KoELECTRA (레이블, 확신도)"""
+    titles = [str(title) for title in titles]
+    def compute(positions):
+        labels, confidences = koelectra_labels([titles[i] for i in positions], return_confidences=True)
+        return [[label, confidence] for label, confidence in zip(labels, confidences)]
+    results = sentiment_cache.cached_results("koelectra", backend_version("koelectra"), titles, compute)
+    return [label for label, _ in results], [confidence for _, confidence in results]
+
+def majority_sentiment(news_df, columns, weights=None, confidence=False):
+    """columns 의 레이블로 다수결 (weights: {"sentiment_flair": 2, ...} 처럼 주면 가중 투표)
+    confidence=True 면 확신도 컬럼(CONFIDENCE_COLUMNS)이 있는 백엔드의 표를 확신도만큼 반영 (나머지는 1)"""
+    column_weights = [weights.get(column, 1) for column in columns] if weights else None
+    confidences = None
+    if confidence:
+        confidence_columns = {BACKEND_COLUMNS[backend]: column for backend, column in CONFIDENCE_COLUMNS.items()}
+        confidences = np.column_stack([
+            news_df[confidence_columns[column]].to_numpy(dtype=float) if confidence_columns.get(column) in news_df else np.ones(len(news_df))
+            for column in columns
+        ])
+    news_df["majority_sentiment"] = voting.majority_vote(news_df[columns].to_numpy(), weights=column_weights, confidences=confidences)
+    return news_df
+
+# 진행 상황 알림
+# progress 콜백은 {"stage": 단계 이름, "status": "section" | "start" | "done" | "error", "message": 표시할 문구} 이벤트를 받음
+# (Streamlit 화면 출력은 ui.StreamlitProgress 가 이 이벤트를 받아 처리)
+def notify(progress, stage, status, message):
+    if progress is not None:
+        progress({"stage": stage, "status": status, "message": message})
+
+@contextmanager
+def _step(progress, stage, running_message, done_message):
+    notify(progress, stage, "start", running_message)
+    try:
+        yield
+    except Exception as e:
+        notify(progress, stage, "error", f"❌ {e}")
+        raise
+    notify(progress, stage, "done", done_message)
+
 # 총 감정 분석 수행 함수 (4가지 방식 + Voting)
-def perform_sentiment_analysis(news_df):
-    sentiment_dict = load_sentiword_dict()
+# 비활성화된 백엔드(model_registry.DISABLED_BACKENDS)는 건너뛰고 나머지 결과로만 투표
+# 이미 분석한 제목은 sentiment_cache 에 저장된 결과를 사용 (적중률: sentiment_cache.get_cache().stats_report())
+def perform_sentiment_analysis(news_df, weights=None, progress=None, confidence=False):
+    backends = enabled_backends()
 
     # 1. 감성어 사전 분석
-    st.markdown("#### 1. 감성어 사전 기반 감정 분석")
-    with st.spinner("감성어 사전 기반 감정 분석 수행 중... ⏳"):
-        news_df["sentiment_score_sentiword"] = news_df["token_lst"].apply(lambda tokens: calculate_sentiment(tokens, sentiment_dict))
-        news_df["sentiment_label_sentiword"] = news_df["sentiment_score_sentiword"].apply(classify_sentiment)
-    st.write("✅ 감성어 사전 기반 감정 분석 완료!")
-
-    # 2.0 GPT 번역
-    st.markdown("#### 2. 감정 분석 라이브러리")
-    st.markdown("##### 2.0 감정 분석 라이브러리를 위한 GPT로 영어 번역")
-    with st.spinner("기사 제목을 영어로 번역 중... ⏳"):
-        news_df["title_en"] = news_df["제목"].apply(gpt_translate_to_english)
-    st.write("✅ GPT 번역 완료!") 
-
-    # 2.1 감정 분석 라이브러리 적용
-    st.markdown("##### 2.1 감정 분석 라이브러리 적용")
-
-    with st.spinner("TextBlob 감정 분석 중... ⏳"):
-        news_df["sentiment_textblob"] = news_df["title_en"].apply(sentiment_analysis_textblob)
-    st.write("  ✅ TextBlob 감정 분석 완료!")
-
-    with st.spinner("Vader 감정 분석 중... ⏳"):
-        news_df["sentiment_vader"] = news_df["title_en"].apply(sentiment_analysis_vader)
-    st.write("  ✅ Vader 감정 분석 완료!")
-
-    with st.spinner("Flair 감정 분석 중... ⏳"):
-        news_df["sentiment_flair"] = news_df["title_en"].apply(sentiment_analysis_flair)
-    st.write("  ✅ Flair 감정 분석 완료!")
+    if "sentiword" in backends:
+        notify(progress, "sentiword", "section", "#### 1. 감성어 사전 기반 감정 분석")
+        with _step(progress, "sentiword", "감성어 사전 기반 감정 분석 수행 중... ⏳", "✅ 감성어 사전 기반 감정 분석 완료!"):
+            news_df["sentiment_score_sentiword"], news_df["sentiment_label_sentiword"] = cached_sentiword_scores(news_df["제목"], news_df["token_lst"])
+
+    # 2.0 GPT 번역 (번역이 꺼져 있으면 영어 기반 라이브러리도 모두 건너뜀)
+    if any(backend in backends for backend in TRANSLATION_BACKENDS):
+        notify(progress, "translate", "section", "#### 2. 감정 분석 라이브러리")
+        notify(progress, "translate", "section", "##### 2.0 감정 분석 라이브러리를 위한 GPT로 영어 번역")
+        with _step(progress, "translate", "기사 제목을 영어로 번역 중... ⏳", "✅ GPT 번역 완료!"):
+            news_df["title_en"] = translate_titles(news_df["제목"])
+
+        # 2.1 감정 분석 라이브러리 적용
+        notify(progress, "lexical", "section", "##### 2.1 감정 분석 라이브러리 적용")
+
+        if "textblob" in backends or "vader" in backends:
+            done = " / ".join(name for backend, name in (("textblob", "TextBlob"), ("vader", "Vader")) if backend in backends)
+            with _step(progress, "lexical", "TextBlob / Vader 감정 분석 중... ⏳", f"  ✅ {done} 감정 분석 완료!"):
+                lexical = cached_lexical_labels(news_df["제목"], news_df["title_en"], textblob="textblob" in backends, vader="vader" in backends)
+                for backend, labels in lexical.items():
+                    news_df[BACKEND_COLUMNS[backend]] = labels
+
+        if "flair" in backends:
+            with _step(progress, "flair", "Flair 감정 분석 중... ⏳", "  ✅ Flair 감정 분석 완료!"):
+                news_df["sentiment_flair"], news_df["confidence_flair"] = cached_flair_labels(news_df["제목"], news_df["title_en"])
     
     # 3. Fine-tuned KoELECTRA
-    st.markdown("#### 3. Fine-Tuned KoELECTRA 감성 분석 적용")
-    with st.spinner("KoELECTRA 감성 분석 중... ⏳"):
-        news_df["sentiment_koelectra"] = news_df["제목"].apply(sentiment_analysis_koelectra)
-    st.write("  ✅ KoELECTRA 감성 분석 완료!")
+    if "koelectra" in backends:
+        notify(progress, "koelectra", "section", "#### 3. Fine-Tuned KoELECTRA 감성 분석 적용")
+        with _step(progress, "koelectra", "KoELECTRA 감성 분석 중... ⏳", "  ✅ KoELECTRA 감성 분석 완료!"):
+            news_df["sentiment_koelectra"], news_df["confidence_koelectra"] = cached_koelectra_labels(news_df["제목"])
 
 
     # 4. 최종 Voting (다수결)
-    st.markdown("#### 4. 감정 분석 결과 투표")
-    with st.spinner("투표 중... ⏳"):
-        sentiment_columns = ["sentiment_label_sentiword", "sentiment_textblob", "sentiment_vader", "sentiment_flair", "sentiment_koelectra"]
-
-        def majority_vote(row):
-            counts = row.value_counts()
-            max_count = counts.max()
-            max_sentiments = counts[counts == max_count].index.tolist()
-            return 0 if len(max_sentiments) > 1 else max_sentiments[0]
-
-        news_df["majority_sentiment"] = news_df[sentiment_columns].apply(majority_vote, axis=1)
-    st.write("✅ 감정 분석 다수결 결과 도출 완료!")
+    notify(progress, "vote", "section", "#### 4. 감정 분석 결과 투표")
+    with _step(progress, "vote", "투표 중... ⏳", "✅ 감정 분석 다수결 결과 도출 완료!"):
+        news_df = majority_sentiment(news_df, [BACKEND_COLUMNS[backend] for backend in backends], weights, confidence)
 
     return news_df
 
 # 감정 분석 비율 계산 함수
 def calculate_sentiment_ratio(news_df):
-    total = len(news_df)
-    positive_ratio = (news_df["majority_sentiment"] == 1).sum() / total if total > 0 else 0
-    negative_ratio = (news_df["majority_sentiment"] == -1).sum() / total if total > 0 else 0
-    pnr = (news_df["majority_sentiment"] == 1).sum() / ((news_df["majority_sentiment"] == -1).sum() + 0.1)
-
-    return {
-        "positive_ratio": round(positive_ratio * 100, 2),
-        "negative_ratio": round(negative_ratio * 100, 2),
-        "pnr": round(pnr, 2),
-    }
+    return voting.sentiment_ratios(news_df["majority_sentiment"].to_numpy())
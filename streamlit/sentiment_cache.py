@@ -0,0 +1,119 @@
+# sentiment_cache.py
+import json
+import sqlite3
+import threading
+from cache_utils import cache_path, stable_hash
+from translation import normalize_source
+
+SENTIMENT_DB_PATH = cache_path("sentiment_results.sqlite")
+
+def result_key(title, backend, version):
+    """(정규화된 제목, 백엔드, 모델 버전) 해시 → 다른 검색어에 같은 기사 제목이 나와도 같은 키"""
+    return stable_hash(backend, version, normalize_source(title))
+
+def _to_builtin(value):
+    # numpy 정수/실수 → 파이썬 기본 타입 (json.dumps 의 default 이므로 변환할 수 없으면 TypeError)
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"JSON 으로 저장할 수 없는 결과입니다: {type(value).__name__}")
+
+# 제목별 감정 분석 결과 캐시 (SQLite): 결과는 JSON 으로 저장 (레이블 또는 [점수, 레이블])
+class SentimentCache:
+    def __init__(self, db_path=None):
+        self.conn = sqlite3.connect(db_path or SENTIMENT_DB_PATH, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, backend TEXT, version TEXT, value TEXT)")
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def get_many(self, keys):
+        found = {}
+        keys = list(keys)
+        with self.lock:
+            for i in range(0, len(keys), 500):  # SQLite 변수 개수 제한 고려
+                chunk = keys[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def put_many(self, entries):
+        """entries: (key, backend, version, value) 목록"""
+        rows = [(key, backend, version, json.dumps(value, default=_to_builtin)) for key, backend, version, value in entries]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows)
+
+    def record(self, backend, hits, misses):
+        with self.lock:
+            stats = self.stats.setdefault(backend, {"hits": 0, "misses": 0})
+            stats["hits"] += hits
+            stats["misses"] += misses
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {}
+
+    def stats_report(self):
+        """백엔드별 적중/미적중 수와 적중률 목록"""
+        with self.lock:
+            return [{"backend": backend, "hits": s["hits"], "misses": s["misses"],
+                     "hit_ratio": round(s["hits"] / (s["hits"] + s["misses"]), 3) if s["hits"] + s["misses"] else None}
+                    for backend, s in self.stats.items()]
+
+    def clear(self, backend=None):
+        """저장된 결과 삭제 (backend 를 주면 해당 백엔드만)"""
+        with self.lock, self.conn:
+            if backend is None:
+                self.conn.execute("DELETE FROM results")
+            else:
+                self.conn.execute("DELETE FROM results WHERE backend=?", (backend,))
+
+_default_cache = None
+
+def get_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SentimentCache()
+    return _default_cache
+
+def cached_results(backend, version, titles, compute, cache=None):
+    """캐시에 없는 제목만 compute(위치 목록) 로 계산해 제목 순서대로 결과 반환
+    compute 는 받은 위치의 제목들에 대한 결과 목록을 반환 (None 인 결과는 저장하지 않음: 예) 번역 실패)
+    같은 제목이 여러 번 나오면 한 번만 계산"""
+    fused = lambda positions, backends: {backend: compute(positions)}
+    return cached_results_fused({backend: version}, titles, fused, cache)[backend]
+
+def cached_results_fused(versions, titles, compute, cache=None):
+    """여러 백엔드({백엔드: 버전})의 캐시를 한 번에 조회하고, 어느 백엔드에든 없는 제목을 compute 한 번으로 함께 계산
+    compute(위치 목록, 백엔드 목록) 은 {백엔드: 결과 목록} 을 반환 (백엔드 목록: 계산할 제목이 있는 백엔드만)
+    각 백엔드에는 그 백엔드에 없던 제목의 결과만 저장 → {백엔드: 제목 순서대로 결과}"""
+    titles = [str(title) for title in titles]
+    cache = cache or get_cache()
+    keys = {backend: [result_key(title, backend, version) for title in titles] for backend, version in versions.items()}
+    found = cache.get_many({key for backend_keys in keys.values() for key in backend_keys})
+
+    # 백엔드별 미적중 제목의 첫 위치 (같은 제목은 모든 백엔드에서 같은 위치)
+    missing = {}
+    for backend, backend_keys in keys.items():
+        first = {}
+        for i, key in enumerate(backend_keys):
+            if key not in found:
+                first.setdefault(key, i)
+        hits = sum(key in found for key in backend_keys)
+        cache.record(backend, hits, len(backend_keys) - hits)
+        if first:
+            missing[backend] = set(first.values())
+
+    if missing:
+        positions = sorted(set().union(*missing.values()))
+        values = compute(positions, list(missing))
+        entries = []
+        for backend, backend_positions in missing.items():
+            backend_keys = keys[backend]
+            for i, value in zip(positions, values[backend]):
+                if i not in backend_positions:
+                    continue  # 이미 캐시에 있던 결과는 덮어쓰지 않음
+                found[backend_keys[i]] = value
+                if value is not None:
+                    entries.append((backend_keys[i], backend, versions[backend], value))
+        cache.put_many(entries)
+    return {backend: [found[key] for key in backend_keys] for backend, backend_keys in keys.items()}
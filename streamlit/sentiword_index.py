@@ -0,0 +1,103 @@
+# sentiword_index.py
+import os
+import json
+import pickle
+import hashlib
+import numpy as np
+from cache_utils import cache_path
+
+# 감성어 사전 인덱스
+# - unigrams: 단어 → 극성 (기존 load_sentiword_dict 와 동일)
+# - ngrams: 여러 단어로 된 표현의 어근 묶음(word_root, 예: "가격 싸") → 극성
+# 한 번 만든 인덱스는 바이너리(pickle)로 저장해 두고, 사전 파일의 수정 시각/크기/해시가 바뀌면 다시 생성
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SENTIWORD_PATH = os.path.join(BASE_DIR, "SentiWord_info.json")
+INDEX_PATH = cache_path("sentiword_index.pkl")
+
+_index = None
+
+def _file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _to_number(value):
+    """극성 값을 숫자로 변환 (변환 불가 시 NaN: 기존 pd.to_numeric(errors="coerce") 와 동일)"""
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            pass
+    return float("nan")
+
+def build_index(path=SENTIWORD_PATH):
+    """감성어 사전 JSON 으로부터 인덱스 생성"""
+    with open(path, encoding="utf-8-sig", mode="r") as f:
+        SentiWord_info = json.load(f)
+
+    unigrams, ngrams = {}, {}
+    for entry in SentiWord_info:
+        polarity = _to_number(entry["polarity"])
+        unigrams[entry["word"]] = polarity
+        root = tuple(entry["word_root"].split())
+        if " " in entry["word"] and len(root) > 1:
+            ngrams[root] = polarity
+
+    return {"unigrams": unigrams, "ngrams": ngrams, "max_n": max((len(key) for key in ngrams), default=1)}
+
+def load_index(path=SENTIWORD_PATH, index_path=INDEX_PATH):
+    """저장된 인덱스를 불러오고, 사전 파일이 바뀌었으면 다시 생성해 저장 (프로세스 안에서는 한 번만 로드)"""
+    global _index
+    stat = os.stat(path)
+    source = {"mtime": stat.st_mtime, "size": stat.st_size}
+    if _index is not None and _index["source"]["mtime"] == source["mtime"] and _index["source"]["size"] == source["size"]:
+        return _index
+
+    cached = None
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            cached = None
+
+    if cached is not None and cached["source"]["mtime"] == source["mtime"] and cached["source"]["size"] == source["size"]:
+        _index = cached
+        return _index
+
+    # 수정 시각만 바뀌고 내용이 같으면 다시 만들지 않음
+    source["sha256"] = _file_sha256(path)
+    if cached is not None and cached["source"].get("sha256") == source["sha256"]:
+        index = cached
+    else:
+        index = build_index(path)
+    index["source"] = source
+
+    with open(index_path, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    _index = index
+    return _index
+
+def score_tokens(tokens, index=None):
+    """토큰 리스트의 감성 점수 (가장 긴 n-gram 표현부터 일치 여부 확인, 일치한 토큰은 다시 세지 않음)"""
+    index = index or load_index()
+    unigrams, ngrams, max_n = index["unigrams"], index["ngrams"], index["max_n"]
+    tokens = list(tokens)
+    score, i = 0, 0
+    while i < len(tokens):
+        for n in range(min(max_n, len(tokens) - i), 1, -1):
+            polarity = ngrams.get(tuple(tokens[i:i + n]))
+            if polarity is not None:
+                score += polarity
+                i += n
+                break
+        else:
+            score += unigrams.get(tokens[i], 0)
+            i += 1
+    return score
+
+def score_column(token_lists, index=None):
+    """token_lst 컬럼 전체의 감성 점수와 레이블(-1/0/1)을 한 번에 계산"""
+    index = index or load_index()
+    scores = np.array([score_tokens(tokens, index) for tokens in token_lists])
+    labels = np.sign(np.nan_to_num(scores)).astype(int)  # 점수가 NaN 이면 기존 classify_sentiment 와 같이 중립
+    return scores, labels
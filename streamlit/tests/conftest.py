@@ -0,0 +1,8 @@
+# conftest.py
+import os
+import sys
+import tempfile
+
+# streamlit/ 의 모듈을 바로 import 하고, 캐시는 임시 디렉토리에 저장 (모듈 import 전에 설정)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("EV_CACHE_DIR", tempfile.mkdtemp(prefix="ev_cache_"))
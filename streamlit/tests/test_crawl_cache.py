@@ -0,0 +1,33 @@
+# test_crawl_cache.py
+import pandas as pd
+import pytest
+import crawl_cache
+
+S_DATE, E_DATE = "2024.01.01", "2024.01.31"  # 지난 기간 → 저장된 결과를 그대로 사용
+
+
+def _frame(n):
+    return pd.DataFrame([("2024.01.02.", f"제목 {i}", f"https://news/{i}") for i in range(n)], columns=["날짜", "제목", "링크"])
+
+
+def test_short_crawl_is_complete_only_when_crawler_says_so(tmp_path):
+    db_path = str(tmp_path / "crawl.sqlite")
+    # 끝까지 수집하지 못한 짧은 결과는 다음 요청에서 다시 수집
+    crawl_cache.cached_crawl("q", S_DATE, E_DATE, 10, lambda s, e, n: (_frame(3), False), db_path)
+    calls = []
+    crawl_cache.cached_crawl("q", S_DATE, E_DATE, 10, lambda s, e, n: calls.append(1) or (_frame(3), True), db_path)
+    assert calls == [1]
+    # 끝까지 수집한 결과는 그대로 사용
+    df = crawl_cache.cached_crawl("q", S_DATE, E_DATE, 10, lambda s, e, n: pytest.fail("다시 수집함"), db_path)
+    assert list(df["링크"]) == list(_frame(3)["링크"])
+
+
+def test_failed_crawl_is_not_saved(tmp_path):
+    db_path = str(tmp_path / "crawl.sqlite")
+
+    def failing(s, e, n):
+        raise RuntimeError("페이지 요청 실패")
+
+    with pytest.raises(RuntimeError):
+        crawl_cache.cached_crawl("q", S_DATE, E_DATE, 10, failing, db_path)
+    assert crawl_cache.load_crawl("q", S_DATE, E_DATE, db_path) == (None, None)
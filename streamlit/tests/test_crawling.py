@@ -0,0 +1,125 @@
+# test_crawling.py
+import re
+import pytest
+import requests
+import crawling
+
+S_DATE, E_DATE = "2024.01.01", "2024.01.31"
+
+
+def _html(links):
+    items = "".join(f'<div class="info_group"><span class="info">2024.01.02.</span></div><a class="news_tit" href="{link}">제목 {link}</a>' for link in links)
+    return f"<html><body>{items}</body></html>"
+
+
+class FakeResponse:
+    def __init__(self, text="", status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+
+class FakeSession:
+    """start= 오프셋별 링크 목록으로 검색 결과를 흉내 내는 세션 (repeat_last=True 면 마지막 뒤로도 마지막 페이지를 반복)"""
+    def __init__(self, pages, repeat_last=False, failures=None):
+        self.pages = pages
+        self.repeat_last = repeat_last
+        self.failures = dict(failures or {})  # start → 503 으로 실패할 횟수
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        start = int(re.search(r"&start=(\d+)", url).group(1))
+        self.requests.append(start)
+        if self.failures.get(start):
+            self.failures[start] -= 1
+            return FakeResponse(status_code=503)
+        index = (start - 1) // crawling.PAGE_SIZE
+        if index >= len(self.pages):
+            if not self.repeat_last:
+                return FakeResponse(_html([]))
+            index = len(self.pages) - 1
+        return FakeResponse(_html(self.pages[index]))
+
+
+def _links(n_pages, per_page=crawling.PAGE_SIZE):
+    return [[f"https://news/{p}/{i}" for i in range(per_page)] for p in range(n_pages)]
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(crawling, "sleep", calls.append)
+    return calls
+
+
+def _use_session(monkeypatch, session):
+    monkeypatch.setattr(crawling, "create_session", lambda pool_size=10: session)
+
+
+def test_fetch_page_retries_with_backoff(sleeps):
+    session = FakeSession(_links(1), failures={1: 2})
+    html = crawling.fetch_page(session, crawling.build_search_url("q", S_DATE, E_DATE, 1), retries=3, backoff=0.5)
+    assert "https://news/0/0" in html
+    assert session.requests == [1, 1, 1]
+    assert sleeps == [0.5, 1.0]  # 지수 백오프
+
+
+def test_fetch_page_raises_after_retries(sleeps):
+    session = FakeSession(_links(1), failures={1: 10})
+    with pytest.raises(crawling.CrawlError):
+        crawling.fetch_page(session, crawling.build_search_url("q", S_DATE, E_DATE, 1), retries=2, backoff=0.1)
+    assert len(session.requests) == 3
+    assert sleeps == [0.1, 0.2]
+
+
+def test_fetch_page_retries_connection_errors(sleeps):
+    class FlakySession(FakeSession):
+        def get(self, url, timeout=None):
+            if not self.requests:
+                self.requests.append(None)
+                raise requests.ConnectionError("끊김")
+            return super().get(url, timeout)
+    assert "https://news/0/0" in crawling.fetch_page(FlakySession(_links(1)), crawling.build_search_url("q", S_DATE, E_DATE, 1))
+    assert sleeps == [0.5]
+
+
+def test_iter_news_pages_dedupes_links(monkeypatch, sleeps):
+    pages = _links(2)
+    pages.append(pages[1][5:] + ["https://news/new/0"])  # 앞 페이지와 겹치는 링크
+    _use_session(monkeypatch, FakeSession(pages))
+    status = {}
+    links = [link for page in crawling.iter_news_pages("q", S_DATE, E_DATE, 100, status) for link in page["링크"]]
+    assert len(links) == len(set(links)) == 21
+    assert status["complete"]
+
+
+def test_iter_news_pages_stops_when_page_repeats(monkeypatch, sleeps):
+    # 마지막 페이지를 넘겨도 빈 페이지 대신 같은 페이지가 반복되는 경우
+    session = FakeSession(_links(3), repeat_last=True)
+    _use_session(monkeypatch, session)
+    status = {}
+    df = crawling.naver_news_crawler("q", S_DATE, E_DATE, 100, use_cache=False, status=status)
+    assert len(df) == 30
+    assert status["complete"]
+    assert session.requests == [1, 11, 21, 31]
+
+
+@pytest.mark.parametrize("repeat_last", [False, True])
+def test_concurrent_crawler_dedupes_and_stops(monkeypatch, sleeps, repeat_last):
+    pages = _links(5)
+    pages[3] = pages[2][:4] + pages[3][:6]  # 앞 페이지와 겹치는 링크
+    session = FakeSession(pages, repeat_last=repeat_last)
+    _use_session(monkeypatch, session)
+    status = {}
+    df = crawling.naver_news_crawler("q", S_DATE, E_DATE, 1000, concurrent=True, max_workers=2, rate=1000, use_cache=False, status=status)
+    assert df["링크"].is_unique
+    assert len(df) == 46
+    assert status["complete"]
+    assert max(session.requests) <= 71  # 새 링크가 없는 배치에서 바로 종료
+
+
+def test_concurrent_crawler_respects_max_count(monkeypatch, sleeps):
+    _use_session(monkeypatch, FakeSession(_links(10)))
+    status = {}
+    df = crawling.naver_news_crawler("q", S_DATE, E_DATE, 25, concurrent=True, max_workers=3, rate=1000, use_cache=False, status=status)
+    assert list(df["링크"]) == [link for page in _links(3) for link in page][:25]
+    assert not status["complete"]
@@ -0,0 +1,60 @@
+# test_koelectra_batch.py
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+import koelectra
+import model_registry
+
+
+class FakeTokenizer:
+    """글자 하나를 토큰 하나로 보는 토크나이저 (호출 횟수와 배치별 패딩 길이 기록)"""
+    def __init__(self):
+        self.calls = 0
+        self.padded_lengths = []
+
+    def __call__(self, texts, truncation=False, max_length=None, **kwargs):
+        assert "padding" not in kwargs and "return_tensors" not in kwargs  # 패딩 없이 한 번만 토큰화
+        self.calls += 1
+        ids = [[ord(ch) for ch in text][:max_length] for text in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(row) for row in ids]}
+
+    def pad(self, features, return_tensors=None):
+        width = max(len(feature["input_ids"]) for feature in features)
+        self.padded_lengths.append(width)
+        return {key: torch.tensor([feature[key] + [0] * (width - len(feature[key])) for feature in features])
+                for key in ("input_ids", "attention_mask")}
+
+
+class FakeOutput:
+    def __init__(self, logits):
+        self.logits = logits
+
+
+class FakeModel(torch.nn.Module):
+    """실제 토큰 수(제목 길이) % 3 을 예측 클래스로 하는 모델"""
+    def forward(self, input_ids, attention_mask):
+        lengths = attention_mask.sum(dim=1)
+        return FakeOutput(torch.nn.functional.one_hot(lengths % 3, num_classes=3).float())
+
+
+@pytest.fixture
+def fake_backend():
+    tokenizer = FakeTokenizer()
+    model_registry.register("koelectra-fake", lambda: (FakeModel(), tokenizer))
+    yield tokenizer
+    model_registry.unload("koelectra-fake")
+
+
+def test_batches_by_length_and_restores_order(fake_backend):
+    texts = ["가" * n for n in (7, 1, 5, 2, 9, 3, 4)]
+    labels, probs = koelectra.sentiment_analysis_koelectra_batch(texts, batch_size=3, return_probs=True, backend="fake")
+    assert fake_backend.calls == 1
+    assert fake_backend.padded_lengths == [3, 7, 9]  # 길이순으로 묶여 배치마다 가장 긴 제목까지만 패딩
+    assert labels == [koelectra.label_mapping[len(text) % 3] for text in texts]  # 입력 순서대로 복원
+    assert [max(range(3), key=row.__getitem__) for row in probs] == [len(text) % 3 for text in texts]
+
+
+def test_empty_input(fake_backend):
+    assert koelectra.sentiment_analysis_koelectra_batch([], backend="fake") == []
+    assert fake_backend.calls == 0
@@ -0,0 +1,24 @@
+# test_koelectra_parity.py
+import os
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+import koelectra
+
+HAS_WEIGHTS = any(name.endswith((".bin", ".safetensors")) for name in os.listdir(koelectra.MODEL_PATH))
+
+
+def test_parity_titles_are_shipped():
+    titles = koelectra.load_parity_titles()
+    assert len(titles) >= 30
+    assert len(set(titles)) == len(titles)
+
+
+@pytest.mark.skipif(not HAS_WEIGHTS, reason="saved_model 에 KoELECTRA 가중치가 없음")
+@pytest.mark.parametrize("backend", ["int8", "onnx", "onnx-int8"])
+def test_backend_matches_float_model(backend):
+    if backend.startswith("onnx"):
+        pytest.importorskip("onnxruntime")
+    result = koelectra.check_parity(backend=backend)
+    assert result["agreement"] >= koelectra.PARITY_MIN_AGREEMENT, result["mismatches"]
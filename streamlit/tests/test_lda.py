@@ -0,0 +1,39 @@
+# test_lda.py
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip("gensim")
+pytest.importorskip("pyLDAvis")
+import lda
+import news_store
+
+DOCS = [["전기차", "충전", "보조금"], ["배터리", "화재", "리콜"], ["전기차", "배터리", "가격"], ["충전", "인프라", "확대"]] * 5
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_store, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(lda, "LDA_CORPUS_DIR", str(tmp_path / "corpus"))
+    os.makedirs(lda.LDA_CORPUS_DIR)
+    return tmp_path
+
+
+def test_train_lda_months_streams_saved_months(stores):
+    for month in ["2024-01", "2024-02"]:
+        news_store.save_frame(pd.DataFrame({"제목": ["t"] * len(DOCS), "token_lst": DOCS}), "processed", "현대", "아이오닉5", month)
+
+    html = lda.train_lda_months("현대", "아이오닉5", ["2024-01", "2024-02", "2024-03"], workers=2, num_topics=2, passes=1, iterations=5)  # LdaMulticore 경로
+    assert html and "ldavis" in html.lower()
+    assert os.listdir(lda.LDA_CORPUS_DIR) == []  # 임시 corpus 폴더는 학습 후 삭제
+
+
+def test_train_lda_months_without_data(stores):
+    assert lda.train_lda_months("현대", "아이오닉5", ["2024-01"], workers=1) is None
+
+
+def test_streaming_corpus_matches_in_memory(stores, tmp_path):
+    path = str(tmp_path / "docs.jsonl")
+    documents = lda.write_token_lists(DOCS, path)
+    corpus, dictionary = lda.build_streaming_corpus(documents, str(tmp_path / "corpus.mm"))
+    assert [list(doc) for doc in corpus] == [[(i, float(n)) for i, n in dictionary.doc2bow(doc)] for doc in DOCS]
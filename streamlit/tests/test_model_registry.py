@@ -0,0 +1,84 @@
+# test_model_registry.py
+import threading
+import model_registry
+
+
+def test_loader_can_load_another_entry():
+    # koelectra-onnx 처럼 로더 안에서 다른 백엔드를 불러오는 경우
+    model_registry.register("test-inner", lambda: "inner")
+    model_registry.register("test-outer", lambda: ("outer", model_registry.get_model("test-inner")))
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(value=model_registry.get_model("test-outer")), daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive(), "중첩 로드에서 교착 상태 발생"
+    assert result["value"] == ("outer", "inner")
+    assert model_registry.get_model("test-inner") == "inner"
+    model_registry.unload("test-outer")
+    model_registry.unload("test-inner")
+
+
+def test_loader_runs_once_under_concurrency():
+    calls = []
+    model_registry.register("test-once", lambda: calls.append(1) or object())
+    threads = [threading.Thread(target=model_registry.get_model, args=("test-once",), daemon=True) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    assert len(calls) == 1
+    model_registry.unload("test-once")
+
+
+def test_parallel_loads_are_measured_one_at_a_time(monkeypatch):
+    # 로드 중 늘어난 RSS 를 흉내: 로더가 실행되는 동안만 rss 가 늘어남
+    rss = {"value": 100.0}
+    monkeypatch.setattr(model_registry, "current_rss_mb", lambda: rss["value"])
+    active, overlaps = [], []
+    started = threading.Barrier(2, timeout=0.5)
+
+    def loader(size):
+        def load():
+            try:
+                started.wait()  # 두 스레드가 동시에 로드를 시작하면 여기서 만남
+            except threading.BrokenBarrierError:
+                pass
+            active.append(size)
+            overlaps.append(len(active))
+            rss["value"] += size
+            active.remove(size)
+            return size
+        return load
+
+    model_registry.register("test-a", loader(10.0))
+    model_registry.register("test-b", loader(30.0))
+    threads = [threading.Thread(target=model_registry.get_model, args=(name,), daemon=True) for name in ("test-a", "test-b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    stats = {row["backend"]: row for row in model_registry.model_stats()}
+    assert overlaps == [1, 1]
+    assert stats["test-a"]["rss_mb"] == 10.0 and stats["test-b"]["rss_mb"] == 30.0
+    model_registry.unload("test-a")
+    model_registry.unload("test-b")
+
+
+def test_nested_load_rss_is_not_counted_twice(monkeypatch):
+    rss = {"value": 100.0}
+    monkeypatch.setattr(model_registry, "current_rss_mb", lambda: rss["value"])
+    def inner():
+        rss["value"] += 50.0
+        return "inner"
+    def outer():
+        model_registry.get_model("test-nested-inner")
+        rss["value"] += 20.0
+        return "outer"
+    model_registry.register("test-nested-inner", inner)
+    model_registry.register("test-nested-outer", outer)
+    model_registry.get_model("test-nested-outer")
+    stats = {row["backend"]: row for row in model_registry.model_stats()}
+    assert stats["test-nested-inner"]["rss_mb"] == 50.0
+    assert stats["test-nested-outer"]["rss_mb"] == 20.0
+    model_registry.unload("test-nested-outer")
+    model_registry.unload("test-nested-inner")
@@ -0,0 +1,63 @@
+# test_news_store.py
+import os
+import pandas as pd
+import pytest
+import news_store
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_store, "STORE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _frame(month, n=3):
+    return pd.DataFrame({
+        "날짜": [f"{month}-0{i + 1}" for i in range(n)],
+        "제목": [f"{month} 제목 {i}" for i in range(n)],
+        "링크": [f"https://news/{month}/{i}" for i in range(n)],
+        "token_lst": [["전기차", f"토큰{i}"] for i in range(n)],
+        "sentiment_vader": [1, 0, -1][:n],
+    })
+
+
+def test_round_trip_keeps_list_columns():
+    df = _frame("2024-01")
+    news_store.save_frame(df.set_index("링크", drop=False), "processed", "현대", "아이오닉5", "2024-01")
+    loaded = news_store.load_frame("processed", "현대", "아이오닉5", "2024-01")
+    pd.testing.assert_frame_equal(loaded, df)
+    assert loaded["token_lst"][0] == ["전기차", "토큰0"]  # numpy 배열이 아닌 파이썬 리스트
+    assert news_store.load_frame("processed", "현대", "아이오닉5", "2024-02") is None
+
+
+def test_column_projection_ignores_missing_columns():
+    news_store.save_frame(_frame("2024-01"), "processed", "현대", "아이오닉5", "2024-01")
+    loaded = news_store.load_frame("processed", "현대", "아이오닉5", "2024-01", columns=["token_lst", "없는 컬럼"])
+    assert list(loaded.columns) == ["token_lst"]
+
+
+def test_load_dataset_filters_partitions_and_projects():
+    for brand, model, month in [("현대", "아이오닉5", "2024-01"), ("현대", "아이오닉5", "2024-02"), ("기아", "EV6", "2024-01")]:
+        news_store.save_frame(_frame(month), "processed", brand, model, month)
+    df = news_store.load_dataset("processed", ["제목", "없는 컬럼"], brands=["현대"], months=["2024-02"])
+    assert list(df.columns) == ["제목", "brand", "model", "month"]
+    assert len(df) == 3
+    assert set(df["month"]) == {"2024-02"} and set(df["brand"]) == {"현대"}
+    assert len(news_store.load_dataset("processed")) == 9
+    assert news_store.list_partitions("processed") == [("기아", "EV6", "2024-01"), ("현대", "아이오닉5", "2024-01"), ("현대", "아이오닉5", "2024-02")]
+    assert news_store.load_dataset("crawl") is None
+
+
+def test_leftover_tmp_file_is_not_read(monkeypatch):
+    path = news_store.save_frame(_frame("2024-01"), "processed", "현대", "아이오닉5", "2024-01")
+    assert os.listdir(os.path.dirname(path)) == ["part.parquet"]  # 임시 파일은 이름을 바꿔 남지 않음
+
+    # 덮어쓰다가 이름 바꾸기 전에 중단 → 남은 임시 파일은 데이터셋에서 무시하고 기존 파일만 읽음
+    def interrupted(src, dst):
+        raise OSError("중단")
+    monkeypatch.setattr(news_store.os, "replace", interrupted)
+    with pytest.raises(OSError):
+        news_store.save_frame(_frame("2024-02"), "processed", "현대", "아이오닉5", "2024-01")
+    assert len(os.listdir(os.path.dirname(path))) == 2
+    df = news_store.load_dataset("processed", ["제목"])
+    assert list(df["제목"]) == list(_frame("2024-01")["제목"])
@@ -0,0 +1,33 @@
+# test_pipeline.py
+from pipeline import Pipeline
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+def test_results_follow_dependencies():
+    pipeline = Pipeline(max_workers=2)
+    pipeline.add("a", lambda: 1)
+    pipeline.add("b", lambda a: a + 1, deps=["a"])
+    pipeline.add("c", lambda a, b: a * 10 + b, deps=["a", "b"])
+    results = {result.name: result for result in pipeline.run()}
+    assert results["c"].value == 12
+    assert [row["stage"] for row in pipeline.report] == ["a", "b", "c"]
+
+
+def test_progress_events_and_failed_dependencies():
+    events = []
+    pipeline = Pipeline(max_workers=2)
+    pipeline.add("ok", lambda: 1)
+    pipeline.add("bad", _fail)
+    pipeline.add("after_bad", lambda value: value, deps=["bad"])
+    results = {result.name: result for result in pipeline.run(progress=events.append)}
+
+    assert results["ok"].ok and not results["bad"].ok
+    assert isinstance(results["bad"].error, ValueError)
+    assert not results["after_bad"].ok  # 실패한 단계에 의존하는 단계는 실행하지 않음
+
+    statuses = {(event["stage"], event["status"]) for event in events}
+    assert statuses == {("ok", "start"), ("ok", "done"), ("bad", "start"), ("bad", "error"), ("after_bad", "error")}
+    assert [event["status"] for event in events if event["stage"] == "bad"] == ["start", "error"]
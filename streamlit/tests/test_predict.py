@@ -0,0 +1,67 @@
+# test_predict.py
+import numpy as np
+import pandas as pd
+import pytest
+import predict
+
+A, B = 0.5, 0.9  # log1p(sales) = A * pnr + B * log1p(전월 sales)
+
+
+def _series(months, pnr, start_sales=100.0):
+    """달력상 연속된 months 에 대해 회귀식을 정확히 따르는 판매량 생성"""
+    sales, log_prev = [], np.log1p(start_sales)
+    for p in pnr:
+        log_prev = A * p + B * log_prev
+        sales.append(np.expm1(log_prev))
+    return pd.DataFrame({"year_month": months, "brand": "현대", "model": "아이오닉5", "pnr_naver": pnr, "sales": sales})
+
+
+def test_forecast_uses_calendar_previous_month_across_gaps():
+    months = [f"2023-{m:02d}" for m in range(1, 8)]
+    full = _series(months, [1.0, 2.0, 0.5, 1.5, 3.0, 2.5, 1.0])
+    df = full.drop(index=3).reset_index(drop=True)  # 2023-04 누락
+    df.loc[df["year_month"] == "2023-07", "sales"] = np.nan  # 예측 대상
+
+    out, test = predict.forecast_recursive(df)
+    may = out[out["year_month"] == pd.Timestamp("2023-05-01")].iloc[0]
+    assert may["previous_month_sales"] != pytest.approx(full.loc[2, "sales"])  # 3월 판매량이 전월로 들어가면 안 됨
+
+    # 5월은 전월이 없어 학습에서 빠지므로 나머지 달로 회귀식을 정확히 복원
+    assert len(test) == 1
+    assert test["predicted_sales"].iloc[0] == pytest.approx(full.loc[6, "sales"], rel=1e-6)
+
+
+def test_forecast_chains_multiple_missing_months():
+    months = [f"2023-{m:02d}" for m in range(1, 9)]
+    full = _series(months, [1.0, 2.0, 0.5, 1.5, 3.0, 2.5, 1.0, 1.0])
+    df = full.copy()
+    df.loc[6:, "sales"] = np.nan
+    _, test = predict.forecast_recursive(df)
+    assert test["predicted_sales"].to_numpy() == pytest.approx(full.loc[6:, "sales"].to_numpy(), rel=1e-6)
+
+
+def test_forecast_empty_frame():
+    df = _series(["2023-01"], [1.0]).iloc[:0]
+    out, test = predict.forecast_recursive(df)
+    assert out.empty and test.empty
+    assert "predicted_sales" in test.columns
+
+
+def test_fit_and_predict_recovers_coefficients():
+    months = [f"2023-{m:02d}" for m in range(1, 8)]
+    df = _series(months, [1.0, 2.0, 0.5, 1.5, 3.0, 2.5, 1.0])
+    df["previous_month_sales"] = df["sales"].shift(1).fillna(100.0)
+    expected = df.loc[6, "sales"]
+    df.loc[6, "sales"] = np.nan
+    _, test = predict.fit_and_predict(df)
+    assert test["predicted_sales"].iloc[0] == pytest.approx(expected, rel=1e-6)
+
+
+def test_rolling_backtest_is_exact_on_noise_free_series():
+    months = [f"2023-{m:02d}" for m in range(1, 9)]
+    df = _series(months, [1.0, 2.0, 0.5, 1.5, 3.0, 2.5, 1.0, 0.2])
+    df["previous_month_sales"] = df["sales"].shift(1).fillna(100.0)
+    predictions, errors = predict.rolling_backtest(df, min_train=2)
+    assert len(predictions) == len(df) - 2
+    assert predictions["abs_error"].max() == pytest.approx(0, abs=1e-6)
+    assert errors["n_cutoffs"].iloc[0] == len(df) - 2
@@ -0,0 +1,16 @@
+# test_preprocessing.py
+import pytest
+
+pytest.importorskip("hanja")
+pytest.importorskip("konlpy")
+import preprocessing
+
+
+def test_single_pass_normalizer_matches_legacy_on_corpus():
+    # normalizer_corpus.txt 의 실제 기사 제목 전체에서 기존 단계별 방식과 결과가 같아야 함
+    assert preprocessing.check_normalizer_equivalence() == []
+
+
+def test_single_pass_normalizer_matches_legacy_on_edge_cases():
+    titles = ["", "   ", "[단독] 現代車 ‘아이오닉5’…美 판매 1위!!", "(종합2보) 기아 EV9 <사진>", "ⓒ 연합뉴스 無단 전재"]
+    assert preprocessing.check_normalizer_equivalence(titles) == []
@@ -0,0 +1,39 @@
+# test_sentiment_cache.py
+import numpy as np
+import pytest
+from sentiment_cache import SentimentCache, cached_results, cached_results_fused
+
+
+def test_numpy_results_round_trip():
+    cache = SentimentCache(":memory:")
+    titles = ["제목 A", "제목 B", "제목 A"]
+    compute = lambda positions: [[np.float64(0.5), np.int64(1)] for _ in positions]
+    assert cached_results("sentiword", "v1", titles, compute, cache) == [[0.5, 1]] * 3
+    # 두 번째 호출은 모두 캐시에서 읽음
+    assert cached_results("sentiword", "v1", titles, lambda positions: pytest.fail("다시 계산함"), cache) == [[0.5, 1]] * 3
+    assert cache.stats_report()[0]["hits"] == 3
+
+
+def test_unsupported_result_raises_type_error():
+    cache = SentimentCache(":memory:")
+    with pytest.raises(TypeError):
+        cached_results("flair", "v1", ["제목"], lambda positions: [object() for _ in positions], cache)
+
+
+def test_fused_results_compute_union_of_misses_once():
+    cache = SentimentCache(":memory:")
+    cached_results("textblob", "v1", ["제목 A"], lambda positions: [1 for _ in positions], cache)
+    cached_results("vader", "v1", ["제목 B"], lambda positions: [-1 for _ in positions], cache)
+
+    calls = []
+    def compute(positions, backends):
+        calls.append((positions, sorted(backends)))
+        return {backend: [0 if i < 3 else None for i in positions] for backend in backends}
+    titles = ["제목 A", "제목 B", "제목 C", "번역 실패", "제목 A"]
+    results = cached_results_fused({"textblob": "v1", "vader": "v1"}, titles, compute, cache)
+    assert calls == [([0, 1, 2, 3], ["textblob", "vader"])]  # 두 백엔드의 미적중 합집합을 한 번에 계산
+    assert results == {"textblob": [1, 0, 0, None, 1], "vader": [0, -1, 0, None, 0]}
+
+    # 캐시에 있던 결과는 덮어쓰지 않고, None 이 아닌 결과만 저장
+    again = cached_results_fused({"textblob": "v1", "vader": "v1"}, titles[:3], lambda positions, backends: pytest.fail("다시 계산함"), cache)
+    assert again == {"textblob": [1, 0, 0], "vader": [0, -1, 0]}
@@ -0,0 +1,89 @@
+# test_sentiword_index.py
+import json
+import math
+import os
+import pytest
+import sentiword_index
+
+ENTRIES = [
+    {"word": "좋다", "word_root": "좋", "polarity": "2"},
+    {"word": "싸다", "word_root": "싸", "polarity": "1"},
+    {"word": "가격", "word_root": "가격", "polarity": "0"},
+    {"word": "비싸다", "word_root": "비싸", "polarity": "-1"},
+    {"word": "가격 싸다", "word_root": "가격 싸", "polarity": "1"},
+    {"word": "가격 너무 싸다", "word_root": "가격 너무 싸", "polarity": "-2"},  # 싸구려 뉘앙스
+    {"word": "애매하다", "word_root": "애매", "polarity": "없음"},  # 숫자가 아닌 극성 → NaN
+]
+
+
+def _write(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentiword_index, "_index", None)  # 프로세스 안 캐시 초기화
+    path, index_path = str(tmp_path / "SentiWord_info.json"), str(tmp_path / "index.pkl")
+    _write(path, ENTRIES)
+    return path, index_path
+
+
+def test_longest_ngram_match_wins(paths):
+    index = sentiword_index.load_index(*paths)
+    assert index["max_n"] == 3
+    assert sentiword_index.score_tokens(["가격", "싸"], index) == 1                # 2-gram
+    assert sentiword_index.score_tokens(["가격", "너무", "싸"], index) == -2       # 2-gram 보다 긴 3-gram 우선
+    # 일치한 토큰은 다시 세지 않고, 나머지는 단어 단위로 점수 합산
+    assert sentiword_index.score_tokens(["좋다", "가격", "너무", "싸", "좋다"], index) == 2 - 2 + 2
+    assert sentiword_index.score_tokens(["가격", "비싸다"], index) == 0 - 1
+    assert sentiword_index.score_tokens([], index) == 0
+
+
+def test_nan_polarity_scores_nan_and_labels_neutral(paths):
+    index = sentiword_index.load_index(*paths)
+    assert math.isnan(index["unigrams"]["애매하다"])
+    scores, labels = sentiword_index.score_column([["좋다"], ["비싸다"], ["애매하다", "좋다"], ["없는 단어"]], index)
+    assert scores[:2].tolist() == [2, -1] and math.isnan(scores[2]) and scores[3] == 0
+    assert labels.tolist() == [1, -1, 0, 0]
+
+
+def test_index_is_rebuilt_only_when_dictionary_changes(paths, monkeypatch):
+    path, index_path = paths
+    first = sentiword_index.load_index(path, index_path)
+    assert os.path.exists(index_path)
+
+    # 같은 프로세스, 같은 파일: 메모리의 인덱스 그대로
+    assert sentiword_index.load_index(path, index_path) is first
+
+    # 새 프로세스처럼 메모리 캐시 없이: 저장된 인덱스 사용 (다시 만들지 않음)
+    def fail(path):
+        pytest.fail("인덱스를 다시 만듦")
+    monkeypatch.setattr(sentiword_index, "build_index", fail)
+    monkeypatch.setattr(sentiword_index, "_index", None)
+    assert sentiword_index.load_index(path, index_path)["source"] == first["source"]
+
+    # 수정 시각만 바뀌고 내용이 같으면 해시로 확인해 재사용 (새 수정 시각은 기록)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    monkeypatch.setattr(sentiword_index, "_index", None)
+    reused = sentiword_index.load_index(path, index_path)
+    assert reused["source"]["mtime"] == stat.st_mtime + 10
+    assert reused["source"]["sha256"] == sentiword_index._file_sha256(path)
+
+    # 내용이 바뀌면 다시 생성
+    monkeypatch.undo()
+    monkeypatch.setattr(sentiword_index, "_index", None)
+    _write(path, ENTRIES + [{"word": "최고", "word_root": "최고", "polarity": "2"}])
+    os.utime(path, (stat.st_atime, stat.st_mtime + 20))
+    rebuilt = sentiword_index.load_index(path, index_path)
+    assert rebuilt["unigrams"]["최고"] == 2
+    monkeypatch.setattr(sentiword_index, "_index", None)
+    assert sentiword_index.load_index(path, index_path)["unigrams"]["최고"] == 2  # 저장된 인덱스도 갱신됨
+
+
+def test_corrupt_index_file_is_rebuilt(paths):
+    path, index_path = paths
+    with open(index_path, "wb") as f:
+        f.write(b"not a pickle")
+    assert sentiword_index.load_index(path, index_path)["unigrams"]["좋다"] == 2
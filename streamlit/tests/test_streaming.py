@@ -0,0 +1,120 @@
+# test_streaming.py
+import numpy as np
+import pandas as pd
+import pytest
+import crawl_cache
+import crawling
+import voting
+from pipeline import rechunk
+
+S_DATE, E_DATE = "2024.01.01", "2024.01.31"
+
+
+def _pages(sizes):
+    pages, n = [], 0
+    for size in sizes:
+        pages.append(pd.DataFrame({"제목": [f"제목 {i}" for i in range(n, n + size)]}))
+        n += size
+    return pages
+
+
+@pytest.mark.parametrize("sizes, chunk_size, expected", [
+    ([10, 10], 10, [10, 10]),       # 페이지와 청크 크기가 같음
+    ([3, 10, 7], 5, [5, 5, 5, 5]),  # 페이지 경계를 넘는 청크
+    ([10, 10, 3], 7, [7, 7, 7, 2]), # 마지막 청크는 더 작음
+    ([2], 10, [2]),                 # 청크 크기보다 적은 기사
+    ([0, 4, 0], 3, [3, 1]),         # 빈 페이지
+    ([], 10, []),
+])
+def test_rechunk_boundaries(sizes, chunk_size, expected):
+    chunks = list(rechunk(_pages(sizes), chunk_size))
+    assert [len(chunk) for chunk in chunks] == expected
+    titles = [title for chunk in chunks for title in chunk["제목"]]
+    assert titles == [f"제목 {i}" for i in range(sum(sizes))]  # 순서와 내용 유지
+    assert all(list(chunk.index) == list(range(len(chunk))) for chunk in chunks)
+
+
+@pytest.mark.parametrize("chunk_sizes", [[10, 10, 10], [1, 7, 0, 13], [25], [0]])
+def test_running_ratios_match_sentiment_ratios(chunk_sizes):
+    rng = np.random.default_rng(sum(chunk_sizes))
+    labels = rng.integers(-1, 2, size=sum(chunk_sizes))
+    running = voting.RunningRatios()
+    start = 0
+    for size in chunk_sizes:
+        ratios = running.update(labels[start:start + size])
+        start += size
+        assert ratios == voting.sentiment_ratios(labels[:start])
+    assert running.total == len(labels)
+
+
+def _fake_pages(n_pages, fail_after=None):
+    def iter_news_pages(query, s_date, e_date, max_count=100, status=None):
+        status["complete"] = False
+        for p in range(n_pages):
+            if fail_after is not None and p == fail_after:
+                raise crawling.CrawlError("페이지 요청 실패")
+            yield pd.DataFrame([(S_DATE, f"제목 {p}-{i}", f"https://news/{p}/{i}") for i in range(10)], columns=["날짜", "제목", "링크"])
+        status["complete"] = True
+    return iter_news_pages
+
+
+@pytest.fixture
+def crawl_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_cache, "CRAWL_DB_PATH", str(tmp_path / "crawl.sqlite"))
+
+
+def test_stream_news_writes_cache_per_page(crawl_db, monkeypatch):
+    monkeypatch.setattr(crawling, "iter_news_pages", _fake_pages(3))
+    stream = crawling.stream_news("q", S_DATE, E_DATE, max_count=100)
+    next(stream)
+    # 첫 페이지는 저장됐지만 끝까지 받기 전에는 캐시 기록으로 보이지 않음
+    assert crawl_cache.load_crawl("q", S_DATE, E_DATE) == (None, None)
+    list(stream)
+    cached, info = crawl_cache.load_crawl("q", S_DATE, E_DATE)
+    assert len(cached) == 30 and info == {"n_articles": 30, "complete": True, "fetched_at": info["fetched_at"]}
+    assert list(cached["링크"][:2]) == ["https://news/0/0", "https://news/0/1"]
+
+
+def test_stream_news_does_not_cache_failed_crawl(crawl_db, monkeypatch):
+    monkeypatch.setattr(crawling, "iter_news_pages", _fake_pages(3, fail_after=2))
+    with pytest.raises(crawling.CrawlError):
+        list(crawling.stream_news("q", S_DATE, E_DATE, max_count=100))
+    assert crawl_cache.load_crawl("q", S_DATE, E_DATE) == (None, None)
+    assert crawl_cache.load_usable_crawl("q", S_DATE, E_DATE, 100) is None
+
+
+def test_failed_stream_keeps_previous_cache(crawl_db, monkeypatch):
+    # 끝까지 수집하지 못한 이전 기록 → 다시 수집하다 실패해도 이전 기록은 남음
+    old = pd.DataFrame([(S_DATE, f"이전 {i}", f"https://old/{i}") for i in range(5)], columns=["날짜", "제목", "링크"])
+    crawl_cache.save_crawl("q", S_DATE, E_DATE, old, complete=False)
+    monkeypatch.setattr(crawling, "iter_news_pages", _fake_pages(3, fail_after=2))
+    with pytest.raises(crawling.CrawlError):
+        list(crawling.stream_news("q", S_DATE, E_DATE, max_count=100))
+    cached, info = crawl_cache.load_crawl("q", S_DATE, E_DATE)
+    assert list(cached["링크"]) == list(old["링크"]) and info["n_articles"] == 5
+
+    # 다시 시도해 끝까지 받으면 새 결과로 바뀜 (실패한 시도가 남긴 기사는 섞이지 않음)
+    monkeypatch.setattr(crawling, "iter_news_pages", _fake_pages(3))
+    assert sum(len(page) for page in crawling.stream_news("q", S_DATE, E_DATE, max_count=100)) == 30
+    cached, info = crawl_cache.load_crawl("q", S_DATE, E_DATE)
+    assert len(cached) == 30 and cached["링크"].is_unique and info["complete"]
+
+
+def test_stale_stream_fetches_only_since_last_fetch(crawl_db, monkeypatch):
+    e_date = "2999.12.31"  # 진행 중인 기간
+    old = pd.DataFrame([(S_DATE, f"이전 {i}", f"https://old/{i}") for i in range(15)], columns=["날짜", "제목", "링크"])
+    crawl_cache.save_crawl("q", S_DATE, e_date, old, complete=True)
+    monkeypatch.setattr(crawl_cache, "REFRESH_INTERVAL", 0)  # 저장된 기록은 오래된 것으로 처리
+
+    calls = []
+    def iter_news_pages(query, s_date, e_date, max_count=100, status=None):
+        calls.append(s_date)
+        yield pd.DataFrame([(s_date, "새 기사", "https://new/0"), (S_DATE, "이전 0", "https://old/0")], columns=["날짜", "제목", "링크"])
+    monkeypatch.setattr(crawling, "iter_news_pages", iter_news_pages)
+
+    pages = list(crawling.stream_news("q", S_DATE, e_date, max_count=10))
+    assert calls != [S_DATE]  # 처음부터가 아니라 마지막 수집일부터
+    links = [link for page in pages for link in page["링크"]]
+    assert links == ["https://new/0"] + [f"https://old/{i}" for i in range(9)]
+    cached, info = crawl_cache.load_crawl("q", S_DATE, e_date)
+    assert list(cached["링크"]) == ["https://new/0"] + list(old["링크"]) and info["complete"]
@@ -0,0 +1,89 @@
+# test_translation.py
+import math
+import threading
+from translation import TranslationCache, LINE_PATTERN, translate_titles
+
+
+class _Message:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content):
+        self.message = _Message(content)
+
+
+class _Completion:
+    def __init__(self, content):
+        self.choices = [_Choice(content)]
+
+
+class FakeClient:
+    """OpenAI 클라이언트 대신 "EN: 원문" 으로 번역하는 가짜 클라이언트 (요청 내용 기록)
+    drop: 일괄 요청 응답에서 빼먹을 원문 / fail: True 면 모든 요청 실패"""
+    def __init__(self, drop=(), fail=False):
+        self.drop = set(drop)
+        self.fail = fail
+        self.requests = []
+        self.lock = threading.Lock()
+        self.chat = self
+        self.completions = self
+
+    def create(self, model, messages):
+        prompt = messages[-1]["content"]
+        with self.lock:
+            self.requests.append(prompt)
+        if self.fail:
+            raise ConnectionError("API 오류")
+        if prompt.startswith("Translate the following text to English. "):
+            return _Completion(f"EN: {prompt[len('Translate the following text to English. '):]}")
+        lines = []
+        for line in prompt.splitlines()[1:]:
+            number, text = LINE_PATTERN.match(line).groups()
+            if text not in self.drop:
+                lines.append(f"{number}. EN: {text}")
+        return _Completion("\n".join(lines))
+
+    @property
+    def batch_requests(self):
+        return [prompt for prompt in self.requests if not prompt.startswith("Translate the following text")]
+
+
+TITLES = [f"전기차 기사 제목 {i}" for i in range(45)]
+
+
+def test_second_call_is_served_from_cache():
+    cache, client = TranslationCache(":memory:"), FakeClient()
+    first = translate_titles(TITLES, client=client, cache=cache)
+    assert first == [f"EN: {title}" for title in TITLES]
+    n_requests = len(client.requests)
+
+    # 공백/유니코드 정규화 후 같은 원문이면 캐시 적중
+    second = translate_titles([f"  {title} " for title in TITLES], client=client, cache=cache)
+    assert second == first
+    assert len(client.requests) == n_requests
+
+
+def test_titles_are_batched():
+    cache, client = TranslationCache(":memory:"), FakeClient()
+    translate_titles(TITLES + TITLES[:5], client=client, cache=cache, batch_size=20)
+    # 같은 제목은 한 번만 요청하고, 20개씩 묶어 ceil(45 / 20) = 3번 요청
+    assert len(client.batch_requests) == math.ceil(len(TITLES) / 20)
+    assert len(client.requests) == len(client.batch_requests)
+
+
+def test_missing_lines_fall_back_to_single_requests():
+    cache, client = TranslationCache(":memory:"), FakeClient(drop={TITLES[3]})
+    result = translate_titles(TITLES[:10], client=client, cache=cache, batch_size=20)
+    assert result[3] == f"EN: {TITLES[3]}"
+    assert len(client.requests) == 2  # 일괄 요청 1번 + 빠진 제목 개별 요청 1번
+
+
+def test_failed_translation_is_none_and_not_cached():
+    cache = TranslationCache(":memory:")
+    assert translate_titles(TITLES[:3], client=FakeClient(fail=True), cache=cache) == [None] * 3
+    # 실패한 결과는 저장하지 않으므로 다음 호출에서 다시 번역
+    client = FakeClient()
+    assert translate_titles(TITLES[:3], client=client, cache=cache) == [f"EN: {title}" for title in TITLES[:3]]
+    assert len(client.requests) == 1
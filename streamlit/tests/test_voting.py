@@ -0,0 +1,33 @@
+# test_voting.py
+import numpy as np
+import pytest
+import voting
+
+
+def test_majority_vote_ties_go_to_neutral():
+    labels = [
+        [1, 1, -1, 0, 1],    # 긍정 다수
+        [-1, -1, 1, 1, 0],   # 부정/긍정 동률 → 중립
+        [0, 0, 0, -1, 1],    # 중립 다수
+        [1, -1, np.nan, np.nan, np.nan],  # NaN 은 득표 제외, 동률 → 중립
+    ]
+    assert voting.majority_vote(labels).tolist() == [1, 0, 0, 0]
+
+
+def test_weighted_vote_breaks_ties():
+    labels = [[-1, -1, 1, 1, 0]]
+    assert voting.majority_vote(labels, weights=[1, 1, 1, 2, 1]).tolist() == [1]
+
+
+def test_confidence_weighted_vote():
+    labels = [[1, 1, -1, -1, 0], [1, -1, 0, 0, 0]]
+    # 확신이 낮은 긍정 두 표보다 확신이 높은 부정 두 표가 이김
+    confidences = [[0.4, 0.5, 1, 0.9, 0.2], [1, 1, 1, 1, 1]]
+    assert voting.majority_vote(labels, confidences=confidences).tolist() == [-1, 0]
+    assert voting.majority_vote(labels).tolist() == [0, 0]
+    assert voting.label_counts(labels, weights=[2, 1, 1, 1, 1], confidences=confidences)[0] == pytest.approx([1.9, 0.2, 1.3])
+
+
+def test_sentiment_ratios():
+    assert voting.sentiment_ratios([1, 1, -1, 0]) == {"positive_ratio": 50.0, "negative_ratio": 25.0, "pnr": round(2 / 1.1, 2)}
+    assert voting.sentiment_ratios([]) == {"positive_ratio": 0, "negative_ratio": 0, "pnr": 0.0}
@@ -0,0 +1,40 @@
+# test_word_cloud.py
+import os
+import pytest
+
+word_cloud = pytest.importorskip("word_cloud")
+
+
+def test_png_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(word_cloud, "PNG_DIR", str(tmp_path))
+    for i, name in enumerate(["old", "used", "new"]):
+        path = tmp_path / f"{name}.png"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+    os.utime(tmp_path / "used.png", (2000, 2000))  # 캐시 적중으로 최근 사용 표시
+
+    word_cloud.evict_png_cache(max_bytes=200)
+    assert sorted(os.listdir(tmp_path)) == ["new.png", "used.png"]
+    word_cloud.evict_png_cache(max_bytes=100)
+    assert os.listdir(tmp_path) == ["used.png"]
+
+
+def test_token_frequencies():
+    counts = word_cloud.token_frequencies([["전기차", "충전"], ["전기차"]])
+    assert counts == {"전기차": 2, "충전": 1}
+
+
+def test_frequency_tables_merge_across_months(tmp_path, monkeypatch):
+    monkeypatch.setattr(word_cloud, "FREQ_DIR", str(tmp_path))
+    word_cloud.save_frequencies("현대", "아이오닉5", "2024-01", word_cloud.token_frequencies([["전기차", "충전"]]))
+    word_cloud.save_frequencies("현대", "아이오닉5", "2024-02", word_cloud.token_frequencies([["전기차", "보조금"]]))
+    word_cloud.save_frequencies("기아", "EV6", "2024-02", word_cloud.token_frequencies([["리콜"]]))
+
+    assert word_cloud.load_frequencies("현대", "아이오닉5", "2024-03") is None
+    merged, months = word_cloud.merge_frequencies("현대", "아이오닉5", word_cloud.recent_months("2024-03"))
+    assert months == ["2024-01", "2024-02"]
+    assert merged == {"전기차": 2, "충전": 1, "보조금": 1}
+
+
+def test_recent_months_crosses_year():
+    assert word_cloud.recent_months("2024-02", 3) == ["2023-12", "2024-01", "2024-02"]
@@ -0,0 +1,134 @@
+# translation.py
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+import model_registry
+import instrumentation as metrics
+from cache_utils import cache_path, stable_hash
+
+TRANSLATION_MODEL = "gpt-4"
+TRANSLATION_DB_PATH = cache_path("translations.sqlite")
+LINE_PATTERN = re.compile(r"^\s*(\d+)[.)]\s*(.*)$")
+
+# 번역 캐시 (SQLite): (정규화된 원문, 모델명) 해시 → 번역문
+class TranslationCache:
+    def __init__(self, db_path=None):
+        self.conn = sqlite3.connect(db_path or TRANSLATION_DB_PATH, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, source TEXT, model TEXT, translation TEXT)")
+        self.lock = threading.Lock()
+
+    def get_many(self, keys):
+        found = {}
+        keys = list(keys)
+        with self.lock:
+            for i in range(0, len(keys), 500):  # SQLite 변수 개수 제한 고려
+                chunk = keys[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, entries):
+        """entries: (key, source, model, translation) 목록"""
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", entries)
+
+_default_cache = None
+
+def get_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TranslationCache()
+    return _default_cache
+
+def normalize_source(text):
+    """캐시 키용 원문 정규화 (유니코드 NFC, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+def translation_key(text, model=TRANSLATION_MODEL):
+    return stable_hash(model, normalize_source(text))
+
+def translate_one(text, client=None, model=TRANSLATION_MODEL):
+    """제목 하나를 영어로 번역 (실패 시 None)"""
+    client = client or model_registry.get_model("openai")
+    try:
+        with metrics.timer("translate.request_one"):
+            completion = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You are a translator."},
+                    {"role": "user", "content": f"Translate the following text to English. {text}"}
+                ]
+            )
+        return completion.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+def translate_many(texts, client=None, model=TRANSLATION_MODEL):
+    """여러 제목을 번호를 붙여 한 번에 요청하고 응답을 번호 순서대로 복원 (누락된 번호는 None)"""
+    client = client or model_registry.get_model("openai")
+    numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+    try:
+        start = time.perf_counter()
+        completion = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are a translator."},
+                {"role": "user", "content": "Translate each of the following numbered lines to English. "
+                                            "Answer with the same numbers, one line per item, and nothing else.\n" + numbered}
+            ]
+        )
+        elapsed = time.perf_counter() - start
+        metrics.observe("translate.request_batch", elapsed)
+        metrics.observe("translate.sec_per_title", elapsed / len(texts))
+        content = completion.choices[0].message.content
+    except Exception as e:
+        metrics.count("translate.failed_batches")
+        print(f"Error: {e}")
+        return [None] * len(texts)
+
+    results = [None] * len(texts)
+    for line in content.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match and 1 <= int(match.group(1)) <= len(texts) and match.group(2).strip():
+            results[int(match.group(1)) - 1] = match.group(2).strip()
+    return results
+
+def translate_titles(texts, client=None, model=TRANSLATION_MODEL, batch_size=20, max_workers=4, cache=None):
+    """캐시 확인 → 캐시에 없는 제목만 batch_size 개씩 묶어 번역 → 응답에서 빠진 제목은 개별 번역(동시 max_workers 개)"""
+    texts = [str(text) for text in texts]
+    cache = cache or get_cache()
+    keys = [translation_key(text, model) for text in texts]
+
+    translated = cache.get_many(set(keys))
+    metrics.count("translate.cache_hits", sum(key in translated for key in keys))
+    # 같은 제목은 한 번만 번역
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in translated:
+            missing.setdefault(key, text)
+
+    if missing:
+        metrics.count("translate.requested_titles", len(missing))
+        client = client or model_registry.get_model("openai")
+        missing_keys = list(missing)
+        batches = [missing_keys[i:i + batch_size] for i in range(0, len(missing_keys), batch_size)]
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outputs = executor.map(lambda batch: translate_many([missing[key] for key in batch], client, model), batches)
+            for batch, output in zip(batches, outputs):
+                results.update(zip(batch, output))
+
+            leftover = [key for key, value in results.items() if value is None]
+            for key, value in zip(leftover, executor.map(lambda key: translate_one(missing[key], client, model), leftover)):
+                results[key] = value
+
+        cache.put_many([(key, missing[key], model, value) for key, value in results.items() if value is not None])
+        translated.update({key: value for key, value in results.items() if value is not None})
+
+    return [translated.get(key) for key in keys]
@@ -0,0 +1,114 @@
+# ui.py
+# Streamlit 화면 출력 모음 (계산은 각 모듈에서 Streamlit 없이 수행하고, 여기서는 결과/진행 이벤트만 표시)
+# 무거운 분석 모듈은 해당 화면에서 처음 쓸 때 함수 안에서 import (예측 화면만 쓰는 경우 gensim, torch, konlpy 등을 불러오지 않음)
+# 한 번 import 한 모듈과 model_registry 에 로드된 모델은 프로세스 안에서 rerun/세션 간에 그대로 재사용됨
+import streamlit as st
+import numpy as np
+import pandas as pd
+import instrumentation as metrics
+import model_registry
+
+STREAM_TABLE_ROWS = 100  # 스트리밍 분석 화면에 보여 줄 최근 기사 수
+
+class StreamlitProgress:
+    """pipeline.Pipeline.run / sentiment_analysis.perform_sentiment_analysis 의 진행 이벤트를 Streamlit 화면에 표시"""
+    def __init__(self, container=None):
+        self.container = container or st
+        self.running = {}
+
+    def __call__(self, event):
+        if event["status"] == "section":
+            self.container.markdown(event["message"])
+        elif event["status"] == "start":
+            placeholder = self.container.empty()
+            placeholder.info(event["message"])
+            self.running[event["stage"]] = placeholder
+        elif event["status"] == "done":
+            placeholder = self.running.pop(event["stage"], None) or self.container.empty()
+            placeholder.write(event["message"])
+        elif event["status"] == "error":
+            placeholder = self.running.pop(event["stage"], None) or self.container.empty()
+            placeholder.error(event["message"])
+
+def render_diagnostics(container=None):
+    """instrumentation 지표(타이머/카운터)와 프로파일 결과, 모델 로드 현황 표시, JSON/CSV 리포트 다운로드"""
+    container = container or st
+    stats = model_registry.model_stats()
+    if stats:
+        container.write("##### 모델 로드 현황 (로드 시간, 로드 중 늘어난 프로세스 RSS)")
+        container.dataframe(stats)
+    run = metrics.run_report()
+    if not run["metrics"]:
+        container.write("기록된 지표가 없습니다.")
+        return
+    container.dataframe(run["metrics"])
+    col1, col2 = container.columns(2)
+    col1.download_button("📥 실행 리포트 JSON", data=metrics.export_json(), file_name="run_report.json", mime="application/json")
+    col2.download_button("📥 지표 CSV", data=metrics.export_csv().encode("utf-8-sig"), file_name="run_metrics.csv", mime="text/csv")
+
+    if run["memory_top"]:
+        container.write("##### 메모리 할당 상위 위치 (tracemalloc)")
+        container.dataframe(run["memory_top"])
+    for name, text in run["profiles"].items():
+        container.write(f"##### {name} (cProfile, 누적 시간 순)")
+        container.text(text)
+
+def render_streaming_analysis(query, s_date, e_date, max_count=100, weights=None, confidence=False):
+    """analysis.stream_analysis 결과를 청크마다 화면에 반영 (누적 감정 비율과 분석된 기사 목록)"""
+    with st.spinner("뉴스 분석 모듈 불러오는 중... ⏳"):
+        from analysis import stream_analysis
+    status = st.empty()
+    col1, col2, col3 = st.columns(3)
+    positive, negative, pnr = col1.empty(), col2.empty(), col3.empty()
+    table = st.empty()
+
+    recent = None  # 화면에는 최근 STREAM_TABLE_ROWS 개 기사만 유지
+    n_articles = 0
+    status.info("뉴스 기사를 받는 대로 분석 중... ⏳")
+    for update in stream_analysis(query, s_date, e_date, max_count, weights=weights, confidence=confidence):
+        ratios = update["ratios"]
+        positive.metric("😊 Positive 비율", f"{ratios['positive_ratio']}%")
+        negative.metric("😢 Negative 비율", f"{ratios['negative_ratio']}%")
+        pnr.metric("⚖️ Positive/Negative", ratios["pnr"])
+        chunk = update["chunk"][["제목", "majority_sentiment"]]
+        recent = chunk if recent is None else pd.concat([recent, chunk], ignore_index=True).tail(STREAM_TABLE_ROWS)
+        table.dataframe(recent)
+        n_articles = update["n_articles"]
+        status.info(f"🔹 {update['n_articles']}개 기사 분석 완료 ({update['elapsed_sec']:.1f}초) ⏳")
+
+    if n_articles:
+        status.success(f"✅ 총 {n_articles}개 뉴스 기사 분석 완료!")
+    else:
+        status.warning("⚠️ 검색된 기사가 없습니다.")
+
+def predict_sales(df, recursive=False):
+    """판매량 예측 및 그래프 출력
+    recursive=True 면 전월 판매량을 sales 에서 직접 만들고 여러 달을 연속으로 예측"""
+    import predict
+    df_raw = df
+    if recursive:
+        df, test = predict.forecast_recursive(df)
+    else:
+        df, test = predict.fit_and_predict(df)
+
+    # 예측된 판매량 출력
+    st.subheader("📈 예측된 판매량")
+    st.dataframe(test[["year_month", "predicted_sales"]])
+
+    # 그래프 출력
+    st.subheader("판매량 추이 및 예측")
+    st.pyplot(predict.build_sales_figure(df, test))
+
+    # 과거 시점마다 그 이전 데이터로만 학습해 다음 달을 예측했을 때의 오차
+    if recursive:
+        # 자동 계산한 전월 판매량을 넣은 원래 단위 데이터로 백테스트
+        df_raw = df.assign(sales=np.expm1(df["sales"]), year_month=df["year_month"].dt.strftime("%Y-%m"))
+    predictions, metrics = predict.rolling_backtest(df_raw)
+    if not metrics.empty:
+        with st.expander("📊 롤링 백테스트 (1개월 앞 예측 오차)"):
+            st.dataframe(metrics)
+            st.dataframe(predictions)
+
+    # 예측된 판매량 CSV 다운로드 기능 추가
+    csv = test[["year_month", "predicted_sales"]].to_csv(index=False, encoding="utf-8-sig")
+    st.download_button("📥 예측 결과 CSV 다운로드", data=csv, file_name="predicted_sales.csv", mime="text/csv")
@@ -0,0 +1,54 @@
+# voting.py
+import numpy as np
+
+# 감정 레이블 (-1: 부정, 0: 중립, 1: 긍정)
+LABELS = np.array([-1, 0, 1])
+
+def label_counts(labels, weights=None, confidences=None):
+    """(제목 수, 모델 수) 레이블 행렬 → (제목 수, 3) 득표 행렬
+    weights: 모델(열)별 가중치, confidences: 칸별 확신도 (NaN 레이블은 득표에서 제외)"""
+    labels = np.asarray(labels, dtype=float)
+    votes = np.ones_like(labels)
+    if weights is not None:
+        votes = votes * np.asarray(weights, dtype=float)[np.newaxis, :]
+    if confidences is not None:
+        votes = votes * np.asarray(confidences, dtype=float)
+    return np.stack([((labels == label) * votes).sum(axis=1) for label in LABELS], axis=1)
+
+def majority_vote(labels, weights=None, confidences=None):
+    """행마다 득표가 가장 많은 레이블 선택 (최다 득표가 동률이면 0: 중립)"""
+    counts = label_counts(labels, weights, confidences)
+    max_counts = counts.max(axis=1, keepdims=True)
+    n_winners = np.isclose(counts, max_counts).sum(axis=1)
+    return np.where(n_winners > 1, 0, LABELS[counts.argmax(axis=1)])
+
+def sentiment_ratios(labels):
+    """레이블 배열을 한 번만 세어 긍정/부정 비율과 Positive/Negative 비(pnr) 계산"""
+    labels = np.asarray(labels, dtype=int)
+    negative, _, positive = np.bincount(labels + 1, minlength=3)[:3]
+    return ratios_from_counts(negative, positive, len(labels))
+
+def ratios_from_counts(negative, positive, total):
+    return {
+        "positive_ratio": round(positive / total * 100, 2) if total > 0 else 0,
+        "negative_ratio": round(negative / total * 100, 2) if total > 0 else 0,
+        "pnr": round(positive / (negative + 0.1), 2),
+    }
+
+class RunningRatios:
+    """청크 단위로 들어오는 레이블을 누적해 지금까지의 감정 비율 계산 (레이블을 모두 보관하지 않음)"""
+    def __init__(self):
+        self.negative = 0
+        self.positive = 0
+        self.total = 0
+
+    def update(self, labels):
+        labels = np.asarray(labels, dtype=int)
+        negative, _, positive = np.bincount(labels + 1, minlength=3)[:3]
+        self.negative += int(negative)
+        self.positive += int(positive)
+        self.total += len(labels)
+        return self.ratios()
+
+    def ratios(self):
+        return ratios_from_counts(self.negative, self.positive, self.total)
@@ -1,36 +1,122 @@
-import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import collections
-import streamlit as st
+import itertools
 import os
+import io
+import gzip
+import json
+from cache_utils import cache_path, stable_hash
 
-def generate_wordcloud(data):
-    """ 뉴스 데이터에서 토큰을 추출하여 워드클라우드 생성 """
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # 현재 파일의 디렉토리
-    font_path = os.path.join(BASE_DIR, "fonts", "NanumGothic.ttf")
-
-    # 'token_lst' 컬럼 활용 (리스트 형태로 저장된 토큰들)
-    all_tokens = []
-    for tokens in data['token_lst']:
-        all_tokens.extend(tokens)  # 리스트 합치기
-
-    # 단어 빈도수 계산
-    word_counts = collections.Counter(all_tokens)
-
-    # 워드클라우드 생성
-    wordcloud = WordCloud(
-        font_path = font_path,
-        background_color='white',
-        max_words=100,
-        max_font_size=50,
-        scale=3,
-        random_state=1
-    ).generate_from_frequencies(word_counts)
-
-    # Streamlit에서 출력
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.imshow(wordcloud, interpolation="bilinear")
-    ax.axis("off")
-
-    # Streamlit에 출력
-    st.pyplot(fig)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # 현재 파일의 디렉토리
+FONT_PATH = os.path.join(BASE_DIR, "fonts", "NanumGothic.ttf")
+
+# 워드클라우드 설정
+WORDCLOUD_PARAMS = {
+    "background_color": "white",
+    "max_words": 100,
+    "max_font_size": 50,
+    "scale": 3,
+    "random_state": 1,
+}
+
+# 브랜드/차종/월별 단어 빈도표(gzip JSON) 위치 → 여러 달을 합친 워드클라우드는 저장된 빈도표를 더해서 생성
+FREQ_DIR = cache_path("wordcloud", "freq", "")
+# 렌더링된 PNG 캐시 위치와 최대 크기 (초과 시 오래 사용하지 않은 이미지부터 삭제)
+PNG_DIR = cache_path("wordcloud", "png", "")
+PERIOD_MONTHS = 3  # 여러 달 워드클라우드 기본 기간 (선택한 달 포함)
+MAX_PNG_CACHE_BYTES = 100 * 1024 ** 2
+
+def token_frequencies(token_lists):
+    """token_lst 컬럼 → 단어 빈도수 (리스트를 하나로 합치지 않고 바로 셈)"""
+    return collections.Counter(itertools.chain.from_iterable(token_lists))
+
+def _freq_path(brand, model, month):
+    return os.path.join(FREQ_DIR, stable_hash(brand, model, month)[:32] + ".json.gz")
+
+def save_frequencies(brand, model, month, word_counts):
+    """한 달(예: "2024-01") 치 단어 빈도표 저장 (같은 달은 덮어씀)"""
+    path = _freq_path(brand, model, month)
+    with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+        json.dump({"brand": brand, "model": model, "month": month, "counts": dict(word_counts.most_common())}, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+def load_frequencies(brand, model, month):
+    """저장된 단어 빈도표 (없으면 None)"""
+    path = _freq_path(brand, model, month)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return collections.Counter(json.load(f)["counts"])
+
+def merge_frequencies(brand, model, months):
+    """여러 달의 빈도표를 합산 → (합산 빈도표, 빈도표가 저장돼 있던 달 목록)"""
+    merged = collections.Counter()
+    found = []
+    for month in months:
+        counts = load_frequencies(brand, model, month)
+        if counts is not None:
+            merged.update(counts)
+            found.append(month)
+    return merged, found
+
+def evict_png_cache(max_bytes=MAX_PNG_CACHE_BYTES):
+    """PNG 캐시가 max_bytes 를 넘으면 수정 시각(캐시 적중 시 갱신)이 오래된 파일부터 삭제"""
+    entries = []
+    for name in os.listdir(PNG_DIR):
+        path = os.path.join(PNG_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:  # 다른 실행에서 이미 삭제
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+def render_wordcloud_png(word_counts, **params):
+    """빈도표 → 워드클라우드 PNG (빈도표와 설정이 같으면 캐시된 이미지 반환)"""
+    params = {**WORDCLOUD_PARAMS, **params}
+    key = stable_hash(json.dumps(sorted(word_counts.items()), ensure_ascii=False), json.dumps(params, sort_keys=True), FONT_PATH)
+    png_path = os.path.join(PNG_DIR, key + ".png")
+    if os.path.exists(png_path):
+        with open(png_path, "rb") as f:
+            png = f.read()
+        os.utime(png_path)  # 최근 사용 표시
+        return png
+
+    wordcloud = WordCloud(font_path=FONT_PATH, **params).generate_from_frequencies(word_counts)
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    png = buffer.getvalue()
+    with open(png_path, "wb") as f:
+        f.write(png)
+    evict_png_cache()
+    return png
+
+def build_wordcloud_image(data):
+    """ 뉴스 데이터에서 토큰을 추출하여 워드클라우드 PNG 생성 (Streamlit 출력 없음) """
+    # 'token_lst' 컬럼 활용 (리스트 형태로 저장된 토큰들) → 단어 빈도수 계산
+    word_counts = token_frequencies(data['token_lst'])
+    return render_wordcloud_png(word_counts)
+
+def recent_months(month, n=PERIOD_MONTHS):
+    """"2024-02", 3 → ["2023-12", "2024-01", "2024-02"]"""
+    year, mon = map(int, month.split("-"))
+    months = []
+    for _ in range(n):
+        months.append(f"{year}-{mon:02d}")
+        year, mon = (year - 1, 12) if mon == 1 else (year, mon - 1)
+    return months[::-1]
+
+def build_period_wordcloud(brand, model, months):
+    """저장된 월별 빈도표를 합쳐 여러 달 워드클라우드 PNG 생성 → (PNG, 포함된 달 목록) (저장된 달이 없으면 (None, []))"""
+    merged, found = merge_frequencies(brand, model, months)
+    if not merged:
+        return None, found
+    return render_wordcloud_png(merged), found